@@ -0,0 +1,53 @@
+"""Benchmark: password verifications per second on request threads and in the pool.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_hashing_pool.py [threads] [verifications] [method]
+
+``threads`` (default 16) threads, standing in for a threaded WSGI server, verify
+``verifications`` (default 200) hashes made with ``method`` (default
+``scrypt:32768:8:1``) between them: once on the threads themselves and once
+through a ``HashingExecutor`` with one process per core. Throughput only
+grows with the pool when the machine has more than one core.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from online_exam.services.hashing import HashingExecutor
+
+
+def _rate(threads: int, count: int, verify) -> float:
+    with ThreadPoolExecutor(threads) as requests:
+        started = time.perf_counter()
+        assert all(requests.map(lambda _: verify(), range(count)))
+        return count / (time.perf_counter() - started)
+
+
+def main() -> None:
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    method = sys.argv[3] if len(sys.argv) > 3 else "scrypt:32768:8:1"
+    cores = os.cpu_count() or 1
+    stored = generate_password_hash("Password123!", method=method)
+
+    inline = _rate(threads, count, lambda: check_password_hash(stored, "Password123!"))
+    print(f"request threads: {inline:,.1f} verifications/s")
+
+    pool = HashingExecutor(cores, cores * 8, timeout=60)
+    try:
+        # Start the worker processes before timing
+        _rate(cores, cores, lambda: pool.run(check_password_hash, stored, "Password123!"))
+        pooled = _rate(
+            threads, count, lambda: pool.run(check_password_hash, stored, "Password123!")
+        )
+    finally:
+        pool.shutdown()
+    print(f"{cores} pool processes: {pooled:,.1f} verifications/s ({pooled / inline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
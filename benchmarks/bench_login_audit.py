@@ -0,0 +1,70 @@
+"""Benchmark: login latency with synchronous and buffered audit logging.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_login_audit.py [logins]
+
+Posts ``logins`` (default 2,000) failed logins for unknown accounts, so no
+password is hashed and the audit row is the only write, through the test
+client against a file-backed SQLite database. It runs once committing each
+``LoginAttempt`` on the request path and once through the buffered writer,
+then reports mean and p99 request latency and checks every attempt was stored.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import func, select
+
+from online_exam import create_app, db
+from online_exam.models.login_attempt import LoginAttempt
+from online_exam.services.login_audit import get_login_audit_writer
+
+
+def _run(path: str, logins: int, buffered: bool) -> None:
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+            "LOGIN_AUDIT_BUFFERED": buffered,
+            # Every login comes from the same test client address
+            "RATE_LIMIT_ENABLED": False,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    latencies = []
+    for number in range(logins):
+        started = time.perf_counter()
+        client.post("/login", data={"email": f"nobody{number}@example.com", "password": "x"})
+        latencies.append(time.perf_counter() - started)
+
+    writer = get_login_audit_writer(app)
+    if writer is not None:
+        writer.stop()
+    with app.app_context():
+        stored = db.session.scalar(select(func.count(LoginAttempt.id)))
+        db.session.remove()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    label = "buffered" if buffered else "synchronous"
+    print(
+        f"{label:>11}: mean {statistics.mean(latencies) * 1000:.2f} ms, "
+        f"p99 {p99 * 1000:.2f} ms, {stored}/{logins} attempts stored"
+    )
+
+
+def main() -> None:
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    with tempfile.TemporaryDirectory() as tmp:
+        _run(os.path.join(tmp, "sync.db"), logins, buffered=False)
+        _run(os.path.join(tmp, "buffered.db"), logins, buffered=True)
+
+
+if __name__ == "__main__":
+    main()
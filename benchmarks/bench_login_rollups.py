@@ -0,0 +1,89 @@
+"""Benchmark: admin login-attempt aggregates over raw rows and over roll-ups.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_login_rollups.py [attempts] [days]
+
+Seeds ``attempts`` (default 500,000) login attempts spread over ``days``
+(default 90) days from 2,000 IPs into a file-backed SQLite database, then
+times ``LoginAttempt.failed_counts_by_ip`` three times: over the raw table
+alone, after the hourly roll-up, and after pruning raw rows past the default
+retention. The roll-up and prune themselves are timed too.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from online_exam import create_app, db
+from online_exam.config import Config
+from online_exam.models.login_attempt import LoginAttempt
+from online_exam.services.login_retention import prune_login_attempts, roll_up_login_attempts
+
+IPS = 2_000
+REPEATS = 5
+
+
+def _seed(count: int, days: int, now: datetime) -> None:
+    rng = random.Random(3)
+    span = days * 24 * 3600
+    rows = [
+        {
+            "user_identifier": f"student{rng.randrange(20_000)}@example.com",
+            "ip_address": f"10.{rng.randrange(IPS) // 256}.{rng.randrange(256)}.1",
+            "success": rng.random() < 0.8,
+            "timestamp": now - timedelta(seconds=rng.randrange(span)),
+        }
+        for _ in range(count)
+    ]
+    for start in range(0, count, 50_000):
+        db.session.execute(insert(LoginAttempt), rows[start : start + 50_000])
+    db.session.commit()
+
+
+def _time_aggregate(label: str) -> None:
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        LoginAttempt.failed_counts_by_ip(limit=20)
+    elapsed = (time.perf_counter() - started) / REPEATS
+    print(f"{label}: failed_counts_by_ip {elapsed * 1000:.1f} ms")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 90
+    now = datetime.utcnow()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {
+                "TESTING": True,
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'attempts.db')}",
+            }
+        )
+        with app.app_context():
+            db.create_all()
+            _seed(count, days, now)
+            _time_aggregate(f"raw table, {count} rows")
+
+            started = time.perf_counter()
+            added = roll_up_login_attempts(now)
+            db.session.commit()
+            print(f"roll-up: {added} rows in {time.perf_counter() - started:.2f}s")
+            _time_aggregate("roll-ups + current hour")
+
+            started = time.perf_counter()
+            result = prune_login_attempts(
+                Config.LOGIN_ATTEMPT_RETENTION_DAYS, Config.LOGIN_ROLLUP_RETENTION_DAYS, now
+            )
+            print(f"prune: {result.attempts_deleted} rows in {time.perf_counter() - started:.2f}s")
+            _time_aggregate("after pruning")
+            db.session.remove()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark: CPU cost of issuing and checking a one-time code.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_otp.py [repeats]
+
+Times, per call, storing and verifying an emailed code with werkzeug's
+default password KDF (how codes used to be stored), with the HMAC now used,
+and verifying a TOTP code (three HMAC-SHA1 steps for the drift window).
+"""
+
+import sys
+import time
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from online_exam import create_app
+from online_exam.utils.otp_utils import (
+    generate_totp_secret,
+    hash_otp,
+    totp_code,
+    verify_otp,
+    verify_totp,
+)
+
+
+def _per_call(repeats: int, func) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - started) / repeats
+
+
+def _report(label: str, seconds: float) -> None:
+    print(f"{label:<28}{seconds * 1e6:>12,.1f} µs")
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    kdf_repeats = max(1, repeats // 1000)
+
+    legacy = generate_password_hash("123456")
+    _report("KDF hash", _per_call(kdf_repeats, lambda: generate_password_hash("123456")))
+    _report("KDF verify", _per_call(kdf_repeats, lambda: check_password_hash(legacy, "123456")))
+
+    with create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"}).app_context():
+        stored = hash_otp("123456")
+        _report("HMAC hash", _per_call(repeats, lambda: hash_otp("123456")))
+        _report("HMAC verify", _per_call(repeats, lambda: verify_otp(stored, "123456")))
+
+    secret = generate_totp_secret()
+    code = totp_code(secret)
+    _report("TOTP verify", _per_call(repeats, lambda: verify_totp(secret, code)))
+
+
+if __name__ == "__main__":
+    main()
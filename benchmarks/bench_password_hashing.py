@@ -0,0 +1,53 @@
+"""Benchmark: password verifications per second per core at each hashing cost.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_password_hashing.py [seconds] [method ...]
+
+For every werkzeug method (default: a range of pbkdf2 and scrypt costs),
+verifies one hash repeatedly for ``seconds`` (default 2) on a single thread,
+and reports verifications (i.e. logins) per second on one core, and how many
+cores a login burst of 10,000 students in a minute would keep busy. Use it to
+pick ``PASSWORD_HASH_METHOD`` for a deployment.
+"""
+
+import sys
+import time
+
+from online_exam.utils.password_utils import hash_password, verify_password
+
+DEFAULT_METHODS = [
+    "pbkdf2:sha256:1000",
+    "pbkdf2:sha256:100000",
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:1000000",
+    "scrypt:8192:8:1",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",
+]
+BURST_LOGINS = 10_000
+BURST_SECONDS = 60
+
+
+def _verifications_per_second(method: str, seconds: float) -> float:
+    stored = hash_password("Password123!", method)
+    count = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        verify_password(stored, "Password123!")
+        count += 1
+    return count / elapsed
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    methods = sys.argv[2:] or DEFAULT_METHODS
+    needed = BURST_LOGINS / BURST_SECONDS
+
+    print(f"{'method':<24}{'ms/login':>10}{'logins/s/core':>15}{'cores for burst':>17}")
+    for method in methods:
+        rate = _verifications_per_second(method, seconds)
+        print(f"{method:<24}{1000 / rate:>10.2f}{rate:>15,.0f}{needed / rate:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
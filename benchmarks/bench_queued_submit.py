@@ -0,0 +1,150 @@
+"""Benchmark: submit latency under an end-of-exam storm, direct vs. queued.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_queued_submit.py [submitters] [questions]
+
+``submitters`` students (default 1,000) are released at the same moment and
+each POSTs one answer sheet from its own thread, first through the regular
+submit route (graded and stored in the request) and then through the queued
+route (validated, appended to the local WAL queue, answered with 202). The
+p50/p99 response latency of both is reported, plus how long the background
+workers needed to store the queued submissions.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from online_exam import create_app, db
+from online_exam.models.exam import Exam
+from online_exam.models.question import Question
+from online_exam.models.submission import Submission
+from online_exam.models.user import User
+from online_exam.services.submission_queue import get_submission_queue
+
+
+def _seed(question_count: int) -> tuple[int, int, list[int]]:
+    student = User(
+        username="bench-student",
+        name="Bench Student",
+        email="bench@example.com",
+        role="student",
+        password_hash="",
+    )
+    exam = Exam(title="Storm Exam", status="published")
+    db.session.add_all([student, exam])
+    db.session.flush()
+
+    questions = [
+        Question(
+            exam_id=exam.id,
+            question_text=f"MCQ {number}",
+            question_type="mcq",
+            points=5,
+            option_a="A",
+            option_b="B",
+            option_c="C",
+            option_d="D",
+            correct_answer="B",
+            order_num=number,
+        )
+        for number in range(1, question_count + 1)
+    ]
+    db.session.add_all(questions)
+    db.session.commit()
+    return student.id, exam.id, [question.id for question in questions]
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _storm(app, url: str, student_id: int, question_ids: list[int], submitters: int):
+    start = threading.Barrier(submitters)
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    lock = threading.Lock()
+
+    def submit(seed: int) -> None:
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["user_id"] = student_id
+            session["user_role"] = "student"
+        form = {f"question_{qid}": "ABCD"[(qid + seed) % 4] for qid in question_ids}
+        form["student_name"] = f"Student {seed}"
+
+        start.wait()
+        began = time.perf_counter()
+        try:
+            status = client.post(url, data=form).status_code
+        except Exception:  # noqa: BLE001 - counted as a failed request
+            status = 0
+        elapsed = time.perf_counter() - began
+        with lock:
+            latencies.append(elapsed * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    threads = [threading.Thread(target=submit, args=(seed,)) for seed in range(submitters)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses
+
+
+def _report(label: str, latencies: list[float], statuses: dict[int, int]) -> None:
+    print(
+        f"{label:<8} p50 {_percentile(latencies, 0.5):8.1f}ms "
+        f"p99 {_percentile(latencies, 0.99):8.1f}ms "
+        f"max {max(latencies):8.1f}ms  statuses {statuses}"
+    )
+
+
+def main() -> None:
+    submitters = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    question_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {
+                "TESTING": True,
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'app.db')}",
+                "SUBMISSION_QUEUE_PATH": os.path.join(tmp, "queue.db"),
+                "SUBMISSION_QUEUE_WORKERS": 4,
+            }
+        )
+        with app.app_context():
+            db.create_all()
+            student_id, exam_id, question_ids = _seed(question_count)
+            db.session.remove()
+        queue = get_submission_queue(app)
+
+        direct = _storm(
+            app, f"/student/exams/{exam_id}/submit", student_id, question_ids, submitters
+        )
+        _report("direct", *direct)
+
+        started = time.perf_counter()
+        queued = _storm(
+            app, f"/student/exams/{exam_id}/submit/queued", student_id, question_ids, submitters
+        )
+        _report("queued", *queued)
+
+        while queue.pending_count():
+            time.sleep(0.05)
+        drained = time.perf_counter() - started
+
+        app.extensions["submission_queue"]["workers"].stop(timeout=5)
+        with app.app_context():
+            stored = Submission.query.count()
+            db.session.remove()
+            db.engine.dispose()
+
+    print(f"queued submissions stored {drained:.2f}s after the storm began ({stored} rows total)")
+
+
+if __name__ == "__main__":
+    main()
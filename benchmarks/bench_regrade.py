@@ -0,0 +1,98 @@
+"""Benchmark: vectorized re-grade of a large exam.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_regrade.py [submissions] [questions]
+
+Seeds a file-backed SQLite database with MCQ answers graded against a wrong key,
+corrects the key and times ``regrade_exam``.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from online_exam import create_app, db
+from online_exam.models.exam import Exam
+from online_exam.models.question import Question
+from online_exam.models.submission import Answer, Submission
+from online_exam.services.regrade import regrade_exam
+
+
+def main() -> None:
+    submissions = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    question_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {
+                "TESTING": True,
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            }
+        )
+        with app.app_context():
+            db.create_all()
+            exam = Exam(title="Regrade Benchmark", status="published")
+            db.session.add(exam)
+            db.session.flush()
+            questions = [
+                Question(
+                    exam_id=exam.id,
+                    question_text=f"MCQ {n}",
+                    question_type="mcq",
+                    points=5,
+                    option_a="A",
+                    option_b="B",
+                    option_c="C",
+                    option_d="D",
+                    correct_answer="A",
+                    order_num=n,
+                )
+                for n in range(1, question_count + 1)
+            ]
+            db.session.add_all(questions)
+            db.session.flush()
+
+            now = datetime.utcnow()
+            db.session.execute(
+                insert(Submission),
+                [
+                    {"id": n, "exam_id": exam.id, "student_name": f"S{n}", "status": "graded"}
+                    for n in range(1, submissions + 1)
+                ],
+            )
+            db.session.execute(
+                insert(Answer),
+                [
+                    {
+                        "submission_id": n,
+                        "question_id": q.id,
+                        "selected_option": "ABCD"[(n + q.id) % 4],
+                        "is_correct": False,
+                        "points_earned": 0,
+                        "created_at": now,
+                    }
+                    for n in range(1, submissions + 1)
+                    for q in questions
+                ],
+            )
+            db.session.commit()
+
+            started = time.perf_counter()
+            result = regrade_exam(exam)
+            db.session.commit()
+            elapsed = time.perf_counter() - started
+
+            answers = submissions * question_count
+            print(
+                f"re-graded {result.submissions} submissions / {answers} answers "
+                f"in {elapsed:.2f}s ({answers / elapsed:,.0f} answers/sec)"
+            )
+            db.session.remove()
+
+
+if __name__ == "__main__":
+    main()
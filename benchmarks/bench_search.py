@@ -0,0 +1,133 @@
+"""Benchmark: full-text search latency on a large question bank.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_search.py [questions] [queries]
+
+Seeds a file-backed SQLite database with ``questions`` questions (default one
+million, 50 per exam) built from a fixed vocabulary, builds the index with
+``reindex_all`` and times ``search_exams`` for random one- and two-word
+queries, typed out in full and with the last word cut short (prefix match).
+Latency percentiles are reported against the 20 ms budget.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import insert
+
+from online_exam import create_app, db
+from online_exam.models.exam import Exam
+from online_exam.models.question import Question
+from online_exam.services.search import reindex_all, search_exams
+
+BUDGET_MS = 20
+QUESTIONS_PER_EXAM = 50
+BATCH = 10_000
+
+SYLLABLES = ["al", "ge", "bra", "mi", "to", "chon", "dri", "syn", "the", "sis", "ka", "ro", "pex"]
+
+
+def _vocabulary(size: int, rng: random.Random) -> list[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _seed(question_count: int, vocabulary: list[str], rng: random.Random) -> None:
+    exam_count = max(1, question_count // QUESTIONS_PER_EXAM)
+    db.session.execute(
+        insert(Exam),
+        [
+            {"title": " ".join(rng.choices(vocabulary, k=3)), "status": "published"}
+            for _ in range(exam_count)
+        ],
+    )
+
+    for start in range(0, question_count, BATCH):
+        rows = []
+        for number in range(start, min(start + BATCH, question_count)):
+            rows.append(
+                {
+                    "exam_id": number // QUESTIONS_PER_EXAM + 1,
+                    "question_text": " ".join(rng.choices(vocabulary, k=12)),
+                    "question_type": "mcq",
+                    "points": 1,
+                    "option_a": rng.choice(vocabulary),
+                    "option_b": rng.choice(vocabulary),
+                    "option_c": rng.choice(vocabulary),
+                    "option_d": rng.choice(vocabulary),
+                    "correct_answer": "A",
+                    "order_num": number % QUESTIONS_PER_EXAM + 1,
+                }
+            )
+        db.session.execute(insert(Question), rows)
+    db.session.commit()
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    question_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rng = random.Random(42)
+    vocabulary = _vocabulary(20_000, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {
+                "TESTING": True,
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'search.db')}",
+            }
+        )
+        with app.app_context():
+            db.create_all()
+
+            started = time.perf_counter()
+            _seed(question_count, vocabulary, rng)
+            print(f"seeded {question_count} questions in {time.perf_counter() - started:.1f}s")
+
+            started = time.perf_counter()
+            indexed = reindex_all(db.session.connection())
+            db.session.commit()
+            print(f"indexed {indexed} documents in {time.perf_counter() - started:.1f}s")
+
+            kinds = {
+                "whole words": [
+                    " ".join(rng.sample(vocabulary, rng.choice([1, 2]))) for _ in range(query_count)
+                ],
+                # As typed: the last word is still incomplete
+                "prefix": [
+                    " ".join(rng.sample(vocabulary, rng.choice([1, 2])))[:-2]
+                    for _ in range(query_count)
+                ],
+            }
+
+            search_exams(kinds["whole words"][0])  # warm the page cache
+            latencies = {}
+            for kind, terms in kinds.items():
+                latencies[kind] = []
+                for term in terms:
+                    started = time.perf_counter()
+                    search_exams(term)
+                    latencies[kind].append((time.perf_counter() - started) * 1000)
+
+            db.session.remove()
+
+    for kind, values in latencies.items():
+        p50, p95 = _percentile(values, 0.5), _percentile(values, 0.95)
+        print(
+            f"{kind:<12} {len(values)} queries: p50 {p50:.2f}ms p95 {p95:.2f}ms "
+            f"max {max(values):.2f}ms "
+            f"({'within' if p95 <= BUDGET_MS else 'over'} the {BUDGET_MS}ms budget at p95)"
+        )
+
+
+if __name__ == "__main__":
+    main()
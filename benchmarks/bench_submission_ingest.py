@@ -0,0 +1,152 @@
+"""Benchmark: bulk submission ingest vs. the per-object ORM path.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_submission_ingest.py [submissions] [questions]
+
+Both paths write the same rows into a file-backed SQLite database and commit once
+per submission, like the real endpoint does. Answer rows per second are reported.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from online_exam import create_app, db
+from online_exam.models.exam import Exam
+from online_exam.models.question import Question
+from online_exam.models.submission import Answer, Submission
+from online_exam.services.answer_key import AnswerKey
+from online_exam.services.submission_ingest import grade_form, ingest_submission
+
+
+def _seed_exam(question_count: int) -> list[Question]:
+    exam = Exam(title="Benchmark Exam", status="published")
+    db.session.add(exam)
+    db.session.flush()
+
+    for number in range(1, question_count + 1):
+        if number % 5 == 0:
+            question = Question(
+                exam_id=exam.id,
+                question_text=f"Written {number}",
+                question_type="written",
+                points=10,
+                order_num=number,
+            )
+        else:
+            question = Question(
+                exam_id=exam.id,
+                question_text=f"MCQ {number}",
+                question_type="mcq",
+                points=5,
+                option_a="A",
+                option_b="B",
+                option_c="C",
+                option_d="D",
+                correct_answer="B",
+                order_num=number,
+            )
+        db.session.add(question)
+
+    db.session.commit()
+    return Question.query.filter_by(exam_id=exam.id).order_by(Question.order_num).all()
+
+
+def _form_for(questions: list[Question], seed: int) -> dict[str, str]:
+    form = {}
+    for question in questions:
+        if question.is_mcq():
+            form[f"question_{question.id}"] = "ABCD"[(question.id + seed) % 4]
+        else:
+            form[f"question_{question.id}"] = f"Answer {seed}"
+    return form
+
+
+def _per_object_path(exam_id: int, questions: list[Question], form: dict[str, str]) -> None:
+    """The original ``submit_exam`` write path, kept here for comparison."""
+    submission = Submission(exam_id=exam_id, student_name="Bench", status="pending")
+    db.session.add(submission)
+    db.session.flush()
+
+    total_score = 0
+    max_score = 0
+    for question in questions:
+        max_score += question.points
+        value = form.get(f"question_{question.id}", "").strip()
+        if question.is_mcq():
+            if value:
+                is_correct = value.upper() == question.correct_answer
+                points_earned = question.points if is_correct else 0
+                total_score += points_earned
+                db.session.add(
+                    Answer(
+                        submission_id=submission.id,
+                        question_id=question.id,
+                        selected_option=value.upper(),
+                        is_correct=is_correct,
+                        points_earned=points_earned,
+                    )
+                )
+        else:
+            db.session.add(
+                Answer(
+                    submission_id=submission.id,
+                    question_id=question.id,
+                    answer_text=value,
+                    is_correct=False,
+                    points_earned=0,
+                )
+            )
+
+    submission.total_score = total_score
+    submission.max_score = max_score
+    submission.calculate_percentage()
+    db.session.commit()
+
+
+def _bulk_path(exam_id: int, questions: list[Question], form: dict[str, str]) -> None:
+    graded = grade_form(AnswerKey.from_questions(exam_id, None, questions), form)
+    ingest_submission(exam_id, "Bench", graded, status="graded", graded_at=datetime.utcnow())
+    db.session.commit()
+
+
+def _run(label, writer, exam_id, questions, forms) -> None:
+    start_rows = Answer.query.count()
+    started = time.perf_counter()
+    for form in forms:
+        writer(exam_id, questions, form)
+    elapsed = time.perf_counter() - started
+    rows = Answer.query.count() - start_rows
+    print(
+        f"{label:<12} {len(forms):>6} submissions {rows:>8} answers "
+        f"{elapsed:8.3f}s {rows / elapsed:12.0f} rows/sec"
+    )
+
+
+def main() -> None:
+    submissions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    question_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {
+                "TESTING": True,
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            }
+        )
+        with app.app_context():
+            db.create_all()
+            questions = _seed_exam(question_count)
+            exam_id = questions[0].exam_id
+            forms = [_form_for(questions, seed) for seed in range(submissions)]
+
+            _run("per-object", _per_object_path, exam_id, questions, forms)
+            _run("bulk", _bulk_path, exam_id, questions, forms)
+
+            db.session.remove()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Load test: concurrent exam submissions against a bounded connection pool.
+
+Usage:
+    PYTHONPATH=src python benchmarks/load_pool.py [submitters] [questions]
+
+Every submitter is released at the same moment (the "exam start" storm) and
+POSTs one submission through the real student endpoint from its own thread.
+The database is a file-backed SQLite database unless ``DATABASE_URL`` points
+at a server (e.g. MySQL); pool sizing comes from the usual ``DB_POOL_*``
+environment variables. The run fails if any request hit a pool timeout.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from online_exam import create_app, db
+from online_exam.models.exam import Exam
+from online_exam.models.question import Question
+from online_exam.models.user import User
+from online_exam.services.db_pool import pool_metrics
+
+
+def _seed(question_count: int) -> tuple[int, int, list[int]]:
+    student = User(
+        username="load-student",
+        name="Load Student",
+        email="load@example.com",
+        role="student",
+        password_hash="",
+    )
+    exam = Exam(title="Load Test Exam", status="published")
+    db.session.add_all([student, exam])
+    db.session.flush()
+
+    questions = [
+        Question(
+            exam_id=exam.id,
+            question_text=f"MCQ {number}",
+            question_type="mcq",
+            points=5,
+            option_a="A",
+            option_b="B",
+            option_c="C",
+            option_d="D",
+            correct_answer="B",
+            order_num=number,
+        )
+        for number in range(1, question_count + 1)
+    ]
+    db.session.add_all(questions)
+    db.session.commit()
+    return student.id, exam.id, [question.id for question in questions]
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    submitters = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    question_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = os.environ.get("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'load.db')}")
+        app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": uri})
+
+        with app.app_context():
+            db.create_all()
+            student_id, exam_id, question_ids = _seed(question_count)
+            db.session.remove()
+
+        start = threading.Barrier(submitters)
+        latencies: list[float] = []
+        statuses: dict[int, int] = {}
+        errors: list[str] = []
+        lock = threading.Lock()
+
+        def submit(seed: int) -> None:
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session["user_id"] = student_id
+                session["user_role"] = "student"
+            form = {f"question_{qid}": "ABCD"[(qid + seed) % 4] for qid in question_ids}
+
+            start.wait()
+            began = time.perf_counter()
+            try:
+                response = client.post(f"/student/exams/{exam_id}/submit", data=form)
+                status = response.status_code
+            except Exception as error:  # noqa: BLE001 - reported below
+                with lock:
+                    errors.append(repr(error))
+                return
+            elapsed = time.perf_counter() - began
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        threads = [threading.Thread(target=submit, args=(seed,)) for seed in range(submitters)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        with app.app_context():
+            metrics = pool_metrics(db.engine)
+            db.engine.dispose()
+
+    print(f"{submitters} submitters in {wall:.2f}s, statuses {statuses}, errors {len(errors)}")
+    if latencies:
+        print(
+            f"latency p50 {_percentile(latencies, 0.5) * 1000:.1f}ms "
+            f"p95 {_percentile(latencies, 0.95) * 1000:.1f}ms "
+            f"max {max(latencies) * 1000:.1f}ms"
+        )
+    print("pool:", {key: value for key, value in metrics.items() if key != "status"})
+    for error in errors[:5]:
+        print("  ", error)
+
+    if errors or metrics.get("timeouts"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
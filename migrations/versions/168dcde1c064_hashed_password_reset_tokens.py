@@ -0,0 +1,61 @@
+"""hashed password reset tokens
+
+Revision ID: 168dcde1c064
+Revises: ee8f7aa2fe6b
+Create Date: 2026-10-17 04:50:30.620250
+
+"""
+
+import hashlib
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "168dcde1c064"
+down_revision = "ee8f7aa2fe6b"
+branch_labels = None
+depends_on = None
+
+tokens = sa.table(
+    "password_reset_tokens",
+    sa.column("id", sa.Integer),
+    sa.column("token", sa.String),
+    sa.column("token_hash", sa.String),
+)
+
+
+def upgrade():
+    with op.batch_alter_table("password_reset_tokens", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("token_hash", sa.String(length=64), nullable=True))
+
+    # Outstanding links keep working: store the digest of each raw token
+    connection = op.get_bind()
+    for token_id, token in connection.execute(sa.select(tokens.c.id, tokens.c.token)).all():
+        connection.execute(
+            tokens.update()
+            .where(tokens.c.id == token_id)
+            .values(token_hash=hashlib.sha256(token.encode()).hexdigest())
+        )
+
+    with op.batch_alter_table("password_reset_tokens", schema=None) as batch_op:
+        batch_op.alter_column("token_hash", existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_index("ix_password_reset_tokens_token_hash", ["token_hash"], unique=True)
+        batch_op.create_index("ix_password_reset_tokens_expires_at", ["expires_at"], unique=False)
+        batch_op.create_index(
+            "ix_password_reset_tokens_user_id_expires_at", ["user_id", "expires_at"], unique=False
+        )
+        batch_op.drop_column("token")
+
+
+def downgrade():
+    # Raw tokens cannot be recovered from their digests
+    op.execute(tokens.delete())
+
+    with op.batch_alter_table("password_reset_tokens", schema=None) as batch_op:
+        batch_op.drop_index("ix_password_reset_tokens_user_id_expires_at")
+        batch_op.drop_index("ix_password_reset_tokens_expires_at")
+        batch_op.drop_index("ix_password_reset_tokens_token_hash")
+        batch_op.drop_column("token_hash")
+        batch_op.add_column(sa.Column("token", sa.String(length=255), nullable=False))
+        batch_op.create_unique_constraint("uq_password_reset_tokens_token", ["token"])
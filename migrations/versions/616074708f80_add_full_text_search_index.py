@@ -0,0 +1,92 @@
+"""add full text search index
+
+Revision ID: 616074708f80
+Revises: d59840bce6db
+Create Date: 2026-10-17 03:53:56.635186
+
+The index is not part of the model metadata: it is an FTS5 virtual table on
+SQLite and a FULLTEXT-indexed InnoDB table on MySQL (other databases search
+with LIKE and need no index). Existing exams and questions are backfilled;
+``flask rebuild-search-index`` recreates the same contents at any time.
+"""
+
+import re
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "616074708f80"
+down_revision = "d59840bce6db"
+branch_labels = None
+depends_on = None
+
+TAG = re.compile(r"<[^>]+>")
+
+
+def _plain(*parts):
+    return " ".join(TAG.sub(" ", part) for part in parts if part)
+
+
+def upgrade():
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    if dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE search_index "
+            "USING fts5(exam_id UNINDEXED, title, body, tokenize='unicode61 remove_diacritics 2', prefix='3 4')"
+        )
+        op.execute(
+            "INSERT INTO search_index(search_index, rank) VALUES ('rank', 'bm25(0.0, 10.0, 1.0)')"
+        )
+        insert = "INSERT INTO search_index(rowid, exam_id, title, body) VALUES (:id, :exam_id, :title, :body)"
+    elif dialect == "mysql":
+        op.execute(
+            "CREATE TABLE search_index ("
+            "id BIGINT NOT NULL PRIMARY KEY, "
+            "exam_id INTEGER NOT NULL, "
+            "title VARCHAR(255) NOT NULL DEFAULT '', "
+            "body MEDIUMTEXT, "
+            "FULLTEXT KEY ix_search_index_title (title), "
+            "FULLTEXT KEY ix_search_index_title_body (title, body)"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+        )
+        insert = "INSERT INTO search_index (id, exam_id, title, body) VALUES (:id, :exam_id, :title, :body)"
+    else:
+        return
+
+    exams = bind.execute(sa.text("SELECT id, title, description, instructions FROM exams"))
+    documents = [
+        {
+            "id": 2 * row.id,
+            "exam_id": row.id,
+            "title": (row.title or "")[:255],
+            "body": _plain(row.description, row.instructions),
+        }
+        for row in exams
+    ]
+    questions = bind.execute(
+        sa.text(
+            "SELECT id, exam_id, question_text, option_a, option_b, option_c, option_d "
+            "FROM questions"
+        )
+    )
+    documents += [
+        {
+            "id": 2 * row.id + 1,
+            "exam_id": row.exam_id,
+            "title": "",
+            "body": _plain(
+                row.question_text, row.option_a, row.option_b, row.option_c, row.option_d
+            ),
+        }
+        for row in questions
+    ]
+    if documents:
+        bind.execute(sa.text(insert), documents)
+
+
+def downgrade():
+    if op.get_bind().dialect.name in ("sqlite", "mysql"):
+        op.execute("DROP TABLE search_index")
@@ -0,0 +1,55 @@
+"""submission student id
+
+Revision ID: 90e4e4008d77
+Revises: 168dcde1c064
+Create Date: 2026-10-17 04:59:32.089872
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "90e4e4008d77"
+down_revision = "168dcde1c064"
+branch_labels = None
+depends_on = None
+
+submissions = sa.table(
+    "submissions",
+    sa.column("student_id", sa.Integer),
+    sa.column("student_name", sa.String),
+)
+users = sa.table(
+    "users",
+    sa.column("id", sa.Integer),
+    sa.column("name", sa.String),
+    sa.column("role", sa.String),
+)
+
+
+def upgrade():
+    with op.batch_alter_table("submissions", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("student_id", sa.Integer(), nullable=True))
+        batch_op.create_index("ix_submissions_student_id", ["student_id"], unique=False)
+        batch_op.create_foreign_key(
+            "fk_submissions_student_id_users", "users", ["student_id"], ["id"]
+        )
+
+    # Older submissions only carry a name: link those whose name belongs to
+    # exactly one student account and leave shared names unresolved
+    same_name = (users.c.role == "student") & (users.c.name == submissions.c.student_name)
+    op.execute(
+        submissions.update()
+        .where(
+            sa.select(sa.func.count()).where(same_name).scalar_subquery() == 1,
+        )
+        .values(student_id=sa.select(sa.func.min(users.c.id)).where(same_name).scalar_subquery())
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("submissions", schema=None) as batch_op:
+        batch_op.drop_constraint("fk_submissions_student_id_users", type_="foreignkey")
+        batch_op.drop_index("ix_submissions_student_id")
+        batch_op.drop_column("student_id")
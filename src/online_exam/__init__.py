@@ -1,10 +1,13 @@
 from flask import Flask, g, redirect, request, session, url_for
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
+from werkzeug.local import LocalProxy
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from .config import Config
+from .services.db_routing import RoutingSession, configure_replicas
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 
 
@@ -17,20 +20,57 @@ def create_app(test_config=None):
     if test_config:
         app.config.update(test_config)
 
+    from .services.db_pool import build_engine_options
+
+    # Explicit SQLALCHEMY_ENGINE_OPTIONS override the pool settings
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **build_engine_options(app.config),
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+    }
+    configure_replicas(app)
+
+    # remote_addr is the client as seen by the outermost trusted proxy
+    proxies = app.config.get("TRUSTED_PROXY_COUNT", 0)
+    if proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
+    else:
+        proxy_warned = False
+
+        @app.before_request
+        def warn_about_untrusted_proxy():
+            # Behind a proxy every client has the proxy's address and shares its rate limit
+            nonlocal proxy_warned
+            if not proxy_warned and "X-Forwarded-For" in request.headers:
+                proxy_warned = True
+                app.logger.warning(
+                    "Request forwarded by a proxy but TRUSTED_PROXY_COUNT is 0: every client "
+                    "shares the proxy's address and per-IP rate limit. Set TRUSTED_PROXY_COUNT "
+                    "to the number of reverse proxies in front of the app."
+                )
+
     # Initialize extensions
     db.init_app(app)
 
     from .models import (  # noqa: F401
         Answer,
+        DraftAnswer,
         Exam,
+        ExamDraft,
+        ExamStats,
+        GradeNotification,
         LoginAttempt,
+        LoginAttemptHourlyByIdentifier,
+        LoginAttemptHourlyByIp,
         PasswordResetToken,
         Question,
         Submission,
         User,
     )
 
-    migrate.init_app(app, db)
+    # Also registers the search index DDL and sync events
+    from .services.search import include_in_migrations
+
+    migrate.init_app(app, db, include_name=include_in_migrations)
 
     # Register blueprints
     from .routes.analytics_routes import analytics_bp
@@ -53,12 +93,23 @@ def create_app(test_config=None):
     app.register_blueprint(rbac_bp)
     app.register_blueprint(profile_bp)
 
+    from .commands import register_commands
+
+    register_commands(app)
+
+    from .utils.http_cache import init_static_caching
+
+    init_static_caching(app)
+
     auth_paths = {"/login", "/register", "/auth/verify-otp"}
 
+    from .utils.auth import get_current_user
+
     @app.before_request
     def load_current_user():
-        user_id = session.get("user_id")
-        g.current_user = User.query.get(user_id) if user_id else None
+        # Resolved on first use, so requests that never read it issue no query
+        g.pop("_current_user", None)
+        g.current_user = LocalProxy(get_current_user)
 
     def _is_public_path(path: str) -> bool:
         if path.startswith("/static/") or path == "/favicon.ico":
@@ -85,7 +136,12 @@ def create_app(test_config=None):
         if not user_id or not user_role:
             return redirect(url_for("auth.login"))
 
-        profile_paths = {"/profile", "/profile/2fa/enable", "/profile/2fa/disable"}
+        profile_paths = {
+            "/profile",
+            "/profile/2fa/enable",
+            "/profile/2fa/disable",
+            "/profile/2fa/totp",
+        }
 
         if path.startswith("/student"):
             if user_role != "student":
@@ -100,7 +156,7 @@ def create_app(test_config=None):
 
     @app.context_processor
     def inject_user():
-        current_user = getattr(g, "current_user", None)
+        current_user = get_current_user()
         return {
             "current_user": current_user,
             "is_authenticated": current_user is not None,
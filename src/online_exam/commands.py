@@ -0,0 +1,106 @@
+import click
+from flask import Flask, current_app
+
+from . import db
+from .models.exam import Exam
+from .services.exam_stats import rebuild_exam_stats
+from .services.grade_publishing import send_all_notifications
+from .services.login_retention import prune_login_attempts, roll_up_login_attempts
+from .services.regrade import regrade_exam
+from .services.reset_tokens import sweep_reset_tokens
+from .services.search import reindex_all
+from .services.submission_queue import drain, get_submission_queue
+
+
+@click.command("regrade-exam")
+@click.argument("exam_id", type=int)
+def regrade_exam_command(exam_id: int) -> None:
+    """Re-grade every submission of EXAM_ID against its current answer key."""
+    exam = db.session.get(Exam, exam_id)
+    if exam is None:
+        raise click.ClickException(f"Exam {exam_id} not found.")
+
+    result = regrade_exam(exam)
+    db.session.commit()
+
+    click.echo(
+        f"Re-graded {result.submissions} submissions: "
+        f"{result.answers_changed} answers and {result.submissions_changed} scores changed."
+    )
+
+
+@click.command("rebuild-exam-stats")
+@click.argument("exam_id", type=int, required=False)
+def rebuild_exam_stats_command(exam_id: int | None) -> None:
+    """Recompute the ExamStats summary of EXAM_ID, or of every exam."""
+    if exam_id is None:
+        exam_ids = db.session.execute(db.select(Exam.id)).scalars().all()
+    elif db.session.get(Exam, exam_id) is None:
+        raise click.ClickException(f"Exam {exam_id} not found.")
+    else:
+        exam_ids = [exam_id]
+
+    for current_id in exam_ids:
+        rebuild_exam_stats(current_id)
+        db.session.commit()
+
+    click.echo(f"Rebuilt statistics for {len(exam_ids)} exams.")
+
+
+@click.command("rebuild-search-index")
+def rebuild_search_index_command() -> None:
+    """Recreate the full-text search index from all exams and questions."""
+    count = reindex_all(db.session.connection())
+    db.session.commit()
+
+    click.echo(f"Indexed {count} documents.")
+
+
+@click.command("drain-submission-queue")
+def drain_submission_queue_command() -> None:
+    """Store every queued submission now, without background workers."""
+    queue = get_submission_queue()
+    processed = drain(queue)
+
+    click.echo(f"Processed {processed} queued submissions ({queue.pending_count()} left).")
+
+
+@click.command("send-grade-notifications")
+def send_grade_notifications_command() -> None:
+    """Send every queued "grades published" notification."""
+    click.echo(f"Sent {send_all_notifications()} grade notifications.")
+
+
+@click.command("prune-login-attempts")
+@click.option("--days", type=int, help="Days raw login attempts are kept.")
+@click.option("--rollup-days", type=int, help="Days hourly roll-ups are kept.")
+def prune_login_attempts_command(days: int | None, rollup_days: int | None) -> None:
+    """Roll up completed hours of login attempts, then prune old rows."""
+    config = current_app.config
+    added = roll_up_login_attempts()
+    db.session.commit()
+    result = prune_login_attempts(
+        days if days is not None else config["LOGIN_ATTEMPT_RETENTION_DAYS"],
+        rollup_days if rollup_days is not None else config["LOGIN_ROLLUP_RETENTION_DAYS"],
+    )
+
+    click.echo(
+        f"Added {added} roll-up rows; deleted {result.attempts_deleted} login attempts "
+        f"and {result.rollups_deleted} roll-up rows."
+    )
+
+
+@click.command("sweep-reset-tokens")
+def sweep_reset_tokens_command() -> None:
+    """Delete expired and used password reset tokens."""
+    click.echo(f"Deleted {sweep_reset_tokens()} password reset tokens.")
+
+
+def register_commands(app: Flask) -> None:
+    app.cli.add_command(regrade_exam_command)
+    app.cli.add_command(rebuild_exam_stats_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(drain_submission_queue_command)
+    app.cli.add_command(send_grade_notifications_command)
+    app.cli.add_command(prune_login_attempts_command)
+    app.cli.add_command(sweep_reset_tokens_command)
@@ -1,3 +1,21 @@
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
 class Config:
     DB_NAME = "examdb"
     DB_USER = "examuser"
@@ -5,7 +23,94 @@ class Config:
     DB_HOST = "127.0.0.1"
     DB_PORT = "3306"
 
-    SQLALCHEMY_DATABASE_URI = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        "DATABASE_URL", f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+    )
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = "dev-secret-key"
+
+    # Connection pool, per worker process (not used for in-memory SQLite)
+    DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 10)
+    DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 20)
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT = _env_float("DB_POOL_TIMEOUT", 10)
+    # Recycle connections before MySQL's wait_timeout closes them server-side
+    DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)
+    DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+    # MySQL driver timeouts in seconds
+    DB_CONNECT_TIMEOUT = _env_int("DB_CONNECT_TIMEOUT", 10)
+    DB_READ_TIMEOUT = _env_int("DB_READ_TIMEOUT", 30)
+    DB_WRITE_TIMEOUT = _env_int("DB_WRITE_TIMEOUT", 30)
+
+    # Read replicas for read-only views, comma separated in DATABASE_REPLICA_URLS
+    SQLALCHEMY_REPLICA_URIS = tuple(
+        uri for uri in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if uri
+    )
+    # Seconds a browser session reads from the primary after committing a write
+    REPLICA_READ_YOUR_WRITES_SECONDS = _env_int("REPLICA_READ_YOUR_WRITES_SECONDS", 5)
+
+    # Queued submit path: SQLite WAL file (default: instance folder) and the
+    # number of background threads storing queued submissions (0: none)
+    SUBMISSION_QUEUE_PATH = os.environ.get("SUBMISSION_QUEUE_PATH")
+    SUBMISSION_QUEUE_WORKERS = _env_int("SUBMISSION_QUEUE_WORKERS", 2)
+
+    # Send "grades published" emails from a background thread; when disabled
+    # they wait for `flask send-grade-notifications`
+    GRADE_NOTIFIER_ENABLED = _env_bool("GRADE_NOTIFIER_ENABLED", True)
+
+    # Write login attempts from a background thread in multi-row INSERTs, once
+    # a batch is full or FLUSH_SECONDS have passed (off: commit each attempt)
+    LOGIN_AUDIT_BUFFERED = _env_bool("LOGIN_AUDIT_BUFFERED", True)
+    LOGIN_AUDIT_BATCH_SIZE = _env_int("LOGIN_AUDIT_BATCH_SIZE", 200)
+    LOGIN_AUDIT_FLUSH_SECONDS = _env_float("LOGIN_AUDIT_FLUSH_SECONDS", 1.0)
+
+    # werkzeug method and cost for new password hashes; weaker hashes are
+    # upgraded on login. Size with benchmarks/bench_password_hashing.py
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
+    # Processes hashing passwords (0: hash on the request thread), the
+    # hashes that may be queued or running at once, and the seconds a request
+    # waits for a slot before it is answered 503
+    HASHING_WORKERS = _env_int("HASHING_WORKERS", os.cpu_count() or 1)
+    HASHING_MAX_PENDING = _env_int("HASHING_MAX_PENDING", 8 * HASHING_WORKERS)
+    HASHING_QUEUE_TIMEOUT = _env_float("HASHING_QUEUE_TIMEOUT", 5.0)
+
+    # Login, 2FA and password reset requests allowed per client IP and per
+    # account, as (requests, seconds). The per-IP limit is generous: a whole
+    # class may share one NAT address. RATE_LIMIT_BACKEND may be set to a
+    # RateLimitBackend shared by all workers; by default each process counts
+    # on its own, in an LRU of at most RATE_LIMIT_MAX_KEYS buckets
+    RATE_LIMIT_ENABLED = _env_bool("RATE_LIMIT_ENABLED", True)
+    RATE_LIMIT_PER_IP = (_env_int("RATE_LIMIT_PER_IP", 300), 60)
+    RATE_LIMIT_PER_ACCOUNT = (_env_int("RATE_LIMIT_PER_ACCOUNT", 10), 300)
+    RATE_LIMIT_BACKEND = None
+    RATE_LIMIT_MAX_KEYS = _env_int("RATE_LIMIT_MAX_KEYS", 100_000)
+    # Reverse proxies in front of the app. Their X-Forwarded-For/-Proto
+    # entries are trusted to give the client address; with 0, forwarded
+    # headers are ignored, since any client can send them. Deployments behind
+    # a proxy must set it: otherwise every client has the proxy's address and
+    # shares one per-IP rate limit (a warning is logged when this is detected)
+    TRUSTED_PROXY_COUNT = _env_int("TRUSTED_PROXY_COUNT", 0)
+
+    # Delete expired and used password reset tokens from a background thread
+    # every RESET_TOKEN_SWEEP_SECONDS (disabled: `flask sweep-reset-tokens`)
+    RESET_TOKEN_SWEEPER_ENABLED = _env_bool("RESET_TOKEN_SWEEPER_ENABLED", True)
+    RESET_TOKEN_SWEEP_SECONDS = _env_int("RESET_TOKEN_SWEEP_SECONDS", 600)
+
+    # Days raw login attempts and their hourly roll-ups are kept by
+    # `flask prune-login-attempts`
+    LOGIN_ATTEMPT_RETENTION_DAYS = _env_int("LOGIN_ATTEMPT_RETENTION_DAYS", 30)
+    LOGIN_ROLLUP_RETENTION_DAYS = _env_int("LOGIN_ROLLUP_RETENTION_DAYS", 365)
+
+    # Seconds the exam dashboard status totals are cached per process (0 disables)
+    EXAM_COUNTS_TTL_SECONDS = 30
+
+    # Seconds a signed-in user's identity is cached per process (0 disables)
+    USER_CACHE_TTL_SECONDS = 60
+
+    # Published exams whose rendered question cards are kept per process (LRU)
+    EXAM_RENDER_CACHE_SIZE = 64
+
+    # max-age of static files requested without a ``v`` version parameter
+    STATIC_MAX_AGE_SECONDS = _env_int("STATIC_MAX_AGE_SECONDS", 3600)
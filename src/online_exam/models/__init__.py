@@ -1,17 +1,26 @@
 from .exam import Exam
+from .exam_draft import DraftAnswer, ExamDraft
+from .exam_stats import ExamStats
+from .grade_notification import GradeNotification
 from .password_reset_token import PasswordResetToken
 from .question import Question
 from .submission import Answer, Submission
 from .user import User
-from .login_attempt import LoginAttempt
+from .login_attempt import LoginAttempt, LoginAttemptHourlyByIdentifier, LoginAttemptHourlyByIp
 
 __all__ = [
     "PasswordResetToken",
     "User",
     "Exam",
+    "ExamDraft",
+    "DraftAnswer",
+    "ExamStats",
+    "GradeNotification",
     "Question",
     "Question",
     "Submission",
     "Answer",
     "LoginAttempt",
+    "LoginAttemptHourlyByIdentifier",
+    "LoginAttemptHourlyByIp",
 ]
@@ -4,7 +4,12 @@ from .. import db
 
 class Exam(db.Model):  # type: ignore[misc, name-defined]
     __tablename__ = "exams"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Listing filters by status and sorts by creation date
+        db.Index("ix_exams_status_created_at", "status", "created_at"),
+        db.Index("ix_exams_created_at", "created_at"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -27,3 +32,9 @@ class Exam(db.Model):  # type: ignore[misc, name-defined]
         lazy="dynamic",  # allows you to call .order_by() and .all()
         cascade="all, delete-orphan",
     )
+
+    stats = db.relationship(
+        "ExamStats",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
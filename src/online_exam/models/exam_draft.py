@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from .. import db
+
+
+class ExamDraft(db.Model):  # type: ignore[misc, name-defined]
+    """A student's in-progress attempt at an exam, kept until it is submitted."""
+
+    __tablename__ = "exam_drafts"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    exam_id = db.Column(db.Integer, db.ForeignKey("exams.id"), primary_key=True)
+    student_name = db.Column(db.String(200), nullable=False, default="")
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ExamDraft user={self.user_id} exam={self.exam_id}>"
+
+
+class DraftAnswer(db.Model):  # type: ignore[misc, name-defined]
+    """The saved answer and review flag of one question in a student's draft.
+
+    Keyed by student, exam and question (not by ``ExamDraft``), so an autosave
+    writes its answers without looking up or creating a parent row first.
+    """
+
+    __tablename__ = "draft_answers"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    exam_id = db.Column(db.Integer, db.ForeignKey("exams.id"), primary_key=True)
+    question_id = db.Column(db.Integer, db.ForeignKey("questions.id"), primary_key=True)
+
+    # NULL until the student touches the answer or the flag respectively
+    answer = db.Column(db.Text, nullable=True)
+    flagged = db.Column(db.Boolean, nullable=True)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DraftAnswer user={self.user_id} exam={self.exam_id} Q{self.question_id}>"
@@ -0,0 +1,72 @@
+import math
+from datetime import datetime
+
+from .. import db
+
+
+class ExamStats(db.Model):  # type: ignore[misc, name-defined]
+    """Running score statistics for one exam, maintained on every grade change."""
+
+    __tablename__ = "exam_stats"
+
+    exam_id = db.Column(db.Integer, db.ForeignKey("exams.id"), primary_key=True)
+
+    submission_count = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.BigInteger, nullable=False, default=0)
+    score_sq_sum = db.Column(db.BigInteger, nullable=False, default=0)
+    min_score = db.Column(db.Integer, nullable=False, default=0)
+    max_score = db.Column(db.Integer, nullable=False, default=0)
+    pass_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Histogram buckets on percentage
+    range_90_100 = db.Column(db.Integer, nullable=False, default=0)
+    range_80_89 = db.Column(db.Integer, nullable=False, default=0)
+    range_70_79 = db.Column(db.Integer, nullable=False, default=0)
+    range_60_69 = db.Column(db.Integer, nullable=False, default=0)
+    range_50_59 = db.Column(db.Integer, nullable=False, default=0)
+    range_below_50 = db.Column(db.Integer, nullable=False, default=0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ExamStats exam={self.exam_id} n={self.submission_count}>"
+
+    @property
+    def avg_score(self) -> float:
+        if not self.submission_count:
+            return 0
+        return self.score_sum / self.submission_count
+
+    @property
+    def std_dev(self) -> float:
+        """Population standard deviation of ``total_score``."""
+        if not self.submission_count:
+            return 0.0
+        mean = self.avg_score
+        variance = self.score_sq_sum / self.submission_count - mean * mean
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def failed(self) -> int:
+        return self.submission_count - self.pass_count
+
+    @property
+    def pass_rate(self) -> float:
+        if not self.submission_count:
+            return 0
+        return self.pass_count / self.submission_count * 100
+
+    @property
+    def fail_rate(self) -> float:
+        return 100 - self.pass_rate if self.submission_count else 0
+
+    @property
+    def score_ranges(self) -> dict[str, int]:
+        return {
+            "90-100": self.range_90_100,
+            "80-89": self.range_80_89,
+            "70-79": self.range_70_79,
+            "60-69": self.range_60_69,
+            "50-59": self.range_50_59,
+            "Below 50": self.range_below_50,
+        }
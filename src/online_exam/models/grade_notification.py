@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from .. import db
+
+
+class GradeNotification(db.Model):  # type: ignore[misc, name-defined]
+    """Outbox entry: tell a student that the grade of a submission was published.
+
+    Rows are written in the same transaction that publishes the grades and
+    deleted once the notification has been handed to the mail sender.
+    """
+
+    __tablename__ = "grade_notifications"
+    __table_args__ = (db.Index("ix_grade_notifications_attempts_id", "attempts", "id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    submission_id = db.Column(db.Integer, db.ForeignKey("submissions.id"), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<GradeNotification {self.id}: submission={self.submission_id}>"
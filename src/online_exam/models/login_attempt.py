@@ -1,10 +1,17 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from sqlalchemy import literal, select, union_all
 
 from .. import db
 
 
 class LoginAttempt(db.Model):  # type: ignore[misc, name-defined]
     __tablename__ = "login_attempts"
+    __table_args__ = (
+        db.Index("ix_login_attempts_success_timestamp", "success", "timestamp"),
+        db.Index("ix_login_attempts_ip_address", "ip_address"),
+        db.Index("ix_login_attempts_timestamp", "timestamp"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_identifier = db.Column(db.String(255), nullable=False)
@@ -22,11 +29,69 @@ class LoginAttempt(db.Model):  # type: ignore[misc, name-defined]
     def failed_counts_by_ip(cls, limit: int = 20):
         """Return failed attempt counts grouped by IP for quick triage."""
 
-        return (
-            db.session.query(cls.ip_address, db.func.count(cls.id).label("attempt_count"))
-            .filter_by(success=False)
-            .group_by(cls.ip_address)
-            .order_by(db.func.count(cls.id).desc())
-            .limit(limit)
-            .all()
+        return LoginAttemptHourlyByIp.failed_counts(limit)
+
+    @classmethod
+    def failed_counts_by_identifier(cls, limit: int = 20):
+        """Return failed attempt counts grouped by account identifier."""
+
+        return LoginAttemptHourlyByIdentifier.failed_counts(limit)
+
+
+class _HourlyRollup:
+    """Failed and successful attempts per hour and key, kept after raw rows are pruned.
+
+    Only whole hours are rolled up, so the hours after ``rolled_up_until`` are
+    still read from ``login_attempts``.
+    """
+
+    # Primary key (hour, key), declared by each table so that it leads with hour
+    hour = db.Column(db.DateTime, nullable=False)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    succeeded = db.Column(db.Integer, nullable=False, default=0)
+
+    # Also the name of the ``LoginAttempt`` column rolled up by
+    key_name: str
+
+    @classmethod
+    def rolled_up_until(cls) -> datetime | None:
+        """End of the last rolled-up hour, or ``None`` before the first roll-up."""
+        last_hour = db.session.scalar(select(db.func.max(cls.hour)))
+        return None if last_hour is None else last_hour + timedelta(hours=1)
+
+    @classmethod
+    def failed_counts(cls, limit: int):
+        """Failed attempts per key: the roll-ups plus the raw rows not rolled up yet."""
+        key, raw_key = getattr(cls, cls.key_name), getattr(LoginAttempt, cls.key_name)
+        rolled = select(key.label("key"), cls.failed.label("attempts")).where(cls.failed > 0)
+        recent = select(raw_key.label("key"), literal(1).label("attempts")).where(
+            LoginAttempt.success.is_(False)
         )
+        until = cls.rolled_up_until()
+        if until is not None:
+            recent = recent.where(LoginAttempt.timestamp >= until)
+
+        combined = union_all(rolled, recent).subquery()
+        total = db.func.sum(combined.c.attempts)
+        return db.session.execute(
+            select(combined.c.key.label(cls.key_name), total.label("attempt_count"))
+            .group_by(combined.c.key)
+            .order_by(total.desc())
+            .limit(limit)
+        ).all()
+
+
+class LoginAttemptHourlyByIp(_HourlyRollup, db.Model):  # type: ignore[misc, name-defined]
+    __tablename__ = "login_attempts_hourly_by_ip"
+    __table_args__ = (db.PrimaryKeyConstraint("hour", "ip_address"),)
+
+    key_name = "ip_address"
+    ip_address = db.Column(db.String(45), nullable=False)
+
+
+class LoginAttemptHourlyByIdentifier(_HourlyRollup, db.Model):  # type: ignore[misc, name-defined]
+    __tablename__ = "login_attempts_hourly_by_identifier"
+    __table_args__ = (db.PrimaryKeyConstraint("hour", "user_identifier"),)
+
+    key_name = "user_identifier"
+    user_identifier = db.Column(db.String(255), nullable=False)
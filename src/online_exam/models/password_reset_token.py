@@ -1,14 +1,32 @@
+import hashlib
 from datetime import datetime, timedelta
 
 from .. import db
 
 
+def hash_reset_token(token: str) -> str:
+    """SHA-256 digest under which a reset token is stored and looked up."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 class PasswordResetToken(db.Model):  # type: ignore[misc, name-defined]
+    """A password reset link, stored as the digest of its token.
+
+    The raw token only exists in the emailed link, so a leaked table cannot be
+    used to reset passwords. Used tokens also expire at once, so "expired" is
+    the one condition the sweeper deletes by.
+    """
+
     __tablename__ = "password_reset_tokens"
+    __table_args__ = (
+        db.Index("ix_password_reset_tokens_token_hash", "token_hash", unique=True),
+        db.Index("ix_password_reset_tokens_user_id_expires_at", "user_id", "expires_at"),
+        db.Index("ix_password_reset_tokens_expires_at", "expires_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    token = db.Column(db.String(255), unique=True, nullable=False)
+    token_hash = db.Column(db.String(64), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     expires_at = db.Column(db.DateTime, nullable=False)
     used = db.Column(db.Boolean, default=False, nullable=False)
@@ -18,7 +36,15 @@ class PasswordResetToken(db.Model):  # type: ignore[misc, name-defined]
     @classmethod
     def create_for_user(cls, user_id: int, token: str, expires_in_minutes: int = 30):
         expires_at = datetime.utcnow() + timedelta(minutes=expires_in_minutes)
-        return cls(user_id=user_id, token=token, expires_at=expires_at)
+        return cls(user_id=user_id, token_hash=hash_reset_token(token), expires_at=expires_at)
+
+    @classmethod
+    def find(cls, token: str):
+        return cls.query.filter_by(token_hash=hash_reset_token(token)).first()
 
     def is_expired(self) -> bool:
         return datetime.utcnow() > self.expires_at
+
+    def mark_used(self) -> None:
+        self.used = True
+        self.expires_at = datetime.utcnow()
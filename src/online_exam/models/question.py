@@ -7,7 +7,10 @@ class Question(db.Model):  # type: ignore[misc, name-defined]
     """Question model supporting both MCQ and written question types."""
 
     __tablename__ = "questions"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        db.Index("ix_questions_exam_id_order_num", "exam_id", "order_num"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     exam_id = db.Column(db.Integer, db.ForeignKey("exams.id"), nullable=False)
@@ -7,11 +7,20 @@ class Submission(db.Model):  # type: ignore[misc, name-defined]
     """Submission model for storing student exam submissions and grades."""
 
     __tablename__ = "submissions"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        db.Index("ix_submissions_exam_id_submitted_at", "exam_id", "submitted_at"),
+        db.Index("ix_submissions_exam_id_status", "exam_id", "status"),
+        db.Index("ix_submissions_submitted_at", "submitted_at"),
+        db.Index("ix_submissions_queue_ticket", "queue_ticket", unique=True),
+        db.Index("ix_submissions_student_id", "student_id"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     exam_id = db.Column(db.Integer, db.ForeignKey("exams.id"), nullable=False)
     student_name = db.Column(db.String(200), nullable=False)  # For now, simple name field
+    # The account that submitted; empty for demo submissions and older rows
+    student_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
 
     # Grading info
     total_score = db.Column(db.Integer, default=0)
@@ -22,6 +31,10 @@ class Submission(db.Model):  # type: ignore[misc, name-defined]
     status = db.Column(db.String(20), default="pending")  # pending, graded
     graded_at = db.Column(db.DateTime, nullable=True)
 
+    # Set for submissions accepted through the submission queue, so a retried
+    # queue entry is never stored twice
+    queue_ticket = db.Column(db.String(36), nullable=True)
+
     # Timestamps
     submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -57,7 +70,10 @@ class Answer(db.Model):  # type: ignore[misc, name-defined]
     """Answer model for storing individual question answers."""
 
     __tablename__ = "answers"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        db.Index("ix_answers_submission_id", "submission_id"),
+        {"extend_existing": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     submission_id = db.Column(db.Integer, db.ForeignKey("submissions.id"), nullable=False)
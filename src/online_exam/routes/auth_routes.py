@@ -1,54 +1,98 @@
+import math
 import re
-import secrets
 from datetime import datetime
 
-from flask import Blueprint, flash, redirect, render_template, request, session, url_for
-from werkzeug.security import generate_password_hash
+from flask import (
+    Blueprint,
+    flash,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
+from sqlalchemy import or_, select, update
 
 from .. import db
-from ..models.login_attempt import LoginAttempt
 from ..models.password_reset_token import PasswordResetToken
 from ..models.user import User
+from ..services.hashing import HashingBusy
+from ..services.login_audit import record_login_attempt
+from ..services.rate_limit import rate_limit, rate_limit_account
+from ..services.reset_tokens import get_reset_token_sweeper, issue_reset_token
 from ..utils.email_utils import send_otp_email, send_password_reset_email
-from ..utils.otp_utils import generate_otp_code, hash_otp, otp_expiry_time
+from ..utils.otp_utils import (
+    OTP_MAX_ATTEMPTS,
+    generate_otp_code,
+    hash_otp,
+    otp_expiry_time,
+    totp_step,
+)
 
 auth_bp = Blueprint("auth", __name__)
 
 PASSWORD_REGEX = re.compile(r"^(?=.*[A-Z])(?=.*\d)(?=.*[^\w\s]).{8,}$")
 
+HASHING_BUSY_RETRY_SECONDS = 2
+_FORM_TEMPLATES = {
+    "auth.login": "auth/login.html",
+    "auth.verify_otp": "auth/verify_otp.html",
+    "auth.register": "auth/register.html",
+    "auth.reset_with_token": "auth/reset_token.html",
+}
+
 
 def _validate_password_complexity(password: str) -> bool:
     return bool(PASSWORD_REGEX.match(password))
 
 
+def _get_client_ip() -> str:
+    # Forwarded headers are applied by ProxyFix, for TRUSTED_PROXY_COUNT proxies only
+    return request.remote_addr or "unknown"
+
+
+def _too_many_attempts(scope: str, account: str | None, template: str, **context):
+    """Return a 429 page when this client or account is over its limit, else ``None``."""
+    retry_after = rate_limit(scope, _get_client_ip(), account)
+    if not retry_after:
+        return None
+
+    seconds = math.ceil(retry_after)
+    flash(f"Too many attempts. Please try again in {seconds} seconds.", "danger")
+    response = make_response(render_template(template, **context), 429)
+    response.headers["Retry-After"] = str(seconds)
+    return response
+
+
+@auth_bp.errorhandler(HashingBusy)
+def hashing_busy(error):
+    """Ask the client to retry when the password hashing pool is saturated."""
+    db.session.rollback()
+    flash("The server is busy. Please try again in a moment.", "warning")
+    template = _FORM_TEMPLATES.get(request.endpoint, "auth/login.html")
+    response = make_response(render_template(template, **(request.view_args or {})), 503)
+    response.headers["Retry-After"] = str(HASHING_BUSY_RETRY_SECONDS)
+    return response
+
+
 @auth_bp.route("/login", methods=["GET", "POST"])
 def login():
     if request.method == "POST":
         email = request.form.get("email", "").strip().lower()
         password = request.form.get("password", "")
 
-        user = User.query.filter_by(email=email).first()
-
-        def _get_client_ip() -> str:
-            forwarded_for = request.headers.get("X-Forwarded-For", "")
-            if forwarded_for:
-                return forwarded_for.split(",")[0].strip()
+        limited = _too_many_attempts("login", email, "auth/login.html", email=email)
+        if limited:
+            return limited
 
-            return request.remote_addr or "unknown"
+        user = User.query.filter_by(email=email).first()
 
         def _log_attempt(success: bool) -> None:
-            attempt = LoginAttempt(
-                user_identifier=email,
-                ip_address=_get_client_ip(),
-                success=success,
-            )
-            db.session.add(attempt)
-            try:
-                db.session.commit()
-            except Exception:
-                db.session.rollback()
+            record_login_attempt(email, _get_client_ip(), success)
 
         if not user or not user.verify_password(password):
+            rate_limit_account("login", email)
             flash("Invalid email or password.", "danger")
             _log_attempt(False)
             return render_template("auth/login.html", email=email)
@@ -58,18 +102,28 @@ def login():
             _log_attempt(False)
             return render_template("auth/login.html", email=email, show_header=False)
 
-        if user.two_factor_enabled:
-            otp_code = generate_otp_code()
-            user.otp_code = hash_otp(otp_code)
-            user.otp_expires_at = otp_expiry_time()
-            db.session.add(user)
+        if db.session.is_modified(user):
+            # The password hash was upgraded to the current policy
             db.session.commit()
 
-            send_otp_email(user, otp_code)
+        if user.two_factor_enabled:
+            if user.totp_secret:
+                message = "Enter the code shown in your authenticator app."
+            else:
+                otp_code = generate_otp_code()
+                user.otp_code = hash_otp(otp_code)
+                user.otp_expires_at = otp_expiry_time()
+                user.otp_attempts = 0
+                db.session.add(user)
+                db.session.commit()
+
+                send_otp_email(user, otp_code)
+                message = "A verification code has been sent to your email."
+
             session.clear()
             session["pending_2fa_user_id"] = user.id
             session["pending_2fa_email"] = email
-            flash("A verification code has been sent to your email.", "info")
+            flash(message, "info")
             return redirect(url_for("auth.verify_otp"))
 
         session["user_id"] = user.id
@@ -92,6 +146,47 @@ def login():
     return render_template("auth/login.html")
 
 
+def _claim_totp_step(user: User, submitted_code: str) -> bool:
+    """Accept a TOTP code once: record its time step unless a later login already has."""
+    step = totp_step(user.totp_secret, submitted_code)
+    if step is None:
+        return False
+    claimed = db.session.execute(
+        update(User)
+        .where(
+            User.id == user.id,
+            or_(User.totp_last_step.is_(None), User.totp_last_step < step),
+        )
+        .values(totp_last_step=step)
+    ).rowcount
+    db.session.commit()
+    return claimed == 1
+
+
+def _count_wrong_otp(user: User) -> int:
+    """Count a wrong emailed code in the database, so parallel guesses all add up."""
+    db.session.execute(
+        update(User).where(User.id == user.id).values(otp_attempts=User.otp_attempts + 1)
+    )
+    db.session.commit()
+    return db.session.scalar(select(User.otp_attempts).where(User.id == user.id))
+
+
+def _consume_otp(user: User) -> bool:
+    """Clear the emailed code, unless another request used it or ran out its attempts."""
+    consumed = db.session.execute(
+        update(User)
+        .where(
+            User.id == user.id,
+            User.otp_code == user.otp_code,
+            User.otp_attempts < OTP_MAX_ATTEMPTS,
+        )
+        .values(otp_code=None, otp_expires_at=None)
+    ).rowcount
+    db.session.commit()
+    return consumed == 1
+
+
 @auth_bp.route("/auth/verify-otp", methods=["GET", "POST"])
 def verify_otp():
     pending_user_id = session.get("pending_2fa_user_id")
@@ -99,6 +194,13 @@ def verify_otp():
     if not pending_user_id:
         return redirect(url_for("auth.login"))
 
+    if request.method == "POST":
+        limited = _too_many_attempts(
+            "verify_otp", str(pending_user_id), "auth/verify_otp.html", show_header=False
+        )
+        if limited:
+            return limited
+
     user = User.query.get(pending_user_id)
 
     if not user or not user.two_factor_enabled:
@@ -106,56 +208,66 @@ def verify_otp():
         session.pop("pending_2fa_email", None)
         return redirect(url_for("auth.login"))
 
-    def _get_client_ip() -> str:
-        forwarded_for = request.headers.get("X-Forwarded-For", "")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-
-        return request.remote_addr or "unknown"
-
     def _log_attempt(success: bool) -> None:
-        attempt = LoginAttempt(
-            user_identifier=session.get("pending_2fa_email", user.email),
-            ip_address=_get_client_ip(),
-            success=success,
+        record_login_attempt(
+            session.get("pending_2fa_email", user.email), _get_client_ip(), success
         )
-        db.session.add(attempt)
-        try:
-            db.session.commit()
-        except Exception:
-            db.session.rollback()
+        if not success:
+            rate_limit_account("verify_otp", str(pending_user_id))
+
+    uses_totp = bool(user.totp_secret)
 
     if request.method == "POST":
         submitted_code = request.form.get("otp", "").strip()
 
         if not submitted_code:
             flash("Please enter the verification code.", "warning")
-            return render_template("auth/verify_otp.html", show_header=False)
-
-        if not user.otp_code or not user.otp_expires_at:
-            flash("Verification code not found. Please log in again.", "danger")
-            session.pop("pending_2fa_user_id", None)
-            session.pop("pending_2fa_email", None)
-            return redirect(url_for("auth.login"))
-
-        if datetime.utcnow() > user.otp_expires_at:
-            flash("Your verification code has expired. Please log in again.", "danger")
-            user.otp_code = None
-            user.otp_expires_at = None
-            db.session.commit()
-            session.pop("pending_2fa_user_id", None)
-            session.pop("pending_2fa_email", None)
-            _log_attempt(False)
-            return redirect(url_for("auth.login"))
-
-        if not user.otp_is_valid(submitted_code):
-            flash("Invalid verification code.", "danger")
-            _log_attempt(False)
-            return render_template("auth/verify_otp.html", show_header=False)
+            return render_template("auth/verify_otp.html", show_header=False, totp=uses_totp)
+
+        if uses_totp:
+            # Guessing is bounded by the rate limiter
+            if not _claim_totp_step(user, submitted_code):
+                flash("Invalid verification code.", "danger")
+                _log_attempt(False)
+                return render_template("auth/verify_otp.html", show_header=False, totp=True)
+        else:
+            if not user.otp_code or not user.otp_expires_at:
+                flash("Verification code not found. Please log in again.", "danger")
+                session.pop("pending_2fa_user_id", None)
+                session.pop("pending_2fa_email", None)
+                return redirect(url_for("auth.login"))
+
+            if datetime.utcnow() > user.otp_expires_at:
+                flash("Your verification code has expired. Please log in again.", "danger")
+                user.otp_code = None
+                user.otp_expires_at = None
+                db.session.commit()
+                session.pop("pending_2fa_user_id", None)
+                session.pop("pending_2fa_email", None)
+                _log_attempt(False)
+                return redirect(url_for("auth.login"))
+
+            if not user.otp_is_valid(submitted_code):
+                _log_attempt(False)
+                if _count_wrong_otp(user) >= OTP_MAX_ATTEMPTS:
+                    user.otp_code = None
+                    user.otp_expires_at = None
+                    db.session.commit()
+                    session.pop("pending_2fa_user_id", None)
+                    session.pop("pending_2fa_email", None)
+                    flash("Too many invalid codes. Please log in again.", "danger")
+                    return redirect(url_for("auth.login"))
+
+                flash("Invalid verification code.", "danger")
+                return render_template("auth/verify_otp.html", show_header=False)
+
+            if not _consume_otp(user):
+                flash("Verification code not found. Please log in again.", "danger")
+                session.pop("pending_2fa_user_id", None)
+                session.pop("pending_2fa_email", None)
+                _log_attempt(False)
+                return redirect(url_for("auth.login"))
 
-        user.otp_code = None
-        user.otp_expires_at = None
-        db.session.commit()
         session.pop("pending_2fa_user_id", None)
         session.pop("pending_2fa_email", None)
         session["user_id"] = user.id
@@ -169,7 +281,7 @@ def verify_otp():
             return redirect(url_for("analytics.login_attempts"))
         return redirect(url_for("exam.list_exams"))
 
-    return render_template("auth/verify_otp.html", show_header=False)
+    return render_template("auth/verify_otp.html", show_header=False, totp=uses_totp)
 
 
 @auth_bp.route("/logout", methods=["GET"])
@@ -183,13 +295,18 @@ def logout():
 def reset_request():
     if request.method == "POST":
         email = request.form.get("email", "").strip().lower()
+        limited = _too_many_attempts("reset_request", None, "auth/reset_request.html")
+        if limited:
+            return limited
+
         user = User.query.filter_by(email=email).first()
 
-        if user:
-            token_value = secrets.token_urlsafe(32)
-            token_entry = PasswordResetToken.create_for_user(user.id, token_value)
-            db.session.add(token_entry)
+        # Over the account's limit the email is not sent, but the answer is the
+        # same: links already sent keep working, and the address learns nothing
+        if user and not rate_limit_account("reset_request", email):
+            token_value = issue_reset_token(user.id)
             db.session.commit()
+            get_reset_token_sweeper()
 
             token_url = url_for("auth.reset_with_token", token=token_value, _external=True)
             send_password_reset_email(user, token_url)
@@ -202,7 +319,7 @@ def reset_request():
 
 @auth_bp.route("/reset-password/<token>", methods=["GET", "POST"])
 def reset_with_token(token: str):
-    token_entry = PasswordResetToken.query.filter_by(token=token).first()
+    token_entry = PasswordResetToken.find(token)
 
     if not token_entry or token_entry.used or token_entry.is_expired():
         flash("Invalid or expired reset link.", "danger")
@@ -223,8 +340,8 @@ def reset_with_token(token: str):
             )
             return render_template("auth/reset_token.html", token=token)
 
-        token_entry.user.password_hash = generate_password_hash(password)
-        token_entry.used = True
+        token_entry.user.set_password(password)
+        token_entry.mark_used()
         db.session.commit()
 
         flash("Password updated successfully. Please log in.", "success")
@@ -1,12 +1,20 @@
 from datetime import datetime
 
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 
 from .. import db
 from ..models.exam import Exam
+from ..services.answer_key import publish_answer_key
+from ..services.db_routing import replica_reads
+from ..services.exam_catalog import get_exam_counts, keyset_page
+from ..services.page_versions import exam_version
+from ..services.search import exam_search_filter, search_exams
+from ..utils.http_cache import conditional_get
 
 exam_bp = Blueprint("exam", __name__, url_prefix="/exams")
 
+EXAMS_PER_PAGE = 10
+
 
 @exam_bp.route("/create", methods=["GET"])
 def create_exam_form():
@@ -14,39 +22,87 @@ def create_exam_form():
 
 
 @exam_bp.route("", methods=["GET"])
+@replica_reads
 def list_exams():
     search = request.args.get("search", "").strip()
     status = request.args.get("status", "all")
     sort = request.args.get("sort", "newest")
     page = request.args.get("page", 1, type=int)
+    after = request.args.get("after")
+    before = request.args.get("before")
+    # Keyset paging walks (created_at, id) cursors instead of OFFSET
+    use_keyset = request.args.get("paging") == "keyset" or bool(after or before)
 
     query = Exam.query
 
     if search:
-        query = query.filter(Exam.title.ilike(f"%{search}%"))
+        query = query.filter(exam_search_filter(search))
 
     if status == "draft":
         query = query.filter_by(status="draft")
     elif status == "published":
         query = query.filter_by(status="published")
 
-    if sort == "oldest":
-        query = query.order_by(Exam.created_at.asc())
-    else:
-        query = query.order_by(Exam.created_at.desc())
+    counts = get_exam_counts()
 
-    pagination = query.paginate(page=page, per_page=10, error_out=False)
+    pagination = None
+    keyset = None
+    if use_keyset:
+        keyset = keyset_page(
+            query, EXAMS_PER_PAGE, newest_first=sort != "oldest", after=after, before=before
+        )
+        exams = keyset.items
+    else:
+        if sort == "oldest":
+            query = query.order_by(Exam.created_at.asc(), Exam.id.asc())
+        else:
+            query = query.order_by(Exam.created_at.desc(), Exam.id.desc())
+
+        # Without a search the total is already known from the status counts
+        pagination = query.paginate(
+            page=page, per_page=EXAMS_PER_PAGE, error_out=False, count=bool(search)
+        )
+        if not search:
+            pagination.total = (
+                counts.by_status.get(status, 0)
+                if status in ("draft", "published")
+                else counts.total
+            )
+        exams = pagination.items
 
     return render_template(
         "exams/list_exams.html",
-        exams=pagination.items,
+        exams=exams,
         pagination=pagination,
+        keyset=keyset,
         search=search,
         status=status,
         sort=sort,
-        total_exams=Exam.query.count(),
-        total_drafts=Exam.query.filter_by(status="draft").count(),
-        total_published=Exam.query.filter_by(status="published").count(),
+        total_exams=counts.total,
+        total_drafts=counts.drafts,
+        total_published=counts.published,
+    )
+
+
+@exam_bp.route("/search", methods=["GET"])
+@replica_reads
+def search_exams_json():
+    """Return exams matching ``q`` in their text or questions, best match first."""
+    hits = search_exams(request.args.get("q", ""), limit=request.args.get("limit", 20, type=int))
+    exams = {exam.id: exam for exam in Exam.query.filter(Exam.id.in_([h.exam_id for h in hits]))}
+
+    return jsonify(
+        results=[
+            {
+                "id": hit.exam_id,
+                "title": exams[hit.exam_id].title,
+                "status": exams[hit.exam_id].status,
+                "score": hit.score,
+                "url": url_for("exam.view_exam", exam_id=hit.exam_id),
+            }
+            for hit in hits
+            if hit.exam_id in exams
+        ]
     )
 
 
@@ -101,6 +157,7 @@ def edit_exam(exam_id):
 
 
 @exam_bp.route("/<int:exam_id>")
+@conditional_get(exam_version)
 def view_exam(exam_id):
     exam = Exam.query.get_or_404(exam_id)
     return render_template("exams/view_exam.html", exam=exam)
@@ -115,6 +172,7 @@ def publish_exam(exam_id):
     else:
         exam.status = "published"
         db.session.commit()
+        publish_answer_key(exam)
         flash("Exam published successfully! Students can now see it.", "success")
 
     return redirect(url_for("exam.view_exam", exam_id=exam.id))
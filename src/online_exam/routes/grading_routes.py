@@ -6,6 +6,14 @@ from .. import db
 from ..models.exam import Exam
 from ..models.question import Question
 from ..models.submission import Answer, Submission
+from ..services.answer_key import get_answer_key
+from ..services.db_routing import replica_reads
+from ..services.exam_stats import record_score_change, record_submission
+from ..services.grade_publishing import publish_exam_grades, wake_grade_notifier
+from ..services.page_versions import submission_version
+from ..services.regrade import regrade_exam
+from ..services.submission_ingest import grade_form, ingest_submission
+from ..utils.http_cache import conditional_get
 
 grading_bp = Blueprint("grading", __name__, url_prefix="/exams")
 
@@ -14,69 +22,31 @@ grading_bp = Blueprint("grading", __name__, url_prefix="/exams")
 def submit_exam(exam_id):
     """Submit exam answers (for testing/demo purposes)."""
     exam = Exam.query.get_or_404(exam_id)
-    questions = Question.query.filter_by(exam_id=exam_id).order_by(Question.order_num).all()
 
     if request.method == "POST":
         student_name = request.form.get("student_name", "Test Student")
 
-        # Create submission
-        submission = Submission(exam_id=exam_id, student_name=student_name, status="pending")
-        db.session.add(submission)
-        db.session.flush()  # Get submission ID
-
-        total_score = 0
-        max_score = 0
-
-        # Process answers
-        for question in questions:
-            max_score += question.points
-
-            if question.is_mcq():
-                selected_option = request.form.get(f"question_{question.id}")
-                if selected_option:
-                    selected_option = selected_option.upper()
-                    is_correct = selected_option == question.correct_answer
-                    points_earned = question.points if is_correct else 0
-                    total_score += points_earned
-
-                    answer = Answer(
-                        submission_id=submission.id,
-                        question_id=question.id,
-                        selected_option=selected_option,
-                        is_correct=is_correct,
-                        points_earned=points_earned,
-                    )
-                    db.session.add(answer)
-            else:
-                answer_text = request.form.get(f"question_{question.id}", "")
-                answer = Answer(
-                    submission_id=submission.id,
-                    question_id=question.id,
-                    answer_text=answer_text,
-                    is_correct=False,
-                    points_earned=0,
-                )
-                db.session.add(answer)
-
-        # Update submission
-        submission.total_score = total_score
-        submission.max_score = max_score
-        submission.calculate_percentage()
-        submission.status = "graded"
-        submission.graded_at = datetime.utcnow()
+        graded = grade_form(get_answer_key(exam), request.form)
+        submission_id = ingest_submission(
+            exam_id, student_name, graded, status="graded", graded_at=datetime.utcnow()
+        )
+        record_submission(exam_id, graded.total_score, graded.percentage)
 
         db.session.commit()
 
         flash(
-            f"Exam submitted successfully! Score: {total_score}/{max_score} ({submission.percentage}%)",
+            f"Exam submitted successfully! Score: {graded.total_score}/{graded.max_score} "
+            f"({graded.percentage}%)",
             "success",
         )
-        return redirect(url_for("grading.view_results", submission_id=submission.id))
+        return redirect(url_for("grading.view_results", submission_id=submission_id))
 
+    questions = Question.query.filter_by(exam_id=exam_id).order_by(Question.order_num).all()
     return render_template("grading/submit_exam.html", exam=exam, questions=questions)
 
 
 @grading_bp.route("/submissions/<int:submission_id>")
+@conditional_get(submission_version)
 def view_results(submission_id):
     """View submission results."""
     submission = Submission.query.get_or_404(submission_id)
@@ -96,6 +66,7 @@ def view_results(submission_id):
 
 
 @grading_bp.route("/<int:exam_id>/submissions")
+@replica_reads
 def list_submissions(exam_id):
     """List all submissions for an exam."""
     exam = Exam.query.get_or_404(exam_id)
@@ -106,6 +77,22 @@ def list_submissions(exam_id):
     return render_template("grading/list_submissions.html", exam=exam, submissions=submissions)
 
 
+@grading_bp.route("/<int:exam_id>/regrade", methods=["POST"])
+def regrade(exam_id: int):
+    """Re-score every submission of an exam against its current answer key."""
+    exam = Exam.query.get_or_404(exam_id)
+
+    result = regrade_exam(exam)
+    db.session.commit()
+
+    flash(
+        f"Re-graded {result.submissions} submissions "
+        f"({result.submissions_changed} scores changed).",
+        "success",
+    )
+    return redirect(url_for("grading.list_submissions", exam_id=exam.id))
+
+
 @grading_bp.route("/submissions/<int:submission_id>/grade", methods=["GET", "POST"])
 def manual_grade(submission_id):
     """Manually grade written questions and update submission status."""
@@ -121,6 +108,8 @@ def manual_grade(submission_id):
     )
 
     if request.method == "POST":
+        old_score = submission.total_score or 0
+        old_percentage = submission.percentage or 0.0
         total_score = 0
         max_score = 0
 
@@ -156,6 +145,9 @@ def manual_grade(submission_id):
         submission.status = "graded"
         submission.graded_at = datetime.utcnow()
 
+        record_score_change(
+            submission.exam_id, old_score, old_percentage, total_score, submission.percentage
+        )
         db.session.commit()
 
         flash(
@@ -174,16 +166,14 @@ def publish_grades(exam_id: int):
     """Publish grades for all graded submissions of an exam."""
     exam = Exam.query.get_or_404(exam_id)
 
-    graded_submissions = Submission.query.filter_by(exam_id=exam.id, status="graded").all()
-
-    if not graded_submissions:
+    published = publish_exam_grades(exam.id)
+    if not published:
         flash("No graded submissions to publish.", "warning")
         return redirect(url_for("exam.view_exam", exam_id=exam.id))
 
-    for submission in graded_submissions:
-        submission.status = "published"
-
     db.session.commit()
-    flash("Grades published successfully", "success")
+    # Students are notified in the background once the commit is visible
+    wake_grade_notifier()
+    flash(f"Grades published successfully for {published} submission(s).", "success")
 
     return redirect(url_for("exam.view_exam", exam_id=exam.id))
@@ -1,8 +1,9 @@
-from flask import Blueprint, flash, redirect, render_template, session, url_for
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
 
 from .. import db
 from ..models.user import User
-from ..utils.auth import login_required
+from ..utils.auth import get_current_user, login_required
+from ..utils.otp_utils import generate_totp_secret, totp_step, totp_uri
 
 profile_bp = Blueprint("profile", __name__)
 
@@ -15,7 +16,7 @@ def _current_user():
 @profile_bp.route("/profile", methods=["GET"])
 @login_required
 def profile():
-    user = _current_user()
+    user = get_current_user()
     if not user:
         session.clear()
         return redirect(url_for("auth.login"))
@@ -52,6 +53,40 @@ def disable_two_factor():
     user.two_factor_enabled = False
     user.otp_code = None
     user.otp_expires_at = None
+    user.totp_secret = None
+    user.totp_last_step = None
     db.session.commit()
     flash("Two-factor authentication disabled.", "info")
     return redirect(url_for("profile.profile"))
+
+
+@profile_bp.route("/profile/2fa/totp", methods=["GET", "POST"])
+@login_required
+def setup_totp():
+    """Enroll an authenticator app, once it has produced a valid code."""
+    user = _current_user()
+    if not user:
+        session.clear()
+        return redirect(url_for("auth.login"))
+
+    secret = session.get("totp_setup_secret")
+    if request.method == "POST" and secret:
+        step = totp_step(secret, request.form.get("otp", "").strip())
+        if step is not None:
+            user.two_factor_enabled = True
+            user.totp_secret = secret
+            # The code used to enroll cannot also complete a login
+            user.totp_last_step = step
+            user.otp_code = None
+            user.otp_expires_at = None
+            db.session.commit()
+            session.pop("totp_setup_secret", None)
+            flash("Authenticator app enabled. Use its code on your next login.", "success")
+            return redirect(url_for("profile.profile"))
+
+        flash("Invalid code. Check your device's clock and try again.", "danger")
+    else:
+        secret = generate_totp_secret()
+        session["totp_setup_secret"] = secret
+
+    return render_template("profile_totp.html", secret=secret, uri=totp_uri(secret, user.email))
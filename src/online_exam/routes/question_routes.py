@@ -3,11 +3,14 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for
 from .. import db
 from ..models.exam import Exam
 from ..models.question import Question
+from ..services.page_versions import question_list_version
+from ..utils.http_cache import conditional_get
 
 question_bp = Blueprint("question", __name__, url_prefix="/exams")
 
 
 @question_bp.route("/<int:exam_id>/questions")
+@conditional_get(question_list_version)
 def list_questions(exam_id):
     """List all questions for an exam."""
     exam = Exam.query.get_or_404(exam_id)
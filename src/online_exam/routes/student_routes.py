@@ -1,9 +1,7 @@
-from datetime import datetime
-
 from flask import (
     Blueprint,
     flash,
-    make_response,
+    jsonify,
     redirect,
     render_template,
     request,
@@ -15,6 +13,15 @@ from .. import db
 from ..models.exam import Exam
 from ..models.question import Question
 from ..models.submission import Answer, Submission
+from ..services.answer_key import get_answer_key
+from ..services.csv_export import SUBMISSION_HEADER, csv_response, iter_submission_breakdown
+from ..services.exam_drafts import discard_draft, load_draft, parse_delta, save_draft
+from ..services.exam_render import get_rendered_exam
+from ..services.page_versions import published_exam_version, submission_version
+from ..services.submission_ingest import store_submission
+from ..services.submission_queue import SubmissionRejected, get_submission_queue, validate_form
+from ..utils.auth import get_current_user
+from ..utils.http_cache import conditional_get
 
 student_bp = Blueprint("student", __name__, url_prefix="/student")
 
@@ -33,10 +40,7 @@ def dashboard():
         flash("Please log in to access student dashboard.", "warning")
         return redirect(url_for("auth.login"))
 
-    # Get student's email from session
-    from ..models.user import User
-
-    user = User.query.get(user_id)
+    user = get_current_user()
 
     # Get all published exams
     available_exams = (
@@ -75,6 +79,7 @@ def dashboard():
 
 
 @student_bp.route("/exams/<int:exam_id>/take", methods=["GET"])
+@conditional_get(published_exam_version)
 def take_exam(exam_id):
     """Display exam for student to take."""
     exam = Exam.query.get_or_404(exam_id)
@@ -83,22 +88,21 @@ def take_exam(exam_id):
         flash("This exam is not available yet.", "warning")
         return redirect(url_for("student.dashboard"))
 
-    questions = Question.query.filter_by(exam_id=exam_id).order_by(Question.order_num).all()
-    total_points = sum(q.points for q in questions)
-
+    # The question cards are rendered once per exam version
+    rendered = get_rendered_exam(exam)
     return render_template(
         "student/take_exam.html",
         exam=exam,
-        questions=questions,
-        total_questions=len(questions),
-        total_points=total_points,
+        questions_html=rendered.questions_html,
+        total_questions=rendered.total_questions,
+        total_points=rendered.total_points,
     )
 
 
 @student_bp.route("/exams/<int:exam_id>/submit", methods=["POST"])
 def submit_exam(exam_id):
     """Process student exam submission with smart status logic."""
-    questions = Question.query.filter_by(exam_id=exam_id).order_by(Question.order_num).all()
+    exam = Exam.query.get_or_404(exam_id)
 
     # Get student name
     student_name = request.form.get("student_name", "").strip()
@@ -106,81 +110,157 @@ def submit_exam(exam_id):
         flash("Student name is required.", "danger")
         return redirect(url_for("student.take_exam", exam_id=exam_id))
 
-    # Create submission
-    submission = Submission(exam_id=exam_id, student_name=student_name, status="pending")
-    db.session.add(submission)
-    db.session.flush()  # Get submission ID
-
-    total_score = 0
-    max_score = 0
-    has_written_questions = False
-
-    # Process each question
-    for question in questions:
-        max_score += question.points
-
-        if question.is_mcq():
-            # Process MCQ answer (auto-graded)
-            selected_option = request.form.get(f"question_{question.id}", "").strip().upper()
-
-            if selected_option:
-                is_correct = selected_option == question.correct_answer
-                points_earned = question.points if is_correct else 0
-                total_score += points_earned
-
-                answer = Answer(
-                    submission_id=submission.id,
-                    question_id=question.id,
-                    selected_option=selected_option,
-                    is_correct=is_correct,
-                    points_earned=points_earned,
-                )
-                db.session.add(answer)
-        else:
-            # Process written answer (needs manual grading)
-            has_written_questions = True
-            answer_text = request.form.get(f"question_{question.id}", "").strip()
-
-            answer = Answer(
-                submission_id=submission.id,
-                question_id=question.id,
-                answer_text=answer_text,
-                is_correct=False,
-                points_earned=0,  # Needs manual grading
-            )
-            db.session.add(answer)
-
-    # Update submission with final scores
-    submission.total_score = total_score
-    submission.max_score = max_score
-    submission.calculate_percentage()
-
     # SMART STATUS LOGIC
     # If exam has written questions → status = "pending" (needs instructor grading)
     # If exam has only MCQ questions → status = "graded" (auto-graded, no manual work needed)
-    if has_written_questions:
-        submission.status = "pending"
-        submission.graded_at = None
-        flash_message = (
+    user_id = session["user_id"]
+    submission_id, graded = store_submission(
+        get_answer_key(exam), student_name, request.form, student_id=user_id
+    )
+    discard_draft(user_id, exam_id)
+    db.session.commit()
+
+    flash(_submitted_message(graded), "success")
+    return redirect(url_for("student.view_results", submission_id=submission_id))
+
+
+def _submitted_message(graded):
+    if graded.has_written_questions:
+        return (
             f"✅ Exam submitted successfully! "
-            f"Your MCQ score: {total_score}/{max_score}. "
+            f"Your MCQ score: {graded.total_score}/{graded.max_score}. "
             f"Written questions are pending instructor grading."
         )
-    else:
-        submission.status = "graded"
-        submission.graded_at = datetime.utcnow()
-        flash_message = (
-            f"✅ Exam submitted successfully! "
-            f"Your final score: {total_score}/{max_score} ({submission.percentage}%)"
-        )
+    return (
+        f"✅ Exam submitted successfully! "
+        f"Your final score: {graded.total_score}/{graded.max_score} ({graded.percentage}%)"
+    )
+
+
+def _published_exam_or_none(exam_id):
+    exam = db.session.get(Exam, exam_id)
+    if exam is None or exam.status != "published":
+        return None
+    return exam
+
+
+# ============================================================================
+# AUTOSAVE
+# ============================================================================
+
+
+@student_bp.route("/exams/<int:exam_id>/draft", methods=["GET"])
+def get_draft(exam_id):
+    """Return the student's autosaved answers so the exam page can restore them."""
+    if _published_exam_or_none(exam_id) is None:
+        return jsonify(error="Exam not found."), 404
+
+    draft = load_draft(session["user_id"], exam_id)
+    if draft is None:
+        return jsonify(error="No saved draft."), 404
+    return jsonify(draft.to_dict())
+
+
+@student_bp.route("/exams/<int:exam_id>/draft", methods=["POST"])
+def save_draft_delta(exam_id):
+    """Store the answers and flags changed since the last autosave."""
+    exam = _published_exam_or_none(exam_id)
+    if exam is None:
+        return jsonify(error="Exam not found."), 404
+
+    try:
+        delta = parse_delta(get_answer_key(exam), request.get_json(silent=True))
+    except SubmissionRejected as error:
+        return jsonify(error=str(error)), 400
 
+    saved = save_draft(session["user_id"], exam_id, delta) if delta else 0
     db.session.commit()
+    return jsonify(saved=saved)
+
+
+@student_bp.route("/exams/<int:exam_id>/draft/submit", methods=["POST"])
+def submit_draft(exam_id):
+    """Submit the autosaved attempt, after applying any last unsaved changes."""
+    exam = _published_exam_or_none(exam_id)
+    if exam is None:
+        return jsonify(error="Exam not found."), 404
+
+    key = get_answer_key(exam)
+    user_id = session["user_id"]
+    try:
+        delta = parse_delta(key, request.get_json(silent=True) or {})
+    except SubmissionRejected as error:
+        return jsonify(error=str(error)), 400
+    if delta:
+        save_draft(user_id, exam_id, delta)
+
+    draft = load_draft(user_id, exam_id)
+    if draft is None:
+        return jsonify(error="No saved draft."), 404
+    if not draft.student_name:
+        db.session.commit()
+        return jsonify(error="Student name is required."), 400
+
+    submission_id, graded = store_submission(
+        key, draft.student_name, draft.form(), student_id=user_id
+    )
+    discard_draft(user_id, exam_id)
+    db.session.commit()
+
+    flash(_submitted_message(graded), "success")
+    return jsonify(
+        submission_id=submission_id,
+        results_url=url_for("student.view_results", submission_id=submission_id),
+    )
 
-    flash(flash_message, "success")
-    return redirect(url_for("student.view_results", submission_id=submission.id))
+
+@student_bp.route("/exams/<int:exam_id>/submit/queued", methods=["POST"])
+def submit_exam_queued(exam_id):
+    """Accept a submission for background grading and answer 202 at once."""
+    exam = _published_exam_or_none(exam_id)
+    if exam is None:
+        return jsonify(error="Exam not found."), 404
+
+    student_name = request.form.get("student_name", "").strip()
+    if not student_name:
+        return jsonify(error="Student name is required."), 400
+
+    try:
+        validate_form(get_answer_key(exam), request.form)
+    except SubmissionRejected as error:
+        return jsonify(error=str(error)), 400
+
+    user_id = session["user_id"]
+    ticket = get_submission_queue().enqueue(
+        exam_id, student_name, request.form.to_dict(), student_id=user_id
+    )
+    # The queued form is durable now, so the autosaved draft is no longer needed
+    discard_draft(user_id, exam_id)
+    db.session.commit()
+    status_url = url_for("student.queued_submission_status", ticket=ticket)
+    return (
+        jsonify(ticket=ticket, status="queued", status_url=status_url),
+        202,
+        {"Location": status_url},
+    )
+
+
+@student_bp.route("/submissions/queued/<ticket>", methods=["GET"])
+def queued_submission_status(ticket):
+    """Report whether a queued submission has been stored yet."""
+    queued = get_submission_queue().status(ticket)
+    if queued is None:
+        return jsonify(error="Unknown ticket."), 404
+
+    body = {"ticket": queued.ticket, "status": queued.status}
+    if queued.submission_id is not None:
+        body["submission_id"] = queued.submission_id
+        body["results_url"] = url_for("student.view_results", submission_id=queued.submission_id)
+    return jsonify(body)
 
 
 @student_bp.route("/submissions/<int:submission_id>/results", methods=["GET"])
+@conditional_get(submission_version)
 def view_results(submission_id):
     """Display exam results for student."""
     submission = Submission.query.get_or_404(submission_id)
@@ -216,48 +296,8 @@ def download_results(submission_id):
         )
         return redirect(url_for("student.dashboard"))
 
-    # Get answers
-    answers = (
-        db.session.query(Answer, Question)
-        .join(Question, Answer.question_id == Question.id)
-        .filter(Answer.submission_id == submission_id)
-        .order_by(Question.order_num)
-        .all()
+    return csv_response(
+        f"grades_{submission.id}.csv",
+        SUBMISSION_HEADER,
+        iter_submission_breakdown(submission.id),
     )
-
-    # CSV data
-    csv_data = [
-        [
-            "Question No",
-            "Type",
-            "Question",
-            "Your Answer",
-            "Correct Answer",
-            "Points",
-            "Instructor Comments",
-        ]
-    ]
-
-    for answer, question in answers:
-        qtype = "MCQ" if question.is_mcq() else "Written"
-        your_answer = answer.selected_option if question.is_mcq() else (answer.answer_text or "")
-        correct_answer = question.correct_answer if question.is_mcq() else ""
-        points = answer.points_earned
-        comment = answer.instructor_comment or ""
-        csv_data.append(
-            [
-                question.order_num,
-                qtype,
-                question.question_text,
-                your_answer,
-                correct_answer,
-                points,
-                comment,
-            ]
-        )
-
-    # Create response
-    output = make_response("\n".join([",".join(map(str, row)) for row in csv_data]))
-    output.headers["Content-Disposition"] = f"attachment; filename=grades_{submission.id}.csv"
-    output.headers["Content-Type"] = "text/csv"
-    return output
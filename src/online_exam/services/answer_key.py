@@ -0,0 +1,100 @@
+"""Compiled, cached answer keys for MCQ auto-grading.
+
+An ``AnswerKey`` is an immutable snapshot of an exam's questions: ids, types,
+points and correct options held in parallel tuples. Keys of published exams are
+kept in a process-level cache keyed by exam id and ``Exam.updated_at``, so a
+submit against a published exam grades without querying ``Question`` at all.
+"""
+
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from ..models.question import Question
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """Immutable grading view of one exam, in question order."""
+
+    exam_id: int
+    version: datetime | None
+    question_ids: tuple[int, ...]
+    question_types: tuple[str, ...]
+    points: tuple[int, ...]
+    correct_options: tuple[str | None, ...]
+
+    @classmethod
+    def from_questions(
+        cls, exam_id: int, version: datetime | None, questions: Iterable[Any]
+    ) -> "AnswerKey":
+        rows = [
+            (q.id, q.question_type, q.points, q.correct_answer if q.is_mcq() else None)
+            for q in questions
+        ]
+        ids, types, points, correct = (tuple(col) for col in zip(*rows)) if rows else ((),) * 4
+        return cls(exam_id, version, ids, types, points, correct)
+
+    @property
+    def max_score(self) -> int:
+        return sum(self.points)
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    def __iter__(self) -> Iterator[tuple[int, str, int, str | None]]:
+        """Yield ``(question_id, question_type, points, correct_option)`` per question."""
+        return zip(self.question_ids, self.question_types, self.points, self.correct_options)
+
+
+_cache: dict[int, AnswerKey] = {}
+_lock = threading.Lock()
+
+
+def compile_answer_key(exam: Any) -> AnswerKey:
+    """Build a fresh key for ``exam`` from its questions (one query)."""
+    questions = Question.query.filter_by(exam_id=exam.id).order_by(Question.order_num).all()
+    return AnswerKey.from_questions(exam.id, exam.updated_at, questions)
+
+
+def cached_answer_key(exam_id: int, version: datetime | None) -> AnswerKey | None:
+    """Return the cached key for this exam version, if there is one."""
+    key = _cache.get(exam_id)
+    if key is not None and key.version == version:
+        return key
+    return None
+
+
+def publish_answer_key(exam: Any) -> AnswerKey:
+    """Compile and cache the key of a (just) published exam."""
+    key = compile_answer_key(exam)
+    with _lock:
+        _cache[exam.id] = key
+    return key
+
+
+def get_answer_key(exam: Any) -> AnswerKey:
+    """Return the answer key to grade ``exam`` with.
+
+    Published exams are served from the cache (compiled once per process on a
+    miss). Drafts can still change, so they are always compiled fresh.
+    """
+    if exam.status != "published":
+        return compile_answer_key(exam)
+
+    key = cached_answer_key(exam.id, exam.updated_at)
+    if key is None:
+        key = publish_answer_key(exam)
+    return key
+
+
+def invalidate_answer_key(exam_id: int) -> None:
+    with _lock:
+        _cache.pop(exam_id, None)
+
+
+def clear_answer_keys() -> None:
+    with _lock:
+        _cache.clear()
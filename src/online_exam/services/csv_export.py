@@ -0,0 +1,155 @@
+"""Streaming CSV exports.
+
+Rows are read with ``yield_per`` (a server-side cursor where the driver supports
+it), escaped by ``csv.writer`` and sent as a streamed Flask response one line at
+a time, so neither the rows nor the rendered file are ever held in memory.
+"""
+
+import csv
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from flask import Response, stream_with_context
+from sqlalchemy import select
+
+from .. import db
+from ..models.question import Question
+from ..models.submission import Answer, Submission
+
+ROW_BATCH = 1000
+
+SUBMISSION_HEADER = [
+    "Question No",
+    "Type",
+    "Question",
+    "Your Answer",
+    "Correct Answer",
+    "Points",
+    "Instructor Comments",
+]
+
+EXAM_HEADER = [
+    "Submission ID",
+    "Student Name",
+    "Status",
+    "Total Score",
+    "Max Score",
+    "Percentage",
+    "Submitted",
+    "Question No",
+    "Type",
+    "Question",
+    "Answer",
+    "Correct Answer",
+    "Points",
+    "Instructor Comments",
+]
+
+
+class _Echo:
+    """File-like object whose ``write`` hands back the formatted line."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(header: list[str], rows: Iterable[Iterable[Any]]) -> Iterator[str]:
+    """Yield a properly quoted CSV document line by line."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def csv_response(filename: str, header: list[str], rows: Iterable[Iterable[Any]]) -> Response:
+    """Stream ``rows`` as a CSV attachment; rows are produced lazily in the request context."""
+    response = Response(stream_with_context(iter_csv(header, rows)), mimetype="text/csv")
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return response
+
+
+def _answer_columns(question_type, selected_option, answer_text, correct_answer):
+    if question_type == "mcq":
+        return "MCQ", selected_option, correct_answer
+    return "Written", answer_text or "", ""
+
+
+def iter_submission_breakdown(submission_id: int) -> Iterator[list[Any]]:
+    """Yield the per-question grade breakdown of one submission."""
+    result = db.session.execute(
+        select(
+            Question.order_num,
+            Question.question_type,
+            Question.question_text,
+            Question.correct_answer,
+            Answer.selected_option,
+            Answer.answer_text,
+            Answer.points_earned,
+            Answer.instructor_comment,
+        )
+        .join(Question, Answer.question_id == Question.id)
+        .where(Answer.submission_id == submission_id)
+        .order_by(Question.order_num)
+        .execution_options(yield_per=ROW_BATCH)
+    )
+    for row in result:
+        qtype, your_answer, correct_answer = _answer_columns(
+            row.question_type, row.selected_option, row.answer_text, row.correct_answer
+        )
+        yield [
+            row.order_num,
+            qtype,
+            row.question_text,
+            your_answer,
+            correct_answer,
+            row.points_earned,
+            row.instructor_comment or "",
+        ]
+
+
+def iter_exam_answers(exam_id: int) -> Iterator[list[Any]]:
+    """Yield one line per answer of every submission of an exam."""
+    result = db.session.execute(
+        select(
+            Submission.id,
+            Submission.student_name,
+            Submission.status,
+            Submission.total_score,
+            Submission.max_score,
+            Submission.percentage,
+            Submission.submitted_at,
+            Question.order_num,
+            Question.question_type,
+            Question.question_text,
+            Question.correct_answer,
+            Answer.selected_option,
+            Answer.answer_text,
+            Answer.points_earned,
+            Answer.instructor_comment,
+        )
+        .join(Answer, Answer.submission_id == Submission.id)
+        .join(Question, Answer.question_id == Question.id)
+        .where(Submission.exam_id == exam_id)
+        .order_by(Submission.id, Question.order_num)
+        .execution_options(yield_per=ROW_BATCH)
+    )
+    for row in result:
+        qtype, answer, correct_answer = _answer_columns(
+            row.question_type, row.selected_option, row.answer_text, row.correct_answer
+        )
+        yield [
+            row.id,
+            row.student_name,
+            row.status,
+            row.total_score,
+            row.max_score,
+            row.percentage,
+            row.submitted_at.strftime("%Y-%m-%d %H:%M:%S") if row.submitted_at else "",
+            row.order_num,
+            qtype,
+            row.question_text,
+            answer,
+            correct_answer,
+            row.points_earned,
+            row.instructor_comment or "",
+        ]
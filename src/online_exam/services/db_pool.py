@@ -0,0 +1,111 @@
+"""Connection pool configuration and metrics.
+
+``build_engine_options`` turns the ``DB_POOL_*`` / ``DB_*_TIMEOUT`` settings into
+``SQLALCHEMY_ENGINE_OPTIONS``: a sized ``QueuePool`` with pre-ping and recycling,
+so stale MySQL connections are replaced instead of failing with "server has gone
+away". The pool records how long requests wait for a connection, which
+``pool_metrics`` reports together with the pool's current occupancy.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` that keeps checkout wait-time and timeout counters."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_checked_out = 0
+
+    def connect(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        checked_out = self.checkedout()
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+        return connection
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+                "peak_checked_out": self.peak_checked_out,
+            }
+
+
+def _is_memory_sqlite(uri: str) -> bool:
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def build_engine_options(config: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the pool/driver engine options for ``config``'s database URI.
+
+    In-memory SQLite keeps Flask-SQLAlchemy's single shared connection, as a
+    pool of separate connections would each see an empty database.
+    """
+    uri = config["SQLALCHEMY_DATABASE_URI"]
+    if _is_memory_sqlite(uri):
+        return {}
+
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+    if make_url(uri).get_backend_name() == "mysql":
+        options["connect_args"] = {
+            "connect_timeout": config["DB_CONNECT_TIMEOUT"],
+            "read_timeout": config["DB_READ_TIMEOUT"],
+            "write_timeout": config["DB_WRITE_TIMEOUT"],
+        }
+    return options
+
+
+def pool_metrics(engine: Engine) -> dict[str, Any]:
+    """Describe the connection pool of ``engine`` in this worker process."""
+    pool = engine.pool
+    metrics: dict[str, Any] = {
+        "pid": os.getpid(),
+        "pool": type(pool).__name__,
+        "status": pool.status(),
+    }
+    if isinstance(pool, QueuePool):
+        metrics.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        metrics.update(pool.stats())
+    return metrics
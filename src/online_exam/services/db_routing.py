@@ -0,0 +1,120 @@
+"""Routing of read-only requests to database replicas.
+
+Views decorated with ``replica_reads`` run their SELECTs against an engine for
+one of the ``SQLALCHEMY_REPLICA_URIS``, picked round-robin; everything
+else, and every flush or DML statement, goes to the primary. After a browser
+session commits a write, its reads stay on the primary for
+``REPLICA_READ_YOUR_WRITES_SECONDS`` so users always see their own changes
+despite replication lag. Without configured replicas nothing changes.
+"""
+
+import itertools
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any
+
+import sqlalchemy as sa
+from flask import Flask, current_app, g, has_request_context, session
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .db_pool import build_engine_options
+
+DEFAULT_READ_YOUR_WRITES_SECONDS = 5
+
+_EXTENSION_KEY = "db_replicas"
+_WROTE_KEY = "wrote_to_primary"
+_PRIMARY_UNTIL_KEY = "_db_primary_until"
+
+_round_robin = itertools.count()
+
+
+def configure_replicas(app: Flask) -> None:
+    """Create one engine, pooled like the primary, per ``SQLALCHEMY_REPLICA_URIS`` entry.
+
+    Replicas are not Flask-SQLAlchemy binds: they hold the same tables as the
+    primary rather than a separate set of models.
+    """
+    app.extensions[_EXTENSION_KEY] = [
+        sa.create_engine(
+            uri, **build_engine_options({**app.config, "SQLALCHEMY_DATABASE_URI": uri})
+        )
+        for uri in app.config.get("SQLALCHEMY_REPLICA_URIS") or []
+    ]
+
+
+def replica_engines(app: Flask | None = None) -> list[Engine]:
+    return (app or current_app).extensions.get(_EXTENSION_KEY, [])
+
+
+def replica_reads(view_func: Callable) -> Callable:
+    """Mark a read-only view whose queries may be served by a replica."""
+
+    @wraps(view_func)
+    def wrapped_view(*args, **kwargs):
+        g._replica_reads = True
+        return view_func(*args, **kwargs)
+
+    return wrapped_view
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Send every query in the block to the primary, e.g. before writing."""
+    previous = g.get("_force_primary", False)
+    g._force_primary = True
+    try:
+        yield
+    finally:
+        g._force_primary = previous
+
+
+def _replica_allowed(db_session: "RoutingSession", clause: Any) -> bool:
+    if db_session._flushing or isinstance(clause, sa.UpdateBase):
+        return False
+    if not has_request_context() or not g.get("_replica_reads"):
+        return False
+    if g.get("_force_primary") or db_session.info.get(_WROTE_KEY):
+        return False
+    return session.get(_PRIMARY_UNTIL_KEY, 0) <= time.time()
+
+
+class RoutingSession(FlaskSession):
+    """``db.session`` class that serves replica-eligible reads from a replica engine."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _replica_allowed(self, clause):
+            replicas = replica_engines()
+            if replicas:
+                return replicas[next(_round_robin) % len(replicas)]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush_write(db_session, flush_context) -> None:
+    db_session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_to_primary_after_write(db_session) -> None:
+    if not db_session.info.pop(_WROTE_KEY, False) or not has_request_context():
+        return
+    window = current_app.config.get(
+        "REPLICA_READ_YOUR_WRITES_SECONDS", DEFAULT_READ_YOUR_WRITES_SECONDS
+    )
+    if window > 0 and replica_engines():
+        session[_PRIMARY_UNTIL_KEY] = time.time() + window
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _forget_rolled_back_write(db_session, previous_transaction) -> None:
+    db_session.info.pop(_WROTE_KEY, None)
@@ -0,0 +1,184 @@
+"""Exam listing: cached status totals and keyset pagination.
+
+The dashboard totals come from one ``GROUP BY status`` query whose result is
+kept per process for ``EXAM_COUNTS_TTL_SECONDS`` and dropped whenever an exam
+is created, deleted or changes status. Listing pages can be fetched by keyset
+on ``(created_at, id)`` instead of OFFSET, so a deep page costs the same as the
+first one.
+"""
+
+import base64
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from flask import current_app
+from sqlalchemy import and_, event, func, inspect, or_, select
+from sqlalchemy.orm import Session, object_session
+
+from .. import db
+from ..models.exam import Exam
+
+DEFAULT_TTL_SECONDS = 30
+
+_PENDING_KEY = "exam_counts_evict"
+
+
+@dataclass(frozen=True)
+class ExamCounts:
+    by_status: Mapping[str, int]
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_status.values())
+
+    @property
+    def drafts(self) -> int:
+        return self.by_status.get("draft", 0)
+
+    @property
+    def published(self) -> int:
+        return self.by_status.get("published", 0)
+
+
+_cached: tuple[float, ExamCounts] | None = None
+_lock = threading.Lock()
+
+
+def count_exams_by_status() -> ExamCounts:
+    """Count exams per status in a single grouped query."""
+    rows = db.session.execute(select(Exam.status, func.count()).group_by(Exam.status))
+    return ExamCounts(by_status=dict(rows.tuples().all()))
+
+
+def get_exam_counts() -> ExamCounts:
+    """Return the per-status totals, re-counting only after expiry or a change."""
+    global _cached
+
+    now = time.monotonic()
+    cached = _cached
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    counts = count_exams_by_status()
+    ttl = current_app.config.get("EXAM_COUNTS_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+    if ttl > 0:
+        with _lock:
+            _cached = (now + ttl, counts)
+    return counts
+
+
+def invalidate_exam_counts() -> None:
+    global _cached
+
+    with _lock:
+        _cached = None
+
+
+def _schedule_invalidation(target: Exam) -> None:
+    invalidate_exam_counts()
+
+    # Evict again on commit, so a request that counted meanwhile is not kept
+    session = object_session(target)
+    if session is not None:
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Exam, "after_insert")
+@event.listens_for(Exam, "after_delete")
+def _exam_added_or_removed(mapper, connection, target: Exam) -> None:
+    _schedule_invalidation(target)
+
+
+@event.listens_for(Exam, "after_update")
+def _exam_status_changed(mapper, connection, target: Exam) -> None:
+    if inspect(target).attrs.status.history.has_changes():
+        _schedule_invalidation(target)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _evict_after_commit(session: Session, *args) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        invalidate_exam_counts()
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    items: list[Any]
+    next_cursor: str | None
+    prev_cursor: str | None
+
+
+def encode_cursor(exam: Exam) -> str:
+    raw = f"{exam.created_at.isoformat()}|{exam.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int] | None:
+    """Return ``(created_at, id)`` from a cursor, or ``None`` if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, exam_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(exam_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_page(
+    query: Any,
+    per_page: int,
+    newest_first: bool = True,
+    after: str | None = None,
+    before: str | None = None,
+) -> KeysetPage:
+    """Return the page of ``query`` following ``after`` (or preceding ``before``).
+
+    Rows are ordered by ``(created_at, id)``; one extra row is fetched to tell
+    whether another page exists in the direction of travel.
+    """
+    position = decode_cursor(before) if before else decode_cursor(after) if after else None
+    backwards = bool(before) and position is not None
+    # Walking backwards through a newest-first list reads oldest-first, and vice versa
+    descending = newest_first != backwards
+
+    if position is not None:
+        created_at, exam_id = position
+        if descending:
+            query = query.filter(
+                or_(
+                    Exam.created_at < created_at,
+                    and_(Exam.created_at == created_at, Exam.id < exam_id),
+                )
+            )
+        else:
+            query = query.filter(
+                or_(
+                    Exam.created_at > created_at,
+                    and_(Exam.created_at == created_at, Exam.id > exam_id),
+                )
+            )
+
+    if descending:
+        query = query.order_by(Exam.created_at.desc(), Exam.id.desc())
+    else:
+        query = query.order_by(Exam.created_at.asc(), Exam.id.asc())
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+
+    if backwards:
+        items.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, position is not None
+
+    return KeysetPage(
+        items=items,
+        next_cursor=encode_cursor(items[-1]) if items and has_next else None,
+        prev_cursor=encode_cursor(items[0]) if items and has_prev else None,
+    )
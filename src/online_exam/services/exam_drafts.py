@@ -0,0 +1,239 @@
+"""Server-side autosave of in-progress exam attempts.
+
+The take-exam page sends small deltas (only the questions changed since the
+last save) every few seconds. A delta is validated against the cached answer
+key and written with one multi-row upsert into ``draft_answers``, keyed by
+(student, exam, question), so unchanged questions are never rewritten. Columns a
+delta does not carry are sent as NULL and kept through ``COALESCE``, which
+lets answers and review flags travel independently in the same statement.
+
+Submitting from a draft grades the stored answers, so the final request only
+carries whatever changed after the last autosave.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from .. import db
+from ..models.exam_draft import DraftAnswer, ExamDraft
+from .answer_key import AnswerKey
+from .submission_queue import SubmissionRejected, validate_form
+
+MAX_ANSWER_LENGTH = 20_000
+
+
+@dataclass
+class DraftDelta:
+    """The changes of one autosave batch; ``None`` means unchanged."""
+
+    student_name: str | None = None
+    answers: dict[int, str] = field(default_factory=dict)
+    flags: dict[int, bool] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return self.student_name is not None or bool(self.answers) or bool(self.flags)
+
+
+def _question_ids(key: AnswerKey, values: Any, name: str) -> dict[int, Any]:
+    if values is None:
+        return {}
+    if not isinstance(values, Mapping):
+        raise SubmissionRejected(f"'{name}' must be an object keyed by question id.")
+
+    parsed = {}
+    for raw_id, value in values.items():
+        try:
+            question_id = int(raw_id)
+        except (TypeError, ValueError):
+            raise SubmissionRejected(f"Unknown question {raw_id}.") from None
+        if question_id not in key.question_ids:
+            raise SubmissionRejected(f"Question {question_id} is not part of this exam.")
+        parsed[question_id] = value
+    return parsed
+
+
+def parse_delta(key: AnswerKey, payload: Any) -> DraftDelta:
+    """Validate an autosave payload of the form
+    ``{"student_name": str, "answers": {id: str}, "flags": {id: bool}}``.
+    """
+    if not isinstance(payload, Mapping):
+        raise SubmissionRejected("Expected a JSON object.")
+
+    student_name = payload.get("student_name")
+    if student_name is not None:
+        if not isinstance(student_name, str):
+            raise SubmissionRejected("'student_name' must be a string.")
+        student_name = student_name.strip()[:200]
+
+    answers = _question_ids(key, payload.get("answers"), "answers")
+    for question_id, answer in answers.items():
+        if not isinstance(answer, str) or len(answer) > MAX_ANSWER_LENGTH:
+            raise SubmissionRejected(f"Invalid answer for question {question_id}.")
+    validate_form(key, {f"question_{qid}": answer for qid, answer in answers.items()})
+
+    flags = _question_ids(key, payload.get("flags"), "flags")
+    if not all(isinstance(flag, bool) for flag in flags.values()):
+        raise SubmissionRejected("Flags must be true or false.")
+
+    return DraftDelta(student_name, answers, flags)
+
+
+# Columns an upsert overwrites; answers and flags missing from a delta are NULL
+# and keep their stored value
+def _draft_updates(table, new):
+    return {"student_name": new.student_name, "updated_at": new.updated_at}
+
+
+def _answer_updates(table, new):
+    return {
+        "answer": func.coalesce(new.answer, table.c.answer),
+        "flagged": func.coalesce(new.flagged, table.c.flagged),
+        "updated_at": new.updated_at,
+    }
+
+
+_UPDATES = {"exam_drafts": _draft_updates, "draft_answers": _answer_updates}
+
+
+@lru_cache
+def _upsert_statement(dialect: str, table_name: str):
+    """One upsert per dialect and table, built once so its compiled form is reused.
+
+    It is executed with the whole batch as parameters, which the drivers send
+    as a single multi-row statement.
+    """
+    table = db.metadata.tables[table_name]
+    updates = _UPDATES[table_name]
+
+    if dialect == "mysql":
+        statement = mysql.insert(table)
+        return statement.on_duplicate_key_update(updates(table, statement.inserted))
+
+    insert_for = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}[dialect]
+    statement = insert_for(table)
+    return statement.on_conflict_do_update(
+        index_elements=list(table.primary_key), set_=updates(table, statement.excluded)
+    )
+
+
+def _merge_rows(model, rows: list[dict[str, Any]]) -> None:
+    """Row-by-row fallback for databases without an upsert statement."""
+    for row in rows:
+        key = tuple(row[column.key] for column in model.__table__.primary_key)
+        existing = db.session.get(model, key)
+        if existing is None:
+            db.session.add(model(**row))
+            continue
+        for column, value in row.items():
+            if value is not None:
+                setattr(existing, column, value)
+    db.session.flush()
+
+
+def _upsert(model, rows: list[dict[str, Any]]) -> None:
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql", "mysql"):
+        db.session.execute(_upsert_statement(dialect, model.__tablename__), rows)
+    else:
+        _merge_rows(model, rows)
+
+
+def save_draft(user_id: int, exam_id: int, delta: DraftDelta) -> int:
+    """Apply an autosave delta; return the number of questions written.
+
+    Answers and flags are one upsert; the student name, which rarely changes,
+    is a second one only when the delta carries it. The caller commits.
+    """
+    now = datetime.utcnow()
+    if delta.student_name is not None:
+        _upsert(
+            ExamDraft,
+            [
+                {
+                    "user_id": user_id,
+                    "exam_id": exam_id,
+                    "student_name": delta.student_name,
+                    "updated_at": now,
+                }
+            ],
+        )
+
+    rows = [
+        {
+            "user_id": user_id,
+            "exam_id": exam_id,
+            "question_id": question_id,
+            "answer": delta.answers.get(question_id),
+            "flagged": delta.flags.get(question_id),
+            "updated_at": now,
+        }
+        for question_id in sorted(delta.answers.keys() | delta.flags.keys())
+    ]
+    if rows:
+        _upsert(DraftAnswer, rows)
+    return len(rows)
+
+
+@dataclass(frozen=True)
+class SavedDraft:
+    student_name: str
+    answers: dict[int, str]
+    flagged: list[int]
+    updated_at: datetime | None
+
+    def form(self) -> dict[str, str]:
+        """The saved answers as the fields of a submit form."""
+        return {f"question_{qid}": answer for qid, answer in self.answers.items()}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "student_name": self.student_name,
+            "answers": {str(qid): answer for qid, answer in self.answers.items()},
+            "flagged": self.flagged,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+def load_draft(user_id: int, exam_id: int) -> SavedDraft | None:
+    """Return a student's saved attempt at an exam, if there is one."""
+    draft = db.session.execute(
+        select(ExamDraft.student_name, ExamDraft.updated_at).where(
+            ExamDraft.user_id == user_id, ExamDraft.exam_id == exam_id
+        )
+    ).first()
+    rows = db.session.execute(
+        select(
+            DraftAnswer.question_id,
+            DraftAnswer.answer,
+            DraftAnswer.flagged,
+            DraftAnswer.updated_at,
+        )
+        .where(DraftAnswer.user_id == user_id, DraftAnswer.exam_id == exam_id)
+        .order_by(DraftAnswer.question_id)
+    ).all()
+    if draft is None and not rows:
+        return None
+
+    updated = [row.updated_at for row in rows] + [draft.updated_at if draft else None]
+    return SavedDraft(
+        student_name=draft.student_name if draft else "",
+        answers={row.question_id: row.answer for row in rows if row.answer is not None},
+        flagged=[row.question_id for row in rows if row.flagged],
+        updated_at=max((stamp for stamp in updated if stamp), default=None),
+    )
+
+
+def discard_draft(user_id: int, exam_id: int) -> None:
+    """Delete a student's draft of an exam, e.g. once it has been submitted."""
+    for model in (DraftAnswer, ExamDraft):
+        db.session.execute(
+            delete(model)
+            .where(model.user_id == user_id, model.exam_id == exam_id)
+            .execution_options(synchronize_session=False)
+        )
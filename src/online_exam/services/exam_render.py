@@ -0,0 +1,107 @@
+"""Render cache for the question cards of published exams.
+
+Questions of a published exam cannot be edited, so the HTML of its question
+cards is the same for every student. It is rendered once per exam version
+(``Exam.updated_at``) and kept in a small process-level LRU; the take-exam page
+splices it into the per-request parts (navigation, flashes, autosave script).
+Concurrent misses for the same version wait for a single render.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from flask import current_app, render_template
+from markupsafe import Markup
+
+from ..models.question import Question
+
+DEFAULT_CACHE_SIZE = 64
+
+QUESTIONS_TEMPLATE = "student/_exam_questions.html"
+
+
+@dataclass(frozen=True)
+class RenderedExam:
+    """The student-independent part of a published exam's take page."""
+
+    exam_id: int
+    version: datetime | None
+    questions_html: Markup
+    total_questions: int
+    total_points: int
+
+    @property
+    def etag(self) -> str:
+        stamp = self.version.isoformat() if self.version else ""
+        return hashlib.sha1(f"{self.exam_id}:{stamp}".encode()).hexdigest()
+
+
+_cache: OrderedDict[tuple[int, datetime | None], RenderedExam] = OrderedDict()
+_rendering: dict[tuple[int, datetime | None], threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def _cache_size() -> int:
+    return current_app.config.get("EXAM_RENDER_CACHE_SIZE", DEFAULT_CACHE_SIZE)
+
+
+def render_exam(exam: Any) -> RenderedExam:
+    """Query the questions of ``exam`` and render its question cards."""
+    questions = Question.query.filter_by(exam_id=exam.id).order_by(Question.order_num).all()
+    return RenderedExam(
+        exam_id=exam.id,
+        version=exam.updated_at,
+        questions_html=Markup(render_template(QUESTIONS_TEMPLATE, questions=questions)),
+        total_questions=len(questions),
+        total_points=sum(question.points for question in questions),
+    )
+
+
+def _lookup(key: tuple[int, datetime | None]) -> RenderedExam | None:
+    rendered = _cache.get(key)
+    if rendered is not None:
+        _cache.move_to_end(key)
+    return rendered
+
+
+def get_rendered_exam(exam: Any) -> RenderedExam:
+    """Return the rendered question cards of a published exam, rendering on a miss."""
+    key = (exam.id, exam.updated_at)
+    with _lock:
+        rendered = _lookup(key)
+        if rendered is not None:
+            return rendered
+        render_lock = _rendering.setdefault(key, threading.Lock())
+
+    with render_lock:
+        with _lock:
+            rendered = _lookup(key)
+        if rendered is not None:
+            return rendered
+
+        try:
+            rendered = render_exam(exam)
+        except BaseException:
+            with _lock:
+                _rendering.pop(key, None)
+            raise
+
+        with _lock:
+            # Older versions of the exam can never be served again
+            for stale in [k for k in _cache if k[0] == exam.id]:
+                del _cache[stale]
+            _cache[key] = rendered
+            while len(_cache) > max(_cache_size(), 1):
+                _cache.popitem(last=False)
+            _rendering.pop(key, None)
+    return rendered
+
+
+def clear_rendered_exams() -> None:
+    with _lock:
+        _cache.clear()
+        _rendering.clear()
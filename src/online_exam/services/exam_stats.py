@@ -0,0 +1,196 @@
+"""Incremental maintenance of the ``ExamStats`` summary table.
+
+Each grade change adjusts the exam's row with a single UPDATE of running sums,
+so the report and export read one row instead of re-aggregating submissions.
+``rebuild_exam_stats`` recomputes a row from scratch (missing rows, re-grades
+and the ``rebuild-exam-stats`` maintenance command).
+
+Rows are created with an insert-or-ignore (or upsert), never a plain INSERT:
+two first submissions to an exam may both find its row missing, and the one
+whose INSERT loses simply folds its score into the winner's row.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from .. import db
+from ..models.exam_stats import ExamStats
+from ..models.submission import Submission
+from .db_routing import use_primary
+from .reporting import PASS_THRESHOLD, SCORE_RANGES, score_range_label, summarize_exam_scores
+
+RANGE_COLUMNS = dict(
+    zip(
+        (label for label, _, _ in SCORE_RANGES),
+        (
+            "range_90_100",
+            "range_80_89",
+            "range_70_79",
+            "range_60_69",
+            "range_50_59",
+            "range_below_50",
+        ),
+    )
+)
+
+
+def _summary_values(exam_id: int) -> dict[str, Any]:
+    """Column values of an exam's stats row, aggregated from its submissions."""
+    db.session.flush()
+    summary = summarize_exam_scores(exam_id)
+    values = {
+        "exam_id": exam_id,
+        "submission_count": summary.total_submissions,
+        "score_sum": summary.total_score,
+        "score_sq_sum": summary.score_sq_sum,
+        "min_score": summary.lowest_score,
+        "max_score": summary.highest_score,
+        "pass_count": summary.passed,
+        "updated_at": datetime.utcnow(),
+    }
+    for label, count in summary.score_ranges.items():
+        values[RANGE_COLUMNS[label]] = count
+    return values
+
+
+def _insert_stats(values: dict[str, Any], overwrite: bool) -> int:
+    """Insert an exam's stats row; an existing row is replaced if ``overwrite``, else kept.
+
+    Returns 0 when an existing row was kept.
+    """
+    table = ExamStats.__table__
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "mysql":
+        statement = mysql.insert(table).values(values)
+        if overwrite:
+            statement = statement.on_duplicate_key_update(values)
+        else:
+            statement = statement.prefix_with("IGNORE")
+    elif dialect in ("sqlite", "postgresql"):
+        statement = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}[dialect](table)
+        statement = statement.values(values)
+        if overwrite:
+            statement = statement.on_conflict_do_update(index_elements=["exam_id"], set_=values)
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=["exam_id"])
+    else:
+        stats = db.session.get(ExamStats, values["exam_id"])
+        if stats is None:
+            db.session.add(ExamStats(**values))
+            db.session.flush()
+            return 1
+        if not overwrite:
+            return 0
+        for column, value in values.items():
+            setattr(stats, column, value)
+        db.session.flush()
+        return 1
+
+    return db.session.execute(statement).rowcount
+
+
+def rebuild_exam_stats(exam_id: int) -> ExamStats:
+    """Recompute the stats row of one exam from its submissions."""
+    _insert_stats(_summary_values(exam_id), overwrite=True)
+    return db.session.get(ExamStats, exam_id, populate_existing=True)
+
+
+def get_exam_stats(exam_id: int) -> ExamStats:
+    """Return the stats row of an exam, building it on first use."""
+    stats = db.session.get(ExamStats, exam_id, populate_existing=True)
+    if stats is None:
+        # A lagging replica may just not have the row yet; rebuild from the primary
+        with use_primary():
+            stats = rebuild_exam_stats(exam_id)
+            db.session.commit()
+    return stats
+
+
+def record_submission(exam_id: int, score: int, percentage: float) -> None:
+    """Fold a newly graded submission into the exam's running statistics."""
+    first = ExamStats.submission_count == 0
+    bucket = getattr(ExamStats, RANGE_COLUMNS[score_range_label(percentage)])
+    fold_in = (
+        update(ExamStats)
+        .where(ExamStats.exam_id == exam_id)
+        .values(
+            submission_count=ExamStats.submission_count + 1,
+            score_sum=ExamStats.score_sum + score,
+            score_sq_sum=ExamStats.score_sq_sum + score * score,
+            min_score=case(
+                (first | (ExamStats.min_score > score), score), else_=ExamStats.min_score
+            ),
+            max_score=case(
+                (first | (ExamStats.max_score < score), score), else_=ExamStats.max_score
+            ),
+            pass_count=ExamStats.pass_count + (1 if percentage >= PASS_THRESHOLD else 0),
+            **{bucket.key: bucket + 1},
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if db.session.execute(fold_in).rowcount:
+        return
+
+    # No row yet: build it from the submissions, which include this one. If a
+    # concurrent submission created it first, add this score to that row instead.
+    if not _insert_stats(_summary_values(exam_id), overwrite=False):
+        db.session.execute(fold_in)
+
+
+def record_score_change(
+    exam_id: int,
+    old_score: int,
+    old_percentage: float,
+    new_score: int,
+    new_percentage: float,
+) -> None:
+    """Move one submission's contribution from its old score to its new one."""
+    if old_score == new_score and old_percentage == new_percentage:
+        return
+
+    stats = db.session.get(ExamStats, exam_id, populate_existing=True)
+    if stats is None:
+        rebuild_exam_stats(exam_id)
+        return
+
+    values = {
+        "score_sum": ExamStats.score_sum + (new_score - old_score),
+        "score_sq_sum": ExamStats.score_sq_sum + (new_score * new_score - old_score * old_score),
+        "pass_count": ExamStats.pass_count
+        + (1 if new_percentage >= PASS_THRESHOLD else 0)
+        - (1 if old_percentage >= PASS_THRESHOLD else 0),
+    }
+    old_bucket = RANGE_COLUMNS[score_range_label(old_percentage)]
+    new_bucket = RANGE_COLUMNS[score_range_label(new_percentage)]
+    if old_bucket != new_bucket:
+        values[old_bucket] = getattr(ExamStats, old_bucket) - 1
+        values[new_bucket] = getattr(ExamStats, new_bucket) + 1
+
+    db.session.execute(
+        update(ExamStats)
+        .where(ExamStats.exam_id == exam_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+    if old_score in (stats.min_score, stats.max_score) or not (
+        stats.min_score <= new_score <= stats.max_score
+    ):
+        # The old value may have been the extreme; re-read bounds from the index
+        db.session.flush()
+        lowest, highest = db.session.execute(
+            select(func.min(Submission.total_score), func.max(Submission.total_score)).where(
+                Submission.exam_id == exam_id
+            )
+        ).one()
+        db.session.execute(
+            update(ExamStats)
+            .where(ExamStats.exam_id == exam_id)
+            .values(min_score=lowest or 0, max_score=highest or 0)
+            .execution_options(synchronize_session=False)
+        )
+
+    db.session.expire(stats)
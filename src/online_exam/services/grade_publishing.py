@@ -0,0 +1,214 @@
+"""Publishing an exam's grades and notifying its students.
+
+``publish_exam_grades`` is two set-based statements in the caller's transaction:
+an ``INSERT ... SELECT`` that queues one ``GradeNotification`` per graded
+submission, then one ``UPDATE`` flipping those submissions to ``published``.
+Nothing is loaded into the session, so publishing a large cohort takes
+milliseconds.
+
+A background thread (``GradeNotifier``) drains the queue after the commit in
+batches of ``NOTIFY_BATCH``, handing each batch to the ``email_utils`` sender.
+Delivery is at-least-once: a batch is deleted from the queue only after the
+sender returned. Each notification goes to the account that made the
+submission. Submissions stored before that account was recorded fall back to
+their student name, but only when exactly one student account has it: a score
+is never sent to a name shared by several students.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from flask import Flask, current_app
+from sqlalchemy import delete, insert, literal, select, update
+
+from .. import db
+from ..models.exam import Exam
+from ..models.grade_notification import GradeNotification
+from ..models.submission import Submission
+from ..models.user import User
+from ..utils import email_utils
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_BATCH = 100
+MAX_ATTEMPTS = 5
+# The notifier is woken on every publish; this only bounds how long entries
+# left behind by a failed batch or another process wait
+POLL_SECONDS = 30
+
+
+def publish_exam_grades(exam_id: int) -> int:
+    """Publish every graded submission of an exam; return how many were published.
+
+    The caller commits, then calls ``wake_grade_notifier``.
+    """
+    graded = (Submission.exam_id == exam_id) & (Submission.status == "graded")
+    db.session.execute(
+        insert(GradeNotification).from_select(
+            ["submission_id", "attempts", "created_at"],
+            select(Submission.id, literal(0), literal(datetime.utcnow())).where(graded),
+        )
+    )
+    result = db.session.execute(
+        update(Submission)
+        .where(graded)
+        .values(status="published")
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def send_pending_notifications(limit: int = NOTIFY_BATCH) -> int:
+    """Send the oldest batch of queued notifications; return how many were handled."""
+    rows = db.session.execute(
+        select(
+            GradeNotification.id,
+            Submission.student_id,
+            Submission.student_name,
+            Submission.total_score,
+            Submission.max_score,
+            Submission.percentage,
+            Exam.title,
+        )
+        .join(Submission, Submission.id == GradeNotification.submission_id)
+        .join(Exam, Exam.id == Submission.exam_id)
+        .where(GradeNotification.attempts < MAX_ATTEMPTS)
+        .order_by(GradeNotification.id)
+        .limit(limit)
+    ).all()
+    if not rows:
+        return 0
+
+    recipients = _recipients(rows)
+    messages = [
+        (recipients[row.id], row.title, row.total_score, row.max_score, row.percentage)
+        for row in rows
+        if row.id in recipients
+    ]
+    ids = [row.id for row in rows]
+
+    try:
+        email_utils.send_grades_published_emails(messages)
+    except Exception:
+        db.session.rollback()
+        db.session.execute(
+            update(GradeNotification)
+            .where(GradeNotification.id.in_(ids))
+            .values(attempts=GradeNotification.attempts + 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        raise
+
+    db.session.execute(
+        delete(GradeNotification)
+        .where(GradeNotification.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return len(rows)
+
+
+def _recipients(rows: Sequence[Any]) -> dict[int, Any]:
+    """Map notification ids to the ``(id, name, email)`` row of their student."""
+    # Plain rows rather than ORM objects: they outlive the commit of the caller
+    student_ids = {row.student_id for row in rows if row.student_id is not None}
+    by_id = {
+        user.id: user
+        for user in db.session.execute(
+            select(User.id, User.name, User.email).where(User.id.in_(student_ids))
+        )
+    }
+
+    names = {row.student_name for row in rows if row.student_id is None}
+    by_name: dict[str, list[Any]] = defaultdict(list)
+    for user in db.session.execute(
+        select(User.id, User.name, User.email).where(User.role == "student", User.name.in_(names))
+    ):
+        by_name[user.name].append(user)
+
+    recipients = {}
+    for row in rows:
+        if row.student_id is not None:
+            if row.student_id in by_id:
+                recipients[row.id] = by_id[row.student_id]
+        elif len(by_name[row.student_name]) == 1:
+            recipients[row.id] = by_name[row.student_name][0]
+        elif by_name[row.student_name]:
+            logger.warning(
+                "Not notifying %r of notification %s: the name belongs to several students",
+                row.student_name,
+                row.id,
+            )
+    return recipients
+
+
+def send_all_notifications() -> int:
+    """Drain the queue; return the number of notifications handled."""
+    total = 0
+    while count := send_pending_notifications():
+        total += count
+    return total
+
+
+class GradeNotifier:
+    """One background thread sending queued grade notifications."""
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="grade-notifier", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Cleared before draining, so a publish during the drain is not missed
+            self._wake.clear()
+            with self.app.app_context():
+                try:
+                    send_all_notifications()
+                except Exception:  # retried on the next wake-up
+                    logger.exception("Sending grade notifications failed")
+                finally:
+                    db.session.remove()
+            self._wake.wait(POLL_SECONDS)
+
+
+_lock = threading.Lock()
+
+
+def get_grade_notifier(app: Flask | None = None) -> GradeNotifier | None:
+    """Return the app's notifier, starting it on first use (``None`` when disabled)."""
+    app = app or current_app._get_current_object()
+    if not app.config.get("GRADE_NOTIFIER_ENABLED", True):
+        return None
+
+    state = app.extensions.setdefault("grade_notifier", {})
+    if "notifier" not in state:
+        with _lock:
+            if "notifier" not in state:
+                notifier = GradeNotifier(app)
+                notifier.start()
+                state["notifier"] = notifier
+    return state["notifier"]
+
+
+def wake_grade_notifier() -> None:
+    notifier = get_grade_notifier()
+    if notifier is not None:
+        notifier.wake()
@@ -0,0 +1,91 @@
+"""Process pool for password hashing.
+
+scrypt and PBKDF2 take tens of milliseconds of CPU per call. Run on the
+request thread they compete with every other request of the worker, so
+``password_utils`` hands them to a pool of ``HASHING_WORKERS`` processes
+(default: one per core) instead, and login throughput grows with the cores
+rather than with WSGI threads.
+
+The pool is bounded: at most ``HASHING_MAX_PENDING`` hashes are queued or
+running. A request that cannot get a slot within ``HASHING_QUEUE_TIMEOUT``
+seconds raises ``HashingBusy`` (answered with 503 and ``Retry-After``) rather
+than waiting behind a backlog it cannot outrun. With ``HASHING_WORKERS`` set
+to 0 (as in the tests) hashes run inline.
+"""
+
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from flask import Flask, current_app, has_app_context
+
+T = TypeVar("T")
+
+DEFAULT_PENDING_PER_WORKER = 8
+DEFAULT_QUEUE_TIMEOUT = 5.0
+
+
+class HashingBusy(RuntimeError):
+    """Every hashing slot stayed taken for the whole queue timeout."""
+
+
+class HashingExecutor:
+    """A process pool admitting at most ``max_pending`` calls at a time."""
+
+    def __init__(self, workers: int, max_pending: int, timeout: float) -> None:
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # Not forked: the request threads of this process hold locks a
+        # forked child would inherit in their taken state
+        self._pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call ``func`` (a module-level function) in the pool and return its result."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HashingBusy("Password hashing is saturated.")
+        try:
+            future = self._pool.submit(func, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+_lock = threading.Lock()
+
+
+def get_hashing_executor(app: Flask | None = None) -> HashingExecutor | None:
+    """Return the app's hashing pool, started on first use (``None``: hash inline)."""
+    app = app or current_app._get_current_object()
+    workers = app.config.get("HASHING_WORKERS")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        return None
+
+    state = app.extensions.setdefault("hashing", {})
+    if "executor" not in state:
+        with _lock:
+            if "executor" not in state:
+                state["executor"] = HashingExecutor(
+                    workers,
+                    app.config.get("HASHING_MAX_PENDING") or workers * DEFAULT_PENDING_PER_WORKER,
+                    app.config.get("HASHING_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT),
+                )
+    return state["executor"]
+
+
+def offload(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a hashing call in the app's pool, or inline outside an app or without a pool."""
+    executor = get_hashing_executor() if has_app_context() else None
+    if executor is None:
+        return func(*args, **kwargs)
+    return executor.run(func, *args, **kwargs)
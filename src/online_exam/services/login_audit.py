@@ -0,0 +1,138 @@
+"""Buffered audit log of login attempts.
+
+Every login and 2FA check records a ``LoginAttempt``. Committing that row on
+the request path costs a whole transaction (and an fsync) per login, which
+adds up when a cohort signs in at the start of an exam. ``record_login_attempt``
+instead appends the row to an in-process buffer; a background thread writes
+the buffer with one multi-row ``INSERT`` once it holds ``LOGIN_AUDIT_BATCH_SIZE``
+rows or ``LOGIN_AUDIT_FLUSH_SECONDS`` have passed, and once more at shutdown.
+
+Rows still buffered when the process is killed are lost, as are rows of a
+batch the database rejects (logged): the audit log never fails a login. With
+``LOGIN_AUDIT_BUFFERED`` off (as in the tests) each attempt is committed
+synchronously instead.
+"""
+
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Any
+
+from flask import Flask, current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from .. import db
+from ..models.login_attempt import LoginAttempt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_SECONDS = 1.0
+
+
+class LoginAuditWriter:
+    """Buffer of login attempts flushed by one background thread."""
+
+    def __init__(
+        self,
+        app: Flask,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+    ) -> None:
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._rows: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="login-audit", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def record(self, row: dict[str, Any]) -> None:
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write every buffered row; return how many were written."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        try:
+            with self.app.app_context(), db.engine.begin() as connection:
+                connection.execute(insert(LoginAttempt.__table__).values(rows))
+        except Exception:
+            # Auditing must not take logins down
+            logger.exception("Dropped %d login attempt(s) that could not be written", len(rows))
+            return 0
+        return len(rows)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the thread after a final flush."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        else:
+            self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+
+_lock = threading.Lock()
+
+
+def get_login_audit_writer(app: Flask | None = None) -> LoginAuditWriter | None:
+    """Return the app's writer, starting it on first use (``None`` when unbuffered)."""
+    app = app or current_app._get_current_object()
+    if not app.config.get("LOGIN_AUDIT_BUFFERED", True):
+        return None
+
+    state = app.extensions.setdefault("login_audit", {})
+    if "writer" not in state:
+        with _lock:
+            if "writer" not in state:
+                writer = LoginAuditWriter(
+                    app,
+                    app.config.get("LOGIN_AUDIT_BATCH_SIZE", DEFAULT_BATCH_SIZE),
+                    app.config.get("LOGIN_AUDIT_FLUSH_SECONDS", DEFAULT_FLUSH_SECONDS),
+                )
+                writer.start()
+                atexit.register(writer.stop)
+                state["writer"] = writer
+    return state["writer"]
+
+
+def record_login_attempt(user_identifier: str, ip_address: str, success: bool) -> None:
+    """Record a login attempt, buffered unless ``LOGIN_AUDIT_BUFFERED`` is off."""
+    row = {
+        "user_identifier": user_identifier,
+        "ip_address": ip_address,
+        "success": success,
+        "timestamp": datetime.utcnow(),
+    }
+    writer = get_login_audit_writer()
+    if writer is not None:
+        writer.record(row)
+        return
+
+    db.session.add(LoginAttempt(**row))
+    try:
+        db.session.commit()
+    except SQLAlchemyError:
+        # Auditing must not take logins down
+        db.session.rollback()
+        logger.exception("Could not write a login attempt")
@@ -0,0 +1,136 @@
+"""Hourly roll-ups and retention for the login-attempt audit log.
+
+``login_attempts`` gets a row per login, so the admin aggregates used to group
+the whole history. ``roll_up_login_attempts`` adds every completed hour to two
+roll-up tables, per IP address and per account identifier, with one
+``INSERT ... SELECT ... GROUP BY`` each. The admin page reads those plus the
+raw rows of the hours not rolled up yet.
+
+``prune_login_attempts`` then deletes raw rows older than the retention period,
+never ones that are not rolled up, in batches of ``DELETE_BATCH`` so no single
+statement locks much of the table; old roll-ups are pruned after their own,
+longer period. ``flask prune-login-attempts`` runs both, e.g. hourly from cron.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, case, delete, func, insert, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from .. import db
+from ..models.login_attempt import (
+    LoginAttempt,
+    LoginAttemptHourlyByIdentifier,
+    LoginAttemptHourlyByIp,
+)
+
+DELETE_BATCH = 5000
+# Buffered attempts are written up to a few seconds late; an hour is rolled up
+# only once this much time has passed since it ended
+ROLL_UP_DELAY = timedelta(minutes=5)
+ROLLUPS = (LoginAttemptHourlyByIp, LoginAttemptHourlyByIdentifier)
+
+
+class hour_bucket(FunctionElement):  # lower case: used like a SQL function
+    """``DATETIME`` truncated to the hour, in the database's own dialect."""
+
+    type = DateTime()
+    name = "hour_bucket"
+    inherit_cache = True
+
+
+@compiles(hour_bucket)
+def _hour_bucket_default(element, compiler, **kw):
+    return f"date_trunc('hour', {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(hour_bucket, "sqlite")
+def _hour_bucket_sqlite(element, compiler, **kw):
+    # The text format SQLAlchemy stores SQLite datetimes in
+    return f"strftime('%Y-%m-%d %H:00:00.000000', {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(hour_bucket, "mysql")
+def _hour_bucket_mysql(element, compiler, **kw):
+    value = compiler.process(element.clauses, **kw)
+    return f"TIMESTAMP(DATE({value}), MAKETIME(HOUR({value}), 0, 0))"
+
+
+@dataclass(frozen=True)
+class PruneResult:
+    attempts_deleted: int
+    rollups_deleted: int
+
+
+def _start_of_hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def roll_up_login_attempts(now: datetime | None = None) -> int:
+    """Roll up every completed hour not rolled up yet; return the rows added."""
+    until = _start_of_hour((now or datetime.utcnow()) - ROLL_UP_DELAY)
+    since = LoginAttemptHourlyByIp.rolled_up_until()
+    if since is None:
+        since = db.session.scalar(select(func.min(LoginAttempt.timestamp)))
+        if since is None:
+            return 0
+        since = _start_of_hour(since)
+    if since >= until:
+        return 0
+
+    hour = hour_bucket(LoginAttempt.timestamp)
+    failed = func.sum(case((LoginAttempt.success.is_(False), 1), else_=0))
+    succeeded = func.sum(case((LoginAttempt.success.is_(True), 1), else_=0))
+    added = 0
+    for rollup in ROLLUPS:
+        key = getattr(LoginAttempt, rollup.key_name)
+        added += db.session.execute(
+            insert(rollup).from_select(
+                ["hour", rollup.key_name, "failed", "succeeded"],
+                select(hour, key, failed, succeeded)
+                .where(LoginAttempt.timestamp >= since, LoginAttempt.timestamp < until)
+                .group_by(hour, key),
+            )
+        ).rowcount
+    return added
+
+
+def prune_login_attempts(
+    retention_days: int, rollup_retention_days: int, now: datetime | None = None
+) -> PruneResult:
+    """Delete raw attempts and roll-ups past their retention, committing per batch."""
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=retention_days)
+    rolled_up_until = LoginAttemptHourlyByIp.rolled_up_until()
+    if rolled_up_until is None:
+        cutoff = None
+    else:
+        cutoff = min(cutoff, rolled_up_until)
+
+    attempts_deleted = 0
+    while cutoff is not None:
+        ids = db.session.scalars(
+            select(LoginAttempt.id).where(LoginAttempt.timestamp < cutoff).limit(DELETE_BATCH)
+        ).all()
+        if not ids:
+            break
+        db.session.execute(
+            delete(LoginAttempt)
+            .where(LoginAttempt.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        attempts_deleted += len(ids)
+
+    rollup_cutoff = now - timedelta(days=rollup_retention_days)
+    rollups_deleted = 0
+    for rollup in ROLLUPS:
+        rollups_deleted += db.session.execute(
+            delete(rollup)
+            .where(rollup.hour < rollup_cutoff)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    db.session.commit()
+    return PruneResult(attempts_deleted, rollups_deleted)
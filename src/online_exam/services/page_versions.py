@@ -0,0 +1,58 @@
+"""Cheap version keys for ``conditional_get`` pages.
+
+Each function reads only ids, statuses, counts and ``updated_at`` columns in a
+single query and returns a tuple that changes whenever the page would, or
+``None`` when the row does not exist (the view then renders its own 404).
+"""
+
+from sqlalchemy import func, select
+
+from .. import db
+from ..models.exam import Exam
+from ..models.question import Question
+from ..models.submission import Answer, Submission
+
+
+def _questions_of(exam_id):
+    """Count and latest change of an exam's questions, as scalar subqueries."""
+    where = Question.exam_id == exam_id
+    return (
+        select(func.count(Question.id)).where(where).scalar_subquery(),
+        select(func.max(Question.updated_at)).where(where).scalar_subquery(),
+    )
+
+
+def exam_version(exam_id: int) -> tuple | None:
+    row = db.session.execute(select(Exam.status, Exam.updated_at).where(Exam.id == exam_id)).first()
+    return None if row is None else ("exam", exam_id, *row)
+
+
+def published_exam_version(exam_id: int) -> tuple | None:
+    """Like ``exam_version``, but drafts are not cached (they redirect with a flash)."""
+    version = exam_version(exam_id)
+    return version if version is not None and version[2] == "published" else None
+
+
+def question_list_version(exam_id: int) -> tuple | None:
+    row = db.session.execute(
+        select(Exam.status, Exam.updated_at, *_questions_of(exam_id)).where(Exam.id == exam_id)
+    ).first()
+    return None if row is None else ("questions", exam_id, *row)
+
+
+def submission_version(submission_id: int) -> tuple | None:
+    """Version of a results page: the submission, its answers and its exam's questions."""
+    answers = Answer.submission_id == submission_id
+    row = db.session.execute(
+        select(
+            Submission.status,
+            Submission.updated_at,
+            Exam.updated_at,
+            select(func.count(Answer.id)).where(answers).scalar_subquery(),
+            select(func.max(Answer.updated_at)).where(answers).scalar_subquery(),
+            *_questions_of(Submission.exam_id),
+        )
+        .join(Exam, Exam.id == Submission.exam_id)
+        .where(Submission.id == submission_id)
+    ).first()
+    return None if row is None else ("submission", submission_id, *row)
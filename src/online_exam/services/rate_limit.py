@@ -0,0 +1,154 @@
+"""Rate limiting for the authentication endpoints.
+
+Login, 2FA verification and password reset are throttled per client IP and
+per account before any user lookup or password hashing, so a brute-force
+burst costs the server a dictionary lookup per request instead of a database
+query and a hash. Every request is charged to its IP, but only failed
+attempts (and sent reset emails) are charged to the account, so knowing an
+address is not enough to lock its owner out.
+
+Each key has a token bucket: ``limit`` tokens, refilled continuously at
+``limit / period`` per second, which behaves like a sliding window without
+storing a timestamp per request. ``MemoryBackend`` keeps the buckets of one
+process in a bounded LRU; a backend shared by every worker (Redis, memcached)
+can be plugged in through ``RATE_LIMIT_BACKEND`` by implementing
+``RateLimitBackend``.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from flask import Flask, current_app
+
+DEFAULT_MAX_KEYS = 100_000
+
+
+class RateLimitBackend(ABC):
+    """Storage of the token buckets."""
+
+    @abstractmethod
+    def hit(self, key: str, limit: int, period: float) -> float:
+        """Take a token from ``key``'s bucket.
+
+        Return 0 when the request is allowed, otherwise the seconds until the
+        bucket holds a token again (nothing is taken).
+        """
+
+    @abstractmethod
+    def peek(self, key: str, limit: int, period: float) -> float:
+        """Like ``hit``, without taking a token."""
+
+
+class MemoryBackend(RateLimitBackend):
+    """Token buckets of this process, least recently used dropped beyond ``max_keys``."""
+
+    def __init__(
+        self, max_keys: int = DEFAULT_MAX_KEYS, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, period: float) -> float:
+        now = self.clock()
+        rate = limit / period
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (limit, now))
+            tokens = min(limit, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / rate
+            # A forgotten bucket is a full one, so evicting never blocks anyone
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def peek(self, key: str, limit: int, period: float) -> float:
+        now = self.clock()
+        rate = limit / period
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (limit, now))
+        tokens = min(limit, tokens + (now - updated) * rate)
+        return 0.0 if tokens >= 1 else (1 - tokens) / rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+@dataclass(frozen=True)
+class Limit:
+    requests: int
+    seconds: float
+
+
+class RateLimiter:
+    """Per-IP and per-account limits in front of the auth endpoints."""
+
+    def __init__(self, backend: RateLimitBackend, per_ip: Limit, per_account: Limit) -> None:
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_account = per_account
+
+    def check(self, scope: str, ip_address: str, account: str | None = None) -> float:
+        """Count a request to ``scope``; return 0 if allowed, else seconds to wait.
+
+        The account's bucket is only checked; ``charge`` counts against it.
+        """
+        retry_after = self.backend.hit(
+            f"{scope}:ip:{ip_address}", self.per_ip.requests, self.per_ip.seconds
+        )
+        if retry_after or not account:
+            return retry_after
+        return self.backend.peek(
+            f"{scope}:account:{account}", self.per_account.requests, self.per_account.seconds
+        )
+
+    def charge(self, scope: str, account: str) -> float:
+        """Count a failed attempt on ``account``; return 0 if within its limit."""
+        return self.backend.hit(
+            f"{scope}:account:{account}", self.per_account.requests, self.per_account.seconds
+        )
+
+
+_lock = threading.Lock()
+
+
+def get_rate_limiter(app: Flask | None = None) -> RateLimiter | None:
+    """Return the app's rate limiter (``None`` when ``RATE_LIMIT_ENABLED`` is off)."""
+    app = app or current_app._get_current_object()
+    if not app.config.get("RATE_LIMIT_ENABLED", True):
+        return None
+
+    state = app.extensions.setdefault("rate_limiter", {})
+    if "limiter" not in state:
+        with _lock:
+            if "limiter" not in state:
+                backend = app.config.get("RATE_LIMIT_BACKEND") or MemoryBackend(
+                    app.config.get("RATE_LIMIT_MAX_KEYS", DEFAULT_MAX_KEYS)
+                )
+                state["limiter"] = RateLimiter(
+                    backend,
+                    Limit(*app.config["RATE_LIMIT_PER_IP"]),
+                    Limit(*app.config["RATE_LIMIT_PER_ACCOUNT"]),
+                )
+    return state["limiter"]
+
+
+def rate_limit(scope: str, ip_address: str, account: str | None = None) -> float:
+    """Count a request with the app's limiter; 0 when allowed or rate limiting is off."""
+    limiter = get_rate_limiter()
+    return 0.0 if limiter is None else limiter.check(scope, ip_address, account)
+
+
+def rate_limit_account(scope: str, account: str) -> float:
+    """Count a failed attempt with the app's limiter; 0 when within the limit or it is off."""
+    limiter = get_rate_limiter()
+    return 0.0 if limiter is None else limiter.charge(scope, account)
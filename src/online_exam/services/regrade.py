@@ -0,0 +1,146 @@
+"""Batch re-grading of every submission of an exam.
+
+Used after an answer key has been corrected. Answers are loaded as columnar
+NumPy arrays, compared against the key in one vectorized operation, summed per
+submission with grouped sums, and written back with bulk UPDATEs. Written
+answers keep the points an instructor gave them.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select, update
+
+from .. import db
+from ..models.submission import Answer, Submission
+from .answer_key import compile_answer_key, invalidate_answer_key
+from .exam_stats import rebuild_exam_stats
+
+
+@dataclass(frozen=True)
+class RegradeResult:
+    submissions: int
+    answers_changed: int
+    submissions_changed: int
+
+
+def regrade_exam(exam: Any) -> RegradeResult:
+    """Re-score all answers and submissions of ``exam`` against its current key.
+
+    The caller owns the transaction and is expected to commit.
+    """
+    import numpy as np
+
+    invalidate_answer_key(exam.id)
+    key = compile_answer_key(exam)
+
+    answer_rows = db.session.execute(
+        select(
+            Answer.id,
+            Answer.submission_id,
+            Answer.question_id,
+            Answer.selected_option,
+            Answer.is_correct,
+            Answer.points_earned,
+        )
+        .join(Submission, Answer.submission_id == Submission.id)
+        .where(Submission.exam_id == exam.id)
+        .order_by(Answer.id)
+    ).all()
+    submission_rows = db.session.execute(
+        select(Submission.id, Submission.total_score, Submission.max_score)
+        .where(Submission.exam_id == exam.id)
+        .order_by(Submission.id)
+    ).all()
+
+    if not submission_rows:
+        return RegradeResult(0, 0, 0)
+
+    correct_options = [option or "" for option in key.correct_options]
+    selected_options = [r.selected_option or "" for r in answer_rows]
+    # One fixed width wide enough for every value, so nothing is truncated and
+    # the comparison stays vectorized
+    width = max(1, *map(len, correct_options), *map(len, selected_options))
+    text = f"<U{width}"
+
+    # Key lookup tables indexed by question id
+    size = max(key.question_ids, default=0) + 1
+    key_points = np.zeros(size, dtype=np.int64)
+    key_correct = np.full(size, "", dtype=text)
+    key_is_mcq = np.zeros(size, dtype=bool)
+    if len(key):
+        ids = np.fromiter(key.question_ids, dtype=np.int64, count=len(key))
+        key_points[ids] = key.points
+        key_correct[ids] = correct_options
+        key_is_mcq[ids] = [qtype == "mcq" for qtype in key.question_types]
+
+    answer_ids = np.fromiter((r.id for r in answer_rows), dtype=np.int64, count=len(answer_rows))
+    submission_ids = np.fromiter(
+        (r.submission_id for r in answer_rows), dtype=np.int64, count=len(answer_rows)
+    )
+    question_ids = np.fromiter(
+        (r.question_id for r in answer_rows), dtype=np.int64, count=len(answer_rows)
+    )
+    selected = np.array(selected_options, dtype=text)
+    old_correct = np.array([bool(r.is_correct) for r in answer_rows], dtype=bool)
+    old_points = np.fromiter(
+        (r.points_earned or 0 for r in answer_rows), dtype=np.int64, count=len(answer_rows)
+    )
+
+    # Answers to questions missing from the key keep their stored grade
+    in_key = question_ids < size
+    safe_qids = np.where(in_key, question_ids, 0)
+    is_mcq = in_key & key_is_mcq[safe_qids]
+
+    mcq_correct = is_mcq & (selected != "") & (selected == key_correct[safe_qids])
+    new_correct = np.where(is_mcq, mcq_correct, old_correct)
+    new_points = np.where(is_mcq, np.where(mcq_correct, key_points[safe_qids], 0), old_points)
+
+    changed = (new_correct != old_correct) | (new_points != old_points)
+    if changed.any():
+        db.session.execute(
+            update(Answer),
+            [
+                {"id": int(answer_id), "is_correct": bool(correct), "points_earned": int(points)}
+                for answer_id, correct, points in zip(
+                    answer_ids[changed], new_correct[changed], new_points[changed]
+                )
+            ],
+        )
+
+    # Grouped sum of points per submission
+    all_submission_ids = np.fromiter(
+        (r.id for r in submission_rows), dtype=np.int64, count=len(submission_rows)
+    )
+    positions = np.searchsorted(all_submission_ids, submission_ids)
+    totals = np.bincount(positions, weights=new_points, minlength=len(submission_rows)).astype(
+        np.int64
+    )
+    old_totals = np.array([r.total_score or 0 for r in submission_rows], dtype=np.int64)
+    old_max = np.array([r.max_score or 0 for r in submission_rows], dtype=np.int64)
+
+    max_score = key.max_score
+
+    sub_changed = (totals != old_totals) | (old_max != max_score)
+    if sub_changed.any():
+        db.session.execute(
+            update(Submission),
+            [
+                {
+                    "id": int(submission_id),
+                    "total_score": int(total),
+                    "max_score": max_score,
+                    "percentage": round(int(total) / max_score * 100, 2) if max_score else 0.0,
+                }
+                for submission_id, total in zip(
+                    all_submission_ids[sub_changed], totals[sub_changed]
+                )
+            ],
+        )
+        rebuild_exam_stats(exam.id)
+
+    return RegradeResult(
+        submissions=len(submission_rows),
+        answers_changed=int(changed.sum()),
+        submissions_changed=int(sub_changed.sum()),
+    )
@@ -0,0 +1,99 @@
+"""Exam performance statistics computed in the database.
+
+``summarize_exam_scores`` returns the whole report summary (count, sum, min,
+max, pass count and the score-range histogram) from one aggregate query, so its
+cost in memory and round-trips does not grow with the number of submissions.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import case, func, select
+
+from .. import db
+from ..models.submission import Submission
+
+PASS_THRESHOLD = 50
+
+# (label, lower bound inclusive, upper bound exclusive) on percentage
+SCORE_RANGES = (
+    ("90-100", 90, None),
+    ("80-89", 80, 90),
+    ("70-79", 70, 80),
+    ("60-69", 60, 70),
+    ("50-59", 50, 60),
+    ("Below 50", None, 50),
+)
+
+
+@dataclass(frozen=True)
+class ScoreSummary:
+    total_submissions: int
+    total_score: int
+    score_sq_sum: int
+    highest_score: int
+    lowest_score: int
+    passed: int
+    score_ranges: dict[str, int]
+
+    @property
+    def avg_score(self) -> float:
+        return self.total_score / self.total_submissions if self.total_submissions else 0
+
+    @property
+    def failed(self) -> int:
+        return self.total_submissions - self.passed
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.total_submissions * 100 if self.total_submissions else 0
+
+    @property
+    def fail_rate(self) -> float:
+        return 100 - self.pass_rate if self.total_submissions else 0
+
+
+def score_range_label(percentage: float) -> str:
+    """Return the ``SCORE_RANGES`` label a percentage falls into."""
+    for label, lower, upper in SCORE_RANGES:
+        if (lower is None or percentage >= lower) and (upper is None or percentage < upper):
+            return label
+    return SCORE_RANGES[-1][0]
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _range_condition(lower, upper):
+    percentage = Submission.percentage
+    if lower is None:
+        return percentage < upper
+    if upper is None:
+        return percentage >= lower
+    return (percentage >= lower) & (percentage < upper)
+
+
+def summarize_exam_scores(exam_id: int) -> ScoreSummary:
+    """Aggregate all submissions of an exam in a single query returning one row."""
+    row = db.session.execute(
+        select(
+            func.count(Submission.id),
+            func.coalesce(func.sum(Submission.total_score), 0),
+            func.coalesce(func.sum(Submission.total_score * Submission.total_score), 0),
+            func.coalesce(func.max(Submission.total_score), 0),
+            func.coalesce(func.min(Submission.total_score), 0),
+            _count_where(Submission.percentage >= PASS_THRESHOLD),
+            *(_count_where(_range_condition(low, high)) for _, low, high in SCORE_RANGES),
+        ).where(Submission.exam_id == exam_id)
+    ).one()
+
+    total_submissions, total_score, score_sq_sum, highest, lowest, passed, *buckets = row
+    return ScoreSummary(
+        total_submissions=total_submissions,
+        total_score=total_score,
+        score_sq_sum=score_sq_sum,
+        highest_score=highest,
+        lowest_score=lowest,
+        passed=passed,
+        score_ranges={label: count for (label, _, _), count in zip(SCORE_RANGES, buckets)},
+    )
@@ -0,0 +1,118 @@
+"""Issuing password reset tokens and sweeping away dead ones.
+
+Tokens are stored as SHA-256 digests behind a unique index, so a reset link
+is found with one index lookup. Every request for a link used to add a row;
+``issue_reset_token`` now keeps at most ``MAX_OUTSTANDING_PER_USER`` tokens
+per user, replacing the ones closest to expiry (and any used or expired
+ones), so the table cannot be grown by requesting links over and over.
+
+A background ``ResetTokenSweeper`` deletes expired and used tokens every
+``RESET_TOKEN_SWEEP_SECONDS``, in batches of ``SWEEP_BATCH`` rows, one
+transaction each; ``flask sweep-reset-tokens`` does the same by hand.
+"""
+
+import logging
+import secrets
+import threading
+from datetime import datetime
+
+from flask import Flask, current_app
+from sqlalchemy import delete, select
+
+from .. import db
+from ..models.password_reset_token import PasswordResetToken
+
+logger = logging.getLogger(__name__)
+
+MAX_OUTSTANDING_PER_USER = 3
+SWEEP_BATCH = 1000
+DEFAULT_SWEEP_SECONDS = 600
+
+
+def issue_reset_token(user_id: int) -> str:
+    """Add a reset token for a user and return it; the caller commits."""
+    replaced = (
+        select(PasswordResetToken.id)
+        .where(PasswordResetToken.user_id == user_id)
+        .order_by(PasswordResetToken.expires_at.desc())
+        .offset(MAX_OUTSTANDING_PER_USER - 1)
+    )
+    ids = db.session.scalars(replaced).all()
+    if ids:
+        db.session.execute(
+            delete(PasswordResetToken)
+            .where(PasswordResetToken.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+
+    token = secrets.token_urlsafe(32)
+    db.session.add(PasswordResetToken.create_for_user(user_id, token))
+    return token
+
+
+def sweep_reset_tokens(batch: int = SWEEP_BATCH) -> int:
+    """Delete every expired or used token; return how many were deleted."""
+    deleted = 0
+    while True:
+        ids = db.session.scalars(
+            select(PasswordResetToken.id)
+            .where(PasswordResetToken.expires_at < datetime.utcnow())
+            .limit(batch)
+        ).all()
+        if not ids:
+            return deleted
+        db.session.execute(
+            delete(PasswordResetToken)
+            .where(PasswordResetToken.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        deleted += len(ids)
+
+
+class ResetTokenSweeper:
+    """One background thread sweeping the reset tokens periodically."""
+
+    def __init__(self, app: Flask, interval: float) -> None:
+        self.app = app
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="reset-token-sweeper", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    sweep_reset_tokens()
+                except Exception:  # retried on the next sweep
+                    logger.exception("Sweeping password reset tokens failed")
+                finally:
+                    db.session.remove()
+
+
+_lock = threading.Lock()
+
+
+def get_reset_token_sweeper(app: Flask | None = None) -> ResetTokenSweeper | None:
+    """Return the app's sweeper, starting it on first use (``None`` when disabled)."""
+    app = app or current_app._get_current_object()
+    if not app.config.get("RESET_TOKEN_SWEEPER_ENABLED", True):
+        return None
+
+    state = app.extensions.setdefault("reset_token_sweeper", {})
+    if "sweeper" not in state:
+        with _lock:
+            if "sweeper" not in state:
+                sweeper = ResetTokenSweeper(
+                    app, app.config.get("RESET_TOKEN_SWEEP_SECONDS", DEFAULT_SWEEP_SECONDS)
+                )
+                sweeper.start()
+                state["sweeper"] = sweeper
+    return state["sweeper"]
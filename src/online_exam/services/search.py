@@ -0,0 +1,426 @@
+"""Full-text search over the exam and question catalog.
+
+Every exam (title, description, instructions) and every question (text and
+MCQ options) is a document in one search index, kept in sync from mapper
+events inside the writing transaction. The index is an FTS5 virtual table on
+SQLite and an InnoDB table with FULLTEXT indexes on MySQL; other databases
+fall back to LIKE matching. All three answer ``search_exams`` with exams
+ranked best first, matching each search word as a prefix.
+
+The exam list filters with ``exam_search_filter`` instead: a SQL condition
+(the title containing the term, or a full-text match) that the list query
+combines with its own filters and pagination, so no match is cut off early.
+
+Document ids encode their kind (``2 * exam.id`` / ``2 * question.id + 1``), so
+re-indexing or removing a document is a primary-key operation on both engines.
+"""
+
+import itertools
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import ColumnElement, Integer, Select, TextClause, event, or_, select, text
+from sqlalchemy.engine import Connection
+
+from .. import db
+from ..models.exam import Exam
+from ..models.question import Question
+
+SEARCH_TABLE = "search_index"
+DEFAULT_LIMIT = 50
+REINDEX_BATCH = 5000
+
+# Shorter words match whole words only: a one- or two-letter prefix matches
+# most of the index and costs a ranking pass over all of it
+MIN_PREFIX_LENGTH = 3
+
+# Title matches outweigh matches in descriptions and question text
+TITLE_WEIGHT = 10.0
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_TAG = re.compile(r"<[^>]+>")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    exam_id: int
+    score: float
+
+
+def search_words(term: str) -> list[str]:
+    """Split a user search into the words to match (punctuation is ignored)."""
+    return _WORD.findall(term.lower())
+
+
+def _plain(*parts: str | None) -> str:
+    return " ".join(_TAG.sub(" ", part) for part in parts if part)
+
+
+def exam_document(exam: Any) -> tuple[int, int, str, str]:
+    return 2 * exam.id, exam.id, exam.title or "", _plain(exam.description, exam.instructions)
+
+
+def question_document(question: Any) -> tuple[int, int, str, str]:
+    body = _plain(
+        question.question_text,
+        question.option_a,
+        question.option_b,
+        question.option_c,
+        question.option_d,
+    )
+    return 2 * question.id + 1, question.exam_id, "", body
+
+
+def _with_prefix(word: str, pattern: str) -> str:
+    return pattern if len(word) >= MIN_PREFIX_LENGTH else pattern.rstrip("*")
+
+
+def _params(document: tuple[int, int, str, str]) -> dict[str, Any]:
+    doc_id, exam_id, title, body = document
+    return {"doc_id": doc_id, "exam_id": exam_id, "title": title[:255], "body": body}
+
+
+class SearchBackend(ABC):
+    """Dialect-specific storage and querying of the search index."""
+
+    def create(self, connection: Connection) -> None:
+        pass
+
+    def drop(self, connection: Connection) -> None:
+        pass
+
+    def upsert(self, connection: Connection, document: tuple[int, int, str, str]) -> None:
+        pass
+
+    def insert_many(
+        self, connection: Connection, documents: list[tuple[int, int, str, str]]
+    ) -> None:
+        """Add documents known not to be indexed yet (used by ``reindex_all``)."""
+        for document in documents:
+            self.upsert(connection, document)
+
+    def delete(self, connection: Connection, doc_id: int) -> None:
+        pass
+
+    @abstractmethod
+    def search(self, connection: Connection, words: list[str], limit: int) -> list[SearchHit]:
+        """Return up to ``limit`` exams matching every word, best match first."""
+
+    @abstractmethod
+    def matching_exam_ids(self, words: list[str]) -> Select:
+        """A single-column query of the ids of the exams matching every word, unranked."""
+
+
+class Fts5Backend(SearchBackend):
+    def create(self, connection: Connection) -> None:
+        connection.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+            "USING fts5(exam_id UNINDEXED, title, body, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='3 4')"
+        )
+        connection.exec_driver_sql(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rank) "
+            f"VALUES ('rank', 'bm25(0.0, {TITLE_WEIGHT}, 1.0)')"
+        )
+
+    def drop(self, connection: Connection) -> None:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+    def upsert(self, connection: Connection, document: tuple[int, int, str, str]) -> None:
+        self.delete(connection, document[0])
+        self.insert_many(connection, [document])
+
+    def insert_many(
+        self, connection: Connection, documents: list[tuple[int, int, str, str]]
+    ) -> None:
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE}(rowid, exam_id, title, body) "
+                "VALUES (:doc_id, :exam_id, :title, :body)"
+            ),
+            [_params(document) for document in documents],
+        )
+
+    def delete(self, connection: Connection, doc_id: int) -> None:
+        connection.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :doc_id"), {"doc_id": doc_id}
+        )
+
+    @staticmethod
+    def _match(words: list[str]) -> str:
+        # Each word quoted (no FTS syntax from users) and matched as a prefix
+        return " ".join(_with_prefix(word, f'"{word}"*') for word in words)
+
+    def search(self, connection: Connection, words: list[str], limit: int) -> list[SearchHit]:
+        match = self._match(words)
+        # FTS5 serves ORDER BY rank LIMIT from a bounded heap; fetch spare rows
+        # since several documents can belong to the same exam
+        rows = connection.execute(
+            text(
+                f"SELECT exam_id, rank FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH :match ORDER BY rank LIMIT :rows"
+            ),
+            {"match": match, "rows": limit * 20},
+        )
+        return _best_per_exam(((exam_id, -rank) for exam_id, rank in rows), limit)
+
+    def matching_exam_ids(self, words: list[str]) -> Select:
+        return _exam_ids(
+            text(
+                f"SELECT exam_id FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match"
+            ).bindparams(match=self._match(words))
+        )
+
+
+class MySQLFulltextBackend(SearchBackend):
+    """InnoDB FULLTEXT; words shorter than ``innodb_ft_min_token_size`` are not indexed."""
+
+    def create(self, connection: Connection) -> None:
+        connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            "id BIGINT NOT NULL PRIMARY KEY, "
+            "exam_id INTEGER NOT NULL, "
+            "title VARCHAR(255) NOT NULL DEFAULT '', "
+            "body MEDIUMTEXT, "
+            f"FULLTEXT KEY ix_{SEARCH_TABLE}_title (title), "
+            f"FULLTEXT KEY ix_{SEARCH_TABLE}_title_body (title, body)"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+        )
+
+    def drop(self, connection: Connection) -> None:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+    def upsert(self, connection: Connection, document: tuple[int, int, str, str]) -> None:
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (id, exam_id, title, body) "
+                "VALUES (:doc_id, :exam_id, :title, :body) "
+                "ON DUPLICATE KEY UPDATE exam_id = VALUES(exam_id), "
+                "title = VALUES(title), body = VALUES(body)"
+            ),
+            _params(document),
+        )
+
+    def insert_many(
+        self, connection: Connection, documents: list[tuple[int, int, str, str]]
+    ) -> None:
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (id, exam_id, title, body) "
+                "VALUES (:doc_id, :exam_id, :title, :body)"
+            ),
+            [_params(document) for document in documents],
+        )
+
+    def delete(self, connection: Connection, doc_id: int) -> None:
+        connection.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE id = :doc_id"), {"doc_id": doc_id}
+        )
+
+    @staticmethod
+    def _against(words: list[str]) -> str:
+        return " ".join(_with_prefix(word, f"+{word}*") for word in words)
+
+    def search(self, connection: Connection, words: list[str], limit: int) -> list[SearchHit]:
+        against = self._against(words)
+        rows = connection.execute(
+            text(
+                "SELECT exam_id, MAX("
+                f"{TITLE_WEIGHT} * MATCH(title) AGAINST (:against IN BOOLEAN MODE) + "
+                "MATCH(title, body) AGAINST (:against IN BOOLEAN MODE)) AS score "
+                f"FROM {SEARCH_TABLE} "
+                "WHERE MATCH(title, body) AGAINST (:against IN BOOLEAN MODE) "
+                "GROUP BY exam_id ORDER BY score DESC LIMIT :limit"
+            ),
+            {"against": against, "limit": limit},
+        )
+        return [SearchHit(exam_id, float(score)) for exam_id, score in rows]
+
+    def matching_exam_ids(self, words: list[str]) -> Select:
+        return _exam_ids(
+            text(
+                f"SELECT exam_id FROM {SEARCH_TABLE} "
+                "WHERE MATCH(title, body) AGAINST (:against IN BOOLEAN MODE)"
+            ).bindparams(against=self._against(words))
+        )
+
+
+class LikeBackend(SearchBackend):
+    """Unindexed fallback for databases without a full-text engine here."""
+
+    def insert_many(
+        self, connection: Connection, documents: list[tuple[int, int, str, str]]
+    ) -> None:
+        pass
+
+    @staticmethod
+    def _queries(words: list[str]) -> tuple[Select, Select]:
+        def matches(*columns):
+            return [or_(*(column.ilike(f"%{word}%") for column in columns)) for word in words]
+
+        exams = select(Exam.id).where(*matches(Exam.title, Exam.description, Exam.instructions))
+        questions = select(Question.exam_id).where(
+            *matches(
+                Question.question_text,
+                Question.option_a,
+                Question.option_b,
+                Question.option_c,
+                Question.option_d,
+            )
+        )
+        return exams, questions
+
+    def search(self, connection: Connection, words: list[str], limit: int) -> list[SearchHit]:
+        exams, questions = self._queries(words)
+        exam_rows = connection.execute(exams)
+        question_rows = connection.execute(questions)
+        scored = [(exam_id, TITLE_WEIGHT) for (exam_id,) in exam_rows]
+        scored += [(exam_id, 1.0) for (exam_id,) in question_rows]
+        scored.sort(key=lambda hit: -hit[1])
+        return _best_per_exam(scored, limit)
+
+    def matching_exam_ids(self, words: list[str]) -> Select:
+        exams, questions = self._queries(words)
+        return exams.union(questions)
+
+
+def _exam_ids(query: TextClause) -> Select:
+    """Wrap a raw ``SELECT exam_id`` so it can be used as an ``IN`` subquery."""
+    return select(query.columns(exam_id=Integer).subquery().c.exam_id)
+
+
+def _best_per_exam(scored, limit: int) -> list[SearchHit]:
+    """Keep the first (best) score of each exam from rows already ranked best first."""
+    hits: dict[int, SearchHit] = {}
+    for exam_id, score in scored:
+        if exam_id not in hits:
+            hits[exam_id] = SearchHit(exam_id, score)
+            if len(hits) == limit:
+                break
+    return list(hits.values())
+
+
+_BACKENDS: dict[str, SearchBackend] = {
+    "sqlite": Fts5Backend(),
+    "mysql": MySQLFulltextBackend(),
+}
+_FALLBACK = LikeBackend()
+
+
+def backend_for(connection: Connection) -> SearchBackend:
+    return _BACKENDS.get(connection.dialect.name, _FALLBACK)
+
+
+def search_exams(term: str, limit: int = DEFAULT_LIMIT) -> list[SearchHit]:
+    """Return the exams matching every word of ``term``, best match first.
+
+    ``limit`` is clamped to 1..``DEFAULT_LIMIT``: it may come from a query string,
+    and backends fetch candidate rows in proportion to it.
+    """
+    words = search_words(term)
+    if not words:
+        return []
+    limit = max(1, min(limit, DEFAULT_LIMIT))
+    connection = db.session.connection()
+    return backend_for(connection).search(connection, words, limit)
+
+
+def exam_search_filter(term: str) -> ColumnElement[bool]:
+    """Condition on ``Exam`` for the exam list: title contains ``term``, or a full-text match.
+
+    Terms shorter than ``MIN_PREFIX_LENGTH`` only use the title match.
+    """
+    condition = Exam.title.ilike(f"%{term}%")
+    words = search_words(term)
+    if not words or len(term) < MIN_PREFIX_LENGTH:
+        return condition
+    matching = backend_for(db.session.connection()).matching_exam_ids(words)
+    return or_(condition, Exam.id.in_(matching))
+
+
+def _batches(connection: Connection, columns: list[Any], to_document) -> Iterator[list[Any]]:
+    """Read a table in primary-key order, one fully fetched batch at a time.
+
+    Each batch is fetched before it is written back, so the connection never
+    has an open streaming cursor while inserting (MySQL does not allow that).
+    """
+    id_column = columns[0]
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(*columns).where(id_column > last_id).order_by(id_column).limit(REINDEX_BATCH)
+        ).all()
+        if not rows:
+            return
+        yield [to_document(row) for row in rows]
+        last_id = rows[-1].id
+
+
+def reindex_all(connection: Connection) -> int:
+    """Rebuild the whole index from the exam and question tables."""
+    backend = backend_for(connection)
+    backend.drop(connection)
+    backend.create(connection)
+
+    exam_batches = _batches(
+        connection, [Exam.id, Exam.title, Exam.description, Exam.instructions], exam_document
+    )
+    question_batches = _batches(
+        connection,
+        [
+            Question.id,
+            Question.exam_id,
+            Question.question_text,
+            Question.option_a,
+            Question.option_b,
+            Question.option_c,
+            Question.option_d,
+        ],
+        question_document,
+    )
+
+    count = 0
+    for batch in itertools.chain(exam_batches, question_batches):
+        backend.insert_many(connection, batch)
+        count += len(batch)
+    return count
+
+
+def include_in_migrations(name: str | None, type_: str, parent_names: Any) -> bool:
+    """Alembic ``include_name`` hook: the search index is managed here, not by autogenerate."""
+    return not (type_ == "table" and name is not None and name.startswith(SEARCH_TABLE))
+
+
+@event.listens_for(db.metadata, "after_create")
+def _create_index(target, connection: Connection, **kw) -> None:
+    backend_for(connection).create(connection)
+
+
+@event.listens_for(db.metadata, "before_drop")
+def _drop_index(target, connection: Connection, **kw) -> None:
+    backend_for(connection).drop(connection)
+
+
+@event.listens_for(Exam, "after_insert")
+@event.listens_for(Exam, "after_update")
+def _index_exam(mapper, connection: Connection, target: Exam) -> None:
+    backend_for(connection).upsert(connection, exam_document(target))
+
+
+@event.listens_for(Question, "after_insert")
+@event.listens_for(Question, "after_update")
+def _index_question(mapper, connection: Connection, target: Question) -> None:
+    backend_for(connection).upsert(connection, question_document(target))
+
+
+@event.listens_for(Exam, "after_delete")
+def _unindex_exam(mapper, connection: Connection, target: Exam) -> None:
+    backend_for(connection).delete(connection, 2 * target.id)
+
+
+@event.listens_for(Question, "after_delete")
+def _unindex_question(mapper, connection: Connection, target: Question) -> None:
+    backend_for(connection).delete(connection, 2 * target.id + 1)
@@ -0,0 +1,156 @@
+"""Bulk ingest of student exam submissions.
+
+The whole answer form is graded in memory first. The ``Submission`` row is then
+written with one INSERT and all of its ``Answer`` rows with a single multi-row
+INSERT, instead of one ORM object (and flush) per question.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import insert
+
+from .. import db
+from ..models.submission import Answer, Submission
+from .answer_key import AnswerKey
+from .exam_stats import record_submission
+
+
+@dataclass
+class GradedForm:
+    """Result of grading an answer form, ready to be written in bulk."""
+
+    answer_rows: list[dict[str, Any]] = field(default_factory=list)
+    total_score: int = 0
+    max_score: int = 0
+    has_written_questions: bool = False
+
+    @property
+    def percentage(self) -> float:
+        """Same rounding as ``Submission.calculate_percentage``."""
+        if self.max_score > 0:
+            return round((self.total_score / self.max_score) * 100, 2)
+        return 0.0
+
+
+def grade_form(key: AnswerKey, form: Mapping[str, str]) -> GradedForm:
+    """Grade a submitted form against an exam's answer key without touching the DB.
+
+    MCQ answers are auto-graded; unanswered MCQs produce no row. Written answers
+    are always stored with zero points so an instructor can grade them later.
+    """
+    graded = GradedForm(max_score=key.max_score)
+
+    for question_id, question_type, points, correct_option in key:
+        field_name = f"question_{question_id}"
+
+        if question_type == "mcq":
+            selected_option = (form.get(field_name) or "").strip().upper()
+            if not selected_option:
+                continue
+
+            is_correct = selected_option == correct_option
+            points_earned = points if is_correct else 0
+            graded.total_score += points_earned
+            graded.answer_rows.append(
+                {
+                    "question_id": question_id,
+                    "answer_text": None,
+                    "selected_option": selected_option,
+                    "is_correct": is_correct,
+                    "points_earned": points_earned,
+                }
+            )
+        else:
+            graded.has_written_questions = True
+            graded.answer_rows.append(
+                {
+                    "question_id": question_id,
+                    "answer_text": (form.get(field_name) or "").strip(),
+                    "selected_option": None,
+                    "is_correct": False,
+                    "points_earned": 0,
+                }
+            )
+
+    return graded
+
+
+def ingest_submission(
+    exam_id: int,
+    student_name: str,
+    graded: GradedForm,
+    status: str,
+    graded_at: datetime | None = None,
+    submitted_at: datetime | None = None,
+    queue_ticket: str | None = None,
+    student_id: int | None = None,
+) -> int:
+    """Write a graded submission and all of its answers; return the submission id.
+
+    The caller owns the transaction and is expected to commit.
+    """
+    result = db.session.execute(
+        insert(Submission).values(
+            exam_id=exam_id,
+            student_name=student_name,
+            student_id=student_id,
+            total_score=graded.total_score,
+            max_score=graded.max_score,
+            percentage=graded.percentage,
+            status=status,
+            graded_at=graded_at,
+            submitted_at=submitted_at or datetime.utcnow(),
+            queue_ticket=queue_ticket,
+        )
+    )
+    submission_id = result.inserted_primary_key[0]
+
+    if graded.answer_rows:
+        now = datetime.utcnow()
+        db.session.execute(
+            insert(Answer).values(
+                [
+                    {**row, "submission_id": submission_id, "created_at": now, "updated_at": now}
+                    for row in graded.answer_rows
+                ]
+            )
+        )
+
+    return submission_id
+
+
+def store_submission(
+    key: AnswerKey,
+    student_name: str,
+    form: Mapping[str, str],
+    submitted_at: datetime | None = None,
+    queue_ticket: str | None = None,
+    student_id: int | None = None,
+) -> tuple[int, GradedForm]:
+    """Grade and write a student submission; return its id and the grading.
+
+    Exams with written questions stay ``pending`` until an instructor grades
+    them; MCQ-only exams are final (``graded``) straight away. The exam's
+    running statistics are updated too. The caller commits.
+    """
+    graded = grade_form(key, form)
+    if graded.has_written_questions:
+        status, graded_at = "pending", None
+    else:
+        status, graded_at = "graded", datetime.utcnow()
+
+    submission_id = ingest_submission(
+        key.exam_id,
+        student_name,
+        graded,
+        status=status,
+        graded_at=graded_at,
+        submitted_at=submitted_at,
+        queue_ticket=queue_ticket,
+        student_id=student_id,
+    )
+    record_submission(key.exam_id, graded.total_score, graded.percentage)
+    return submission_id, graded
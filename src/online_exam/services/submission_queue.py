@@ -0,0 +1,349 @@
+"""Durable local queue for exam submissions.
+
+During the last minute of an exam every student submits at once. The queued
+submit path validates the form against the cached answer key, appends it to a
+local SQLite database in WAL mode (one small fsync'd INSERT) and answers 202
+straight away; worker threads then grade and store the queued forms with the
+same rules as the regular submit route.
+
+The queue gives at-least-once delivery: an entry claimed by a worker that dies
+is handed out again after ``STALE_AFTER_SECONDS`` (the workers look for such
+entries every ``REQUEUE_EVERY_SECONDS``). Each stored ``Submission``
+carries its queue ticket, so a replayed entry is recognised instead of stored
+twice.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from flask import Flask, current_app
+from sqlalchemy import select
+
+from .. import db
+from ..models.exam import Exam
+from ..models.submission import Submission
+from .answer_key import AnswerKey, get_answer_key
+from .submission_ingest import store_submission
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+CLAIM_BATCH = 50
+POLL_SECONDS = 0.05
+STALE_AFTER_SECONDS = 300
+REQUEUE_EVERY_SECONDS = 60
+MAX_ATTEMPTS = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queued_submissions (
+    id INTEGER PRIMARY KEY,
+    ticket TEXT NOT NULL UNIQUE,
+    exam_id INTEGER NOT NULL,
+    student_name TEXT NOT NULL,
+    student_id INTEGER,
+    form TEXT NOT NULL,
+    submitted_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    submission_id INTEGER,
+    error TEXT,
+    claimed_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_queued_submissions_status_id
+    ON queued_submissions (status, id);
+"""
+
+
+class SubmissionRejected(ValueError):
+    """The submitted form does not fit the exam it was sent for."""
+
+
+@dataclass(frozen=True)
+class QueuedSubmission:
+    id: int
+    ticket: str
+    exam_id: int
+    student_name: str
+    form: dict[str, str]
+    submitted_at: datetime
+    attempts: int
+    student_id: int | None = None
+
+
+@dataclass(frozen=True)
+class TicketStatus:
+    ticket: str
+    exam_id: int
+    status: str
+    submission_id: int | None
+    error: str | None
+
+
+class SubmissionQueue:
+    """A FIFO of submissions in a SQLite WAL file, safe to share between threads."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = self._connection()
+        connection.executescript(_SCHEMA)
+        # Queue files written before submissions recorded the student's account
+        columns = {
+            row["name"] for row in connection.execute("PRAGMA table_info(queued_submissions)")
+        }
+        if "student_id" not in columns:
+            connection.execute("ALTER TABLE queued_submissions ADD COLUMN student_id INTEGER")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Every accepted submission is on disk before the 202 goes out
+            connection.execute("PRAGMA synchronous=FULL")
+            self._local.connection = connection
+        return connection
+
+    def enqueue(
+        self,
+        exam_id: int,
+        student_name: str,
+        form: Mapping[str, str],
+        student_id: int | None = None,
+    ) -> str:
+        ticket = str(uuid.uuid4())
+        self._connection().execute(
+            "INSERT INTO queued_submissions "
+            "(ticket, exam_id, student_name, student_id, form, submitted_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                ticket,
+                exam_id,
+                student_name,
+                student_id,
+                json.dumps(dict(form)),
+                datetime.utcnow().isoformat(),
+            ),
+        )
+        return ticket
+
+    def claim(self, limit: int = CLAIM_BATCH) -> list[QueuedSubmission]:
+        """Mark up to ``limit`` of the oldest waiting entries as in progress and return them."""
+        now = time.time()
+        rows = self._connection().execute(
+            "UPDATE queued_submissions SET status = 'processing', claimed_at = ?, "
+            "attempts = attempts + 1 "
+            "WHERE id IN (SELECT id FROM queued_submissions WHERE status = 'queued' "
+            "ORDER BY id LIMIT ?) "
+            "RETURNING id, ticket, exam_id, student_name, student_id, form, submitted_at, "
+            "attempts",
+            (now, limit),
+        )
+        claimed = [
+            QueuedSubmission(
+                id=row["id"],
+                ticket=row["ticket"],
+                exam_id=row["exam_id"],
+                student_name=row["student_name"],
+                form=json.loads(row["form"]),
+                submitted_at=datetime.fromisoformat(row["submitted_at"]),
+                attempts=row["attempts"],
+                student_id=row["student_id"],
+            )
+            for row in rows.fetchall()
+        ]
+        return sorted(claimed, key=lambda item: item.id)
+
+    def complete(self, item: QueuedSubmission, submission_id: int) -> None:
+        self._connection().execute(
+            "UPDATE queued_submissions SET status = 'done', submission_id = ?, error = NULL "
+            "WHERE id = ?",
+            (submission_id, item.id),
+        )
+
+    def fail(self, item: QueuedSubmission, error: str) -> None:
+        """Put an entry back in line, or park it as failed after ``MAX_ATTEMPTS``."""
+        status = "failed" if item.attempts >= MAX_ATTEMPTS else "queued"
+        self._connection().execute(
+            "UPDATE queued_submissions SET status = ?, error = ? WHERE id = ?",
+            (status, error, item.id),
+        )
+
+    def requeue_stale(self, older_than: float = STALE_AFTER_SECONDS) -> int:
+        """Hand out again entries claimed by a worker that never finished them."""
+        cursor = self._connection().execute(
+            "UPDATE queued_submissions SET status = 'queued' "
+            "WHERE status = 'processing' AND claimed_at < ?",
+            (time.time() - older_than,),
+        )
+        return cursor.rowcount
+
+    def status(self, ticket: str) -> TicketStatus | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT ticket, exam_id, status, submission_id, error "
+                "FROM queued_submissions WHERE ticket = ?",
+                (ticket,),
+            )
+            .fetchone()
+        )
+        return TicketStatus(**dict(row)) if row else None
+
+    def pending_count(self) -> int:
+        return (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM queued_submissions WHERE status IN ('queued', 'processing')"
+            )
+            .fetchone()[0]
+        )
+
+
+def validate_form(key: AnswerKey, form: Mapping[str, str]) -> None:
+    """Reject answers to questions outside the exam and MCQ choices other than A-D."""
+    types = dict(zip(key.question_ids, key.question_types))
+    for field_name, value in form.items():
+        if not field_name.startswith("question_"):
+            continue
+        try:
+            question_id = int(field_name.removeprefix("question_"))
+        except ValueError:
+            raise SubmissionRejected(f"Unknown field {field_name}.") from None
+        if question_id not in types:
+            raise SubmissionRejected(f"Question {question_id} is not part of this exam.")
+        if types[question_id] == "mcq" and value.strip().upper() not in ("", "A", "B", "C", "D"):
+            raise SubmissionRejected(f"Invalid choice for question {question_id}.")
+
+
+def store_queued(item: QueuedSubmission) -> int:
+    """Grade and write one queued submission; the caller commits."""
+    existing = db.session.execute(
+        select(Submission.id).where(Submission.queue_ticket == item.ticket)
+    ).scalar()
+    if existing is not None:
+        return existing
+
+    exam = db.session.get(Exam, item.exam_id)
+    if exam is None:
+        raise LookupError(f"Exam {item.exam_id} no longer exists.")
+
+    submission_id, _ = store_submission(
+        get_answer_key(exam),
+        item.student_name,
+        item.form,
+        submitted_at=item.submitted_at,
+        queue_ticket=item.ticket,
+        student_id=item.student_id,
+    )
+    return submission_id
+
+
+def drain_once(queue: SubmissionQueue, limit: int = CLAIM_BATCH) -> int:
+    """Store one claimed batch inside the current app context; return how many were taken."""
+    items = queue.claim(limit)
+    for item in items:
+        try:
+            submission_id = store_queued(item)
+            db.session.commit()
+        except Exception as error:  # every failure is retried or parked
+            db.session.rollback()
+            logger.exception("Queued submission %s failed", item.ticket)
+            queue.fail(item, str(error))
+        else:
+            queue.complete(item, submission_id)
+    return len(items)
+
+
+def drain(queue: SubmissionQueue) -> int:
+    """Store everything currently waiting; return the number of entries processed."""
+    total = 0
+    while count := drain_once(queue):
+        total += count
+    return total
+
+
+class SubmissionWorkers:
+    """Background threads draining the queue, each in its own app context."""
+
+    def __init__(self, app: Flask, queue: SubmissionQueue, count: int) -> None:
+        self.app = app
+        self.queue = queue
+        self.count = count
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._requeue_lock = threading.Lock()
+        self._next_requeue = 0.0
+
+    def start(self) -> None:
+        for number in range(self.count):
+            thread = threading.Thread(
+                target=self._run, name=f"submission-worker-{number}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _requeue_stale_if_due(self) -> None:
+        """Let one worker at a time hand out abandoned entries again, once per interval."""
+        with self._requeue_lock:
+            if time.monotonic() < self._next_requeue:
+                return
+            self._next_requeue = time.monotonic() + REQUEUE_EVERY_SECONDS
+        self.queue.requeue_stale()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            taken = 0
+            with self.app.app_context():
+                try:
+                    self._requeue_stale_if_due()
+                    taken = drain_once(self.queue)
+                except Exception:
+                    # A worker outlives any one failure; the entry is retried later
+                    logger.exception("Draining the submission queue failed")
+                finally:
+                    db.session.remove()
+            if not taken:
+                self._stop.wait(POLL_SECONDS)
+
+
+_lock = threading.Lock()
+
+
+def _queue_path(app: Flask) -> str:
+    return app.config.get("SUBMISSION_QUEUE_PATH") or os.path.join(
+        app.instance_path, "submission_queue.db"
+    )
+
+
+def get_submission_queue(app: Flask | None = None) -> SubmissionQueue:
+    """Return the app's queue, starting its workers on first use."""
+    app = app or current_app._get_current_object()
+    state: dict[str, Any] = app.extensions.setdefault("submission_queue", {})
+    if "queue" not in state:
+        with _lock:
+            if "queue" not in state:
+                queue = SubmissionQueue(_queue_path(app))
+                count = app.config.get("SUBMISSION_QUEUE_WORKERS", DEFAULT_WORKERS)
+                if count > 0:
+                    workers = SubmissionWorkers(app, queue, count)
+                    workers.start()
+                    state["workers"] = workers
+                state["queue"] = queue
+    return state["queue"]
@@ -0,0 +1,104 @@
+"""Process-level cache of signed-in user identities.
+
+Every request used to look the current user up by primary key. Instead, a small
+read-only snapshot of the user is kept per process for ``USER_CACHE_TTL_SECONDS``
+and evicted as soon as the ``User`` row is updated or deleted through the ORM
+(role change, 2FA toggle, password reset, ...).
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from .. import db
+from ..models.user import User
+
+DEFAULT_TTL_SECONDS = 60
+
+_PENDING_KEY = "user_cache_evict"
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Read-only view of the ``User`` columns templates and guards need."""
+
+    id: int
+    username: str
+    name: str
+    email: str
+    role: str
+    two_factor_enabled: bool
+    totp_enabled: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            name=user.name,
+            email=user.email,
+            role=user.role,
+            two_factor_enabled=bool(user.two_factor_enabled),
+            totp_enabled=bool(user.totp_secret),
+        )
+
+
+_cache: dict[int, tuple[float, CachedUser]] = {}
+_lock = threading.Lock()
+
+
+def _ttl() -> float:
+    return current_app.config.get("USER_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+
+
+def get_cached_user(user_id: int) -> CachedUser | None:
+    """Return the identity of ``user_id``, querying only on a miss or expiry."""
+    now = time.monotonic()
+    entry = _cache.get(user_id)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    user = db.session.get(User, user_id)
+    if user is None:
+        invalidate_user(user_id)
+        return None
+
+    cached = CachedUser.from_user(user)
+    ttl = _ttl()
+    if ttl > 0:
+        with _lock:
+            _cache[user_id] = (now + ttl, cached)
+    return cached
+
+
+def invalidate_user(user_id: int) -> None:
+    with _lock:
+        _cache.pop(user_id, None)
+
+
+def clear_user_cache() -> None:
+    with _lock:
+        _cache.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _evict_changed_user(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
+
+    # Evict again once the change is visible to other requests, so a concurrent
+    # reader cannot re-cache the pre-commit row.
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _evict_after_commit(session: Session, *args) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_user(user_id)
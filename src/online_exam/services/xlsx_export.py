@@ -0,0 +1,178 @@
+"""Constant-memory XLSX export of exam results.
+
+The workbook is written with openpyxl's write-only mode: rows are serialized to
+a temporary file as they are appended, every cell references one of a handful
+of shared named styles, and submissions are pulled from a server-side cursor
+with ``yield_per``. The finished temporary file is then streamed back in
+chunks, so peak memory does not grow with the number of submissions.
+"""
+
+import tempfile
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import IO, Any
+
+from sqlalchemy import select
+
+from .. import db
+from ..models.submission import Submission
+from .reporting import PASS_THRESHOLD
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+ROW_BATCH = 1000
+
+HEADERS = ["#", "Student Name", "Student Email", "Score", "Percentage", "Status", "Submitted"]
+COLUMN_WIDTHS = {"A": 8, "B": 25, "C": 30, "D": 15, "E": 15, "F": 15, "G": 25}
+HEADER_ROW = 7
+
+
+def _named_styles() -> list[Any]:
+    from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+
+    def fill(color: str) -> PatternFill:
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+    centered = Alignment(horizontal="center", vertical="center")
+    return [
+        NamedStyle(
+            name="export_title",
+            font=Font(size=16, bold=True, color="FFFFFF"),
+            fill=fill("4472C4"),
+            alignment=centered,
+        ),
+        NamedStyle(name="export_label", font=Font(bold=True)),
+        NamedStyle(
+            name="export_header",
+            font=Font(bold=True, color="FFFFFF"),
+            fill=fill("70AD47"),
+            alignment=centered,
+        ),
+        NamedStyle(
+            name="export_pct_high", font=Font(color="006100", bold=True), fill=fill("C6EFCE")
+        ),
+        NamedStyle(name="export_pct_mid", font=Font(color="9C6500"), fill=fill("FFEB9C")),
+        NamedStyle(
+            name="export_pct_low", font=Font(color="9C0006", bold=True), fill=fill("FFC7CE")
+        ),
+        NamedStyle(
+            name="export_pass",
+            font=Font(color="006100", bold=True),
+            fill=fill("C6EFCE"),
+            alignment=Alignment(horizontal="center"),
+        ),
+        NamedStyle(
+            name="export_fail",
+            font=Font(color="9C0006", bold=True),
+            fill=fill("FFC7CE"),
+            alignment=Alignment(horizontal="center"),
+        ),
+    ]
+
+
+def iter_submission_rows(exam_id: int) -> Iterator[Any]:
+    """Yield the export columns of every submission, most recent first."""
+    result = db.session.execute(
+        select(
+            Submission.student_name,
+            Submission.total_score,
+            Submission.percentage,
+            Submission.submitted_at,
+        )
+        .where(Submission.exam_id == exam_id)
+        .order_by(Submission.submitted_at.desc())
+        .execution_options(yield_per=ROW_BATCH)
+    )
+    yield from result
+
+
+def write_exam_results(exam: Any, stats: Any, rows: Iterable[Any], output: IO[bytes]) -> None:
+    """Write the results workbook for ``exam`` into ``output``."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    wb = Workbook(write_only=True)
+    for style in _named_styles():
+        wb.add_named_style(style)
+
+    ws = wb.create_sheet("Exam Results")
+    for column, width in COLUMN_WIDTHS.items():
+        ws.column_dimensions[column].width = width
+    ws.row_dimensions[1].height = 30
+    ws.merged_cells.add("A1:G1")
+
+    def cell(value: Any, style: str | None = None) -> Any:
+        written = WriteOnlyCell(ws, value=value)
+        if style:
+            written.style = style
+        return written
+
+    def label(text: str) -> Any:
+        return cell(text, "export_label")
+
+    ws.append([cell(exam.title, "export_title")])
+
+    has_stats = stats.submission_count > 0
+    ws.append(
+        [label("Description:"), exam.description or "N/A", None]
+        + (
+            [label("Average Score:"), f"{stats.avg_score:.2f}"]
+            + [label("Std. Deviation:"), f"{stats.std_dev:.2f}"]
+            if has_stats
+            else []
+        )
+    )
+    ws.append(
+        [label("Total Submissions:"), stats.submission_count, None]
+        + (
+            [label("Highest Score:"), stats.max_score]
+            + [label("Pass Rate:"), f"{stats.pass_rate:.1f}%"]
+            if has_stats
+            else []
+        )
+    )
+    ws.append(
+        [label("Generated:"), datetime.now().strftime("%Y-%m-%d %H:%M:%S"), None]
+        + ([label("Lowest Score:"), stats.min_score] if has_stats else [])
+    )
+    for _ in range(HEADER_ROW - 5):
+        ws.append([])
+
+    ws.append([cell(header, "export_header") for header in HEADERS])
+
+    for idx, row in enumerate(rows, start=1):
+        percentage = row.percentage or 0.0
+        if percentage >= 80:
+            pct_style = "export_pct_high"
+        elif percentage >= PASS_THRESHOLD:
+            pct_style = "export_pct_mid"
+        else:
+            pct_style = "export_pct_low"
+        passed = percentage >= PASS_THRESHOLD
+
+        ws.append(
+            [
+                idx,
+                row.student_name,
+                row.student_name,  # Using name as email
+                row.total_score,
+                cell(f"{percentage:.2f}%", pct_style),
+                cell("PASS" if passed else "FAIL", "export_pass" if passed else "export_fail"),
+                row.submitted_at.strftime("%Y-%m-%d %H:%M:%S") if row.submitted_at else "N/A",
+            ]
+        )
+
+    wb.save(output)
+
+
+def build_exam_results_xlsx(exam: Any, stats: Any) -> IO[bytes]:
+    """Return an anonymous temporary file holding the finished workbook."""
+    # Not a with block: the open file is returned, and send_file closes it
+    # once the response has been streamed
+    output = tempfile.TemporaryFile()  # noqa: SIM115
+    try:
+        write_exam_results(exam, stats, iter_submission_rows(exam.id), output)
+    except Exception:
+        output.close()
+        raise
+    output.seek(0)
+    return output
@@ -1,7 +1,21 @@
 from functools import wraps
 from typing import Callable
 
-from flask import redirect, session, url_for
+from flask import g, redirect, session, url_for
+
+from ..services.user_cache import CachedUser, get_cached_user
+
+_UNSET = object()
+
+
+def get_current_user() -> CachedUser | None:
+    """Return the signed-in user, loading it at most once per request."""
+    cached = g.get("_current_user", _UNSET)
+    if cached is _UNSET:
+        user_id = session.get("user_id")
+        cached = get_cached_user(user_id) if user_id else None
+        g._current_user = cached
+    return cached
 
 
 def login_required(view_func: Callable):
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from typing import Any
 
 
@@ -18,3 +19,19 @@ def send_password_reset_email(user: Any, token_url: str) -> None:
 def send_otp_sms(user: Any, otp_code: str) -> None:
     """Stub for sending OTP via SMS (no-op placeholder)."""
     print(f"[SMS STUB] Would send OTP {otp_code} to {getattr(user, 'phone', '<unknown>')}")
+
+
+def send_grades_published_email(
+    user: Any, exam_title: str, total_score: int, max_score: int, percentage: float
+) -> None:
+    """Stub for telling a student that their exam grade is available."""
+    print(
+        f"Sending grades email to {getattr(user, 'email', '<unknown>')}:"
+        f" {exam_title} {total_score}/{max_score} ({percentage}%)"
+    )
+
+
+def send_grades_published_emails(messages: Iterable[tuple[Any, str, int, int, float]]) -> None:
+    """Send a batch of grade notifications (one connection per batch once wired to SMTP)."""
+    for message in messages:
+        send_grades_published_email(*message)
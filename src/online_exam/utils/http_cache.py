@@ -0,0 +1,107 @@
+"""Conditional GET for read-mostly pages and cache headers for static files.
+
+``conditional_get`` wraps a view with a cheap *version* function that reads
+only ids and ``updated_at`` columns. Its result, plus who is signed in (the
+navigation differs per user), becomes the page's ETag, and its latest
+timestamp the ``Last-Modified`` date: a request whose ``If-None-Match`` still
+matches is answered 304 before the view queries or renders anything. Pages
+are ``private, no-cache`` so browsers revalidate on every visit but keep the
+body.
+
+Static files get long-lived ``Cache-Control``: ``url_for("static", ...)`` adds
+the file's mtime as ``v``, so such URLs change whenever the file does.
+"""
+
+import hashlib
+import os
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from functools import wraps
+from typing import Any
+
+from flask import Flask, current_app, make_response, request, session
+
+STATIC_VERSIONED_MAX_AGE = 365 * 24 * 3600
+DEFAULT_STATIC_MAX_AGE = 3600
+
+
+def page_etag(parts: Iterable[Any]) -> str:
+    """ETag for a page whose content depends on ``parts`` and the signed-in user."""
+    key = [session.get("user_id"), session.get("user_role"), *parts]
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+def conditional_get(version: Callable[..., Iterable[Any] | None]):
+    """Answer unchanged pages with 304 Not Modified.
+
+    ``version`` receives the view's arguments and returns what the page depends
+    on (ids, ``updated_at`` values, counts), or ``None`` to serve the page
+    without caching, e.g. when the row does not exist.
+    """
+
+    def decorator(view_func: Callable):
+        @wraps(view_func)
+        def wrapped_view(*args, **kwargs):
+            # A pending flash message is part of the page, and must be shown
+            if request.method not in ("GET", "HEAD") or session.get("_flashes"):
+                return view_func(*args, **kwargs)
+
+            parts = version(*args, **kwargs)
+            if parts is None:
+                return view_func(*args, **kwargs)
+            parts = tuple(parts)
+
+            etag = page_etag(parts)
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view_func(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            stamps = [part for part in parts if isinstance(part, datetime)]
+            if stamps:
+                response.last_modified = max(stamps)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapped_view
+
+    return decorator
+
+
+def init_static_caching(app: Flask) -> None:
+    """Version static URLs by mtime and send matching ``Cache-Control`` headers."""
+    versions: dict[str, int] = {}
+
+    def static_version(filename: str) -> int | None:
+        if filename not in versions:
+            path = os.path.join(app.static_folder or "", filename)
+            try:
+                versions[filename] = int(os.stat(path).st_mtime)
+            except OSError:
+                return None
+        return versions[filename]
+
+    @app.url_defaults
+    def add_static_version(endpoint: str, values: dict[str, Any]) -> None:
+        if endpoint == "static" and "filename" in values and "v" not in values:
+            file_version = None if app.debug else static_version(values["filename"])
+            if file_version is not None:
+                values["v"] = file_version
+
+    @app.after_request
+    def static_cache_control(response):
+        if request.endpoint != "static" or response.status_code not in (200, 304):
+            return response
+        response.cache_control.public = True
+        if request.args.get("v"):
+            response.cache_control.max_age = STATIC_VERSIONED_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.max_age = app.config.get(
+                "STATIC_MAX_AGE_SECONDS", DEFAULT_STATIC_MAX_AGE
+            )
+        return response
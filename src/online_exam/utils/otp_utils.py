@@ -1,10 +1,38 @@
+"""One-time codes for two-factor login.
+
+Emailed codes are stored as ``hmac-sha256$<salt>$<digest>``: an HMAC keyed
+with a key derived from ``SECRET_KEY`` over a random salt and the code. A
+six-digit code that expires in five minutes gains nothing from a slow password
+KDF (a million guesses would be needed either way, and the database holding
+the digest does not hold the key), and an HMAC costs microseconds. Guessing is
+bounded by ``OTP_MAX_ATTEMPTS`` wrong codes per issued code.
+
+Users with an authenticator app instead use TOTP (RFC 6238): the code is
+derived from a shared secret and the current time. A login records the time
+step of the accepted code, and codes from that step or earlier are refused, so
+each code works once.
+"""
+
+import base64
+import hashlib
+import hmac
 import secrets
+import struct
+import time
 from datetime import datetime, timedelta
+from urllib.parse import quote, urlencode
 
-from werkzeug.security import check_password_hash, generate_password_hash
-
+from flask import current_app
 
 OTP_EXPIRY_MINUTES = 5
+OTP_MAX_ATTEMPTS = 5
+OTP_HASH_PREFIX = "hmac-sha256"
+
+TOTP_DIGITS = 6
+TOTP_STEP_SECONDS = 30
+# Steps accepted either side of the current one, for clock drift and typing time
+TOTP_WINDOW = 1
+TOTP_ISSUER = "Online Exam"
 
 
 def generate_otp_code(length: int = 6) -> str:
@@ -14,13 +42,73 @@ def generate_otp_code(length: int = 6) -> str:
     return str(secrets.randbelow(ceiling - floor + 1) + floor)
 
 
+def _otp_key() -> bytes:
+    # Derived, so the OTP digests never share a key with session signing
+    secret = current_app.secret_key
+    if isinstance(secret, str):
+        secret = secret.encode()
+    return hmac.new(secret, b"online-exam one-time codes", hashlib.sha256).digest()
+
+
+def _otp_digest(salt: str, code: str) -> str:
+    return hmac.new(_otp_key(), f"{salt}${code}".encode(), hashlib.sha256).hexdigest()
+
+
 def hash_otp(code: str) -> str:
-    return generate_password_hash(code)
+    salt = secrets.token_hex(16)
+    return f"{OTP_HASH_PREFIX}${salt}${_otp_digest(salt, code)}"
 
 
 def verify_otp(hashed: str, submitted_code: str) -> bool:
-    return check_password_hash(hashed, submitted_code)
+    prefix, _, rest = hashed.partition("$")
+    salt, _, digest = rest.partition("$")
+    if prefix != OTP_HASH_PREFIX or not digest:
+        # e.g. a code issued before codes were stored as HMACs
+        return False
+    return hmac.compare_digest(_otp_digest(salt, submitted_code), digest)
 
 
 def otp_expiry_time() -> datetime:
     return datetime.utcnow() + timedelta(minutes=OTP_EXPIRY_MINUTES)
+
+
+def generate_totp_secret() -> str:
+    """A random 160-bit secret, base32 encoded as authenticator apps expect."""
+    return base64.b32encode(secrets.token_bytes(20)).decode()
+
+
+def totp_code(secret: str, at: float | None = None) -> str:
+    """The TOTP code of ``secret`` at ``at`` (default: now)."""
+    counter = int((time.time() if at is None else at) // TOTP_STEP_SECONDS)
+    return _hotp(secret, counter)
+
+
+def _hotp(secret: str, counter: int) -> str:
+    key = base64.b32decode(secret + "=" * (-len(secret) % 8), casefold=True)
+    digest = hmac.new(key, struct.pack(">Q", counter), hashlib.sha1).digest()
+    offset = digest[-1] & 0x0F
+    value = struct.unpack(">I", digest[offset : offset + 4])[0] & 0x7FFFFFFF
+    return str(value % 10**TOTP_DIGITS).zfill(TOTP_DIGITS)
+
+
+def totp_step(secret: str, submitted_code: str, at: float | None = None) -> int | None:
+    """The time step whose code ``submitted_code`` is, or None if it matches none."""
+    counter = int((time.time() if at is None else at) // TOTP_STEP_SECONDS)
+    # Compare against every step in the window, so timing does not reveal which one matched
+    matches = [
+        counter + step
+        for step in range(-TOTP_WINDOW, TOTP_WINDOW + 1)
+        if hmac.compare_digest(_hotp(secret, counter + step), submitted_code)
+    ]
+    return matches[-1] if matches else None
+
+
+def verify_totp(secret: str, submitted_code: str, at: float | None = None) -> bool:
+    return totp_step(secret, submitted_code, at) is not None
+
+
+def totp_uri(secret: str, account: str) -> str:
+    """``otpauth://`` URI for adding the secret to an authenticator app."""
+    label = quote(f"{TOTP_ISSUER}:{account}")
+    query = urlencode({"secret": secret, "issuer": TOTP_ISSUER, "digits": TOTP_DIGITS})
+    return f"otpauth://totp/{label}?{query}"
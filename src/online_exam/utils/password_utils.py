@@ -0,0 +1,61 @@
+"""Password hashing policy.
+
+Passwords are hashed with werkzeug using ``PASSWORD_HASH_METHOD`` from the
+config, e.g. ``scrypt:32768:8:1`` (werkzeug's default) or
+``pbkdf2:sha256:600000``, so each environment can pick its cost: the tests use
+a cheap one, production one tuned with ``benchmarks/bench_password_hashing.py``.
+Every stored hash starts with the method and parameters it was made with
+(``method$salt$hash``), which is what ``needs_rehash`` compares against the
+policy. A hash weaker than the policy is replaced on the next successful login.
+Hashing itself runs in the ``services.hashing`` process pool.
+"""
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from ..services.hashing import offload
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+
+def policy_method() -> str:
+    if has_app_context():
+        return current_app.config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+    return DEFAULT_METHOD
+
+
+def hash_password(password: str, method: str | None = None) -> str:
+    return offload(generate_password_hash, password, method=method or policy_method())
+
+
+def verify_password(stored_hash: str, password: str) -> bool:
+    return bool(stored_hash) and offload(check_password_hash, stored_hash, password)
+
+
+def hash_method(stored_hash: str) -> str:
+    """The method and parameters a hash was made with, e.g. ``pbkdf2:sha256:600000``."""
+    return stored_hash.split("$", 1)[0]
+
+
+def _parse(method: str) -> tuple[str, list[int]]:
+    """Algorithm (with digest for pbkdf2) and numeric cost parameters of a method."""
+    name, *args = method.split(":")
+    if name == "pbkdf2" and args and not args[0].isdigit():
+        name = f"{name}:{args.pop(0)}"
+    try:
+        return name, [int(arg) for arg in args]
+    except ValueError:
+        return name, []
+
+
+def needs_rehash(stored_hash: str, method: str | None = None) -> bool:
+    """Whether a hash uses another algorithm, or a lower cost, than the policy.
+
+    Hashes stronger than the policy (e.g. made in production, checked in a
+    cheaper environment) are kept.
+    """
+    current_name, current_costs = _parse(method or policy_method())
+    name, costs = _parse(hash_method(stored_hash))
+    if name != current_name or len(costs) != len(current_costs):
+        return True
+    return any(cost < wanted for cost, wanted in zip(costs, current_costs))
@@ -1,6 +1,8 @@
 from datetime import datetime
+from typing import Any
 
 import pytest
+from sqlalchemy import event
 
 from online_exam import create_app, db
 from online_exam.config import Config
@@ -8,6 +10,10 @@ from online_exam.models.exam import Exam
 from online_exam.models.question import Question
 from online_exam.models.submission import Submission
 from online_exam.models.user import User
+from online_exam.services.answer_key import clear_answer_keys
+from online_exam.services.exam_catalog import invalidate_exam_counts
+from online_exam.services.exam_render import clear_rendered_exams
+from online_exam.services.user_cache import clear_user_cache
 
 
 class TestConfig(Config):
@@ -24,6 +30,11 @@ def app():
             "TESTING": True,
             "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
             "WTF_CSRF_ENABLED": False,
+            "GRADE_NOTIFIER_ENABLED": False,
+            "LOGIN_AUDIT_BUFFERED": False,
+            "PASSWORD_HASH_METHOD": "pbkdf2:sha256:1000",
+            "HASHING_WORKERS": 0,
+            "RESET_TOKEN_SWEEPER_ENABLED": False,
         }
     )
     with app.app_context():
@@ -31,6 +42,10 @@ def app():
         yield app
         db.session.remove()
         db.drop_all()
+    clear_answer_keys()
+    clear_user_cache()
+    invalidate_exam_counts()
+    clear_rendered_exams()
 
 
 @pytest.fixture
@@ -149,6 +164,39 @@ def sample_mcq_question(app, sample_exam):
         yield question
 
 
+@pytest.fixture
+def published(app, sample_exam, sample_mcq_question):
+    """Publish the sample exam, which then holds one MCQ question."""
+    with app.app_context():
+        exam = db.session.get(Exam, sample_exam.id)
+        exam.status = "published"
+        db.session.commit()
+        yield exam
+
+
+class Statement(str):
+    """SQL text of a captured statement, with the parameters it was run with."""
+
+    parameters: Any
+    executemany: bool
+
+
+@pytest.fixture
+def sql_statements(app):
+    """Capture every statement sent to the database from here to the end of the test."""
+    statements: list[Statement] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        captured = Statement(statement)
+        captured.parameters = parameters
+        captured.executemany = executemany
+        statements.append(captured)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", _record)
+
+
 @pytest.fixture
 def sample_submission(app, sample_exam, sample_student):
     """Create a sample submission for testing analytics/reporting."""
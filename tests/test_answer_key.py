@@ -0,0 +1,93 @@
+import pytest
+
+from online_exam import db
+from online_exam.models.exam import Exam
+from online_exam.models.question import Question
+from online_exam.models.submission import Submission
+from online_exam.services.answer_key import (
+    AnswerKey,
+    cached_answer_key,
+    clear_answer_keys,
+    get_answer_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_answer_keys()
+    yield
+    clear_answer_keys()
+
+
+def _add_mcq(exam_id, order_num, correct="B", points=10):
+    question = Question(
+        exam_id=exam_id,
+        question_text=f"Question {order_num}",
+        question_type="mcq",
+        points=points,
+        option_a="A",
+        option_b="B",
+        option_c="C",
+        option_d="D",
+        correct_answer=correct,
+        order_num=order_num,
+    )
+    db.session.add(question)
+    db.session.commit()
+    return question
+
+
+def test_answer_key_is_compact_and_ordered(sample_exam):
+    second = _add_mcq(sample_exam.id, 2, correct="C", points=5)
+    first = _add_mcq(sample_exam.id, 1, correct="A")
+
+    key = get_answer_key(sample_exam)
+
+    assert isinstance(key, AnswerKey)
+    assert key.question_ids == (first.id, second.id)
+    assert key.question_types == ("mcq", "mcq")
+    assert key.points == (10, 5)
+    assert key.correct_options == ("A", "C")
+    assert key.max_score == 15
+    with pytest.raises(AttributeError):
+        key.points = (1, 1)
+
+
+def test_draft_exam_key_is_not_cached(sample_exam):
+    _add_mcq(sample_exam.id, 1)
+
+    get_answer_key(sample_exam)
+
+    assert cached_answer_key(sample_exam.id, sample_exam.updated_at) is None
+
+
+def test_publish_exam_compiles_key(client, sample_exam):
+    _add_mcq(sample_exam.id, 1)
+
+    client.post(f"/exams/{sample_exam.id}/publish")
+
+    exam = db.session.get(Exam, sample_exam.id)
+    key = cached_answer_key(exam.id, exam.updated_at)
+    assert key is not None
+    assert key.correct_options == ("B",)
+
+
+@pytest.mark.rbac_role("student")
+def test_submit_published_exam_makes_no_question_query(app, client, sample_exam, sql_statements):
+    question = _add_mcq(sample_exam.id, 1)
+    sample_exam.status = "published"
+    db.session.commit()
+    get_answer_key(sample_exam)
+    sql_statements.clear()
+
+    response = client.post(
+        f"/student/exams/{sample_exam.id}/submit",
+        data={"student_name": "Cached", f"question_{question.id}": "B"},
+    )
+
+    assert response.status_code == 302
+    assert not [s for s in sql_statements if "FROM questions" in s]
+
+    submission = Submission.query.filter_by(student_name="Cached").one()
+    assert submission.total_score == 10
+    assert submission.status == "graded"
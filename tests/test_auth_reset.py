@@ -3,12 +3,22 @@ from datetime import datetime, timedelta
 import pytest
 
 from online_exam import db
-from online_exam.models.password_reset_token import PasswordResetToken
-
+from online_exam.models.password_reset_token import PasswordResetToken, hash_reset_token
+from online_exam.services.reset_tokens import MAX_OUTSTANDING_PER_USER, sweep_reset_tokens
 
 pytestmark = pytest.mark.rbac_role("none")
 
 
+@pytest.fixture
+def reset_links(monkeypatch):
+    links = []
+    monkeypatch.setattr(
+        "online_exam.routes.auth_routes.send_password_reset_email",
+        lambda user, url: links.append(url.removeprefix("http://localhost")),
+    )
+    return links
+
+
 def test_reset_request_creates_token(client, app, sample_student):
     response = client.post(
         "/reset-password", data={"email": "student@example.com"}, follow_redirects=True
@@ -21,12 +31,9 @@ def test_reset_request_creates_token(client, app, sample_student):
         assert tokens[0].user_id == sample_student.id
 
 
-def test_reset_flow_updates_password(client, app, sample_student):
+def test_reset_flow_updates_password(client, app, sample_student, reset_links):
     client.post("/reset-password", data={"email": "student@example.com"})
-    with app.app_context():
-        token = PasswordResetToken.query.first()
-        assert token is not None
-        reset_url = f"/reset-password/{token.token}"
+    [reset_url] = reset_links
 
     response = client.post(
         reset_url,
@@ -45,7 +52,7 @@ def test_reset_token_expiry(client, app, sample_student):
     with app.app_context():
         expired_token = PasswordResetToken(
             user_id=sample_student.id,
-            token="expired",
+            token_hash=hash_reset_token("expired"),
             created_at=datetime.utcnow() - timedelta(hours=1),
             expires_at=datetime.utcnow() - timedelta(minutes=1),
             used=False,
@@ -58,12 +65,9 @@ def test_reset_token_expiry(client, app, sample_student):
     assert b"Invalid or expired reset link." in response.data
 
 
-def test_password_complexity_validation(client, app, sample_student):
+def test_password_complexity_validation(client, app, sample_student, reset_links):
     client.post("/reset-password", data={"email": "student@example.com"})
-    with app.app_context():
-        token = PasswordResetToken.query.first()
-        assert token is not None
-        reset_url = f"/reset-password/{token.token}"
+    [reset_url] = reset_links
 
     response = client.post(
         reset_url,
@@ -72,3 +76,65 @@ def test_password_complexity_validation(client, app, sample_student):
     )
 
     assert b"Password must be at least 8 characters" in response.data
+
+
+def test_only_the_token_digest_is_stored(client, sample_student, reset_links):
+    client.post("/reset-password", data={"email": "student@example.com"})
+    token = reset_links[0].rsplit("/", 1)[1]
+
+    stored = PasswordResetToken.query.one()
+    assert stored.token_hash == hash_reset_token(token)
+    assert token not in stored.token_hash
+
+
+def test_outstanding_tokens_per_user_are_capped(client, app, sample_student, reset_links):
+    app.config["RATE_LIMIT_ENABLED"] = False
+    for _ in range(MAX_OUTSTANDING_PER_USER + 3):
+        client.post("/reset-password", data={"email": "student@example.com"})
+
+    assert PasswordResetToken.query.count() == MAX_OUTSTANDING_PER_USER
+    response = client.get(reset_links[-1])
+    assert response.status_code == 200
+    assert client.get(reset_links[0]).status_code == 302
+
+
+def test_used_link_cannot_be_reused(client, sample_student, reset_links):
+    client.post("/reset-password", data={"email": "student@example.com"})
+    form = {"password": "NewPass123!", "confirm_password": "NewPass123!"}
+    client.post(reset_links[0], data=form)
+
+    response = client.post(reset_links[0], data=form, follow_redirects=True)
+
+    assert b"Invalid or expired reset link." in response.data
+
+
+def test_sweeper_deletes_expired_and_used_tokens(app, sample_student):
+    now = datetime.utcnow()
+    live = PasswordResetToken.create_for_user(sample_student.id, "live")
+    used = PasswordResetToken.create_for_user(sample_student.id, "used")
+    used.mark_used()
+    expired = PasswordResetToken(
+        user_id=sample_student.id,
+        token_hash=hash_reset_token("old"),
+        expires_at=now - timedelta(minutes=1),
+    )
+    db.session.add_all([live, used, expired])
+    db.session.commit()
+
+    assert sweep_reset_tokens(batch=1) == 2
+    assert [token.token_hash for token in PasswordResetToken.query] == [hash_reset_token("live")]
+
+
+def test_sweep_command(app, sample_student):
+    db.session.add(
+        PasswordResetToken(
+            user_id=sample_student.id,
+            token_hash=hash_reset_token("old"),
+            expires_at=datetime.utcnow() - timedelta(minutes=1),
+        )
+    )
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["sweep-reset-tokens"])
+
+    assert "Deleted 1 password reset tokens." in result.output
@@ -0,0 +1,109 @@
+import csv
+import io
+
+import pytest
+
+from online_exam import db
+from online_exam.models.question import Question
+from online_exam.models.submission import Answer, Submission
+
+
+@pytest.fixture
+def graded_submission(sample_exam):
+    mcq = Question(
+        exam_id=sample_exam.id,
+        question_text="Which, of these\nis right?",
+        question_type="mcq",
+        points=10,
+        option_a="A",
+        option_b="B",
+        option_c="C",
+        option_d="D",
+        correct_answer="B",
+        order_num=1,
+    )
+    written = Question(
+        exam_id=sample_exam.id,
+        question_text='Explain "why"',
+        question_type="written",
+        points=10,
+        order_num=2,
+    )
+    db.session.add_all([mcq, written])
+    db.session.flush()
+
+    submission = Submission(
+        exam_id=sample_exam.id,
+        student_name="Doe, Jane",
+        total_score=15,
+        max_score=20,
+        percentage=75.0,
+        status="graded",
+    )
+    db.session.add(submission)
+    db.session.flush()
+    db.session.add_all(
+        [
+            Answer(
+                submission_id=submission.id,
+                question_id=mcq.id,
+                selected_option="B",
+                is_correct=True,
+                points_earned=10,
+            ),
+            Answer(
+                submission_id=submission.id,
+                question_id=written.id,
+                answer_text="Because, well,\nreasons",
+                points_earned=5,
+                instructor_comment='Good, but "thin"',
+            ),
+        ]
+    )
+    db.session.commit()
+    return submission
+
+
+def _rows(response):
+    return list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+
+
+@pytest.mark.rbac_role("student")
+def test_submission_csv_escapes_commas_quotes_and_newlines(client, graded_submission):
+    response = client.get(f"/student/submissions/{graded_submission.id}/download")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    assert f"grades_{graded_submission.id}.csv" in response.headers["Content-Disposition"]
+
+    rows = _rows(response)
+    assert rows[0][0] == "Question No"
+    assert rows[1] == ["1", "MCQ", "Which, of these\nis right?", "B", "B", "10", ""]
+    assert rows[2] == [
+        "2",
+        "Written",
+        'Explain "why"',
+        "Because, well,\nreasons",
+        "",
+        "5",
+        'Good, but "thin"',
+    ]
+
+
+def test_exam_answers_csv_lists_every_answer(client, sample_exam, graded_submission):
+    response = client.get(f"/analytics/exams/{sample_exam.id}/export/csv")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+
+    rows = _rows(response)
+    assert rows[0][:3] == ["Submission ID", "Student Name", "Status"]
+    assert len(rows) == 3
+    assert {row[1] for row in rows[1:]} == {"Doe, Jane"}
+    assert [row[7] for row in rows[1:]] == ["1", "2"]
+
+
+def test_exam_answers_csv_unknown_exam(client):
+    response = client.get("/analytics/exams/9999/export/csv")
+    assert response.status_code == 404
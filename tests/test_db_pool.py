@@ -0,0 +1,100 @@
+import importlib
+
+import pytest
+
+from online_exam import config as config_module
+from online_exam import create_app, db
+from online_exam.services.db_pool import InstrumentedQueuePool, build_engine_options
+
+
+def _config(uri, **overrides):
+    settings = {
+        key: getattr(config_module.Config, key)
+        for key in dir(config_module.Config)
+        if key.startswith("DB_")
+    }
+    settings["SQLALCHEMY_DATABASE_URI"] = uri
+    settings.update(overrides)
+    return settings
+
+
+def test_memory_sqlite_keeps_default_pool():
+    assert build_engine_options(_config("sqlite:///:memory:")) == {}
+
+
+def test_mysql_options_enable_pre_ping_recycle_and_driver_timeouts():
+    options = build_engine_options(
+        _config("mysql+pymysql://u:p@db/exam", DB_POOL_SIZE=7, DB_POOL_RECYCLE=600)
+    )
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 7
+    assert options["pool_recycle"] == 600
+    assert options["pool_pre_ping"] is True
+    assert set(options["connect_args"]) == {"connect_timeout", "read_timeout", "write_timeout"}
+
+
+def test_pool_settings_read_from_environment(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "25")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "5")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    try:
+        reloaded = importlib.reload(config_module).Config
+        assert reloaded.DB_POOL_SIZE == 25
+        assert reloaded.DB_MAX_OVERFLOW == 5
+        assert reloaded.DB_POOL_PRE_PING is False
+    finally:
+        monkeypatch.undo()
+        importlib.reload(config_module)
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'pool.db'}",
+            "DB_POOL_SIZE": 3,
+            "DB_MAX_OVERFLOW": 2,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_file_database_uses_instrumented_pool(file_app):
+    pool = db.engine.pool
+    assert isinstance(pool, InstrumentedQueuePool)
+    assert pool.size() == 3
+
+
+@pytest.mark.rbac_role("admin")
+def test_admin_sees_pool_metrics(file_app):
+    client = file_app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+        session["user_role"] = "admin"
+
+    response = client.get("/analytics/db-pool")
+
+    assert response.status_code == 200
+    metrics = response.get_json()
+    assert metrics["pool"] == "InstrumentedQueuePool"
+    assert metrics["size"] == 3
+    assert metrics["checkouts"] >= 1
+    assert metrics["timeouts"] == 0
+    assert {"checked_out", "overflow", "wait_avg_ms", "wait_max_ms"} <= set(metrics)
+
+
+def test_pool_metrics_forbidden_for_instructors(client):
+    assert client.get("/analytics/db-pool").status_code == 403
+
+
+@pytest.mark.rbac_role("admin")
+def test_pool_metrics_for_memory_database(client):
+    metrics = client.get("/analytics/db-pool").get_json()
+    assert metrics["pool"] == "StaticPool"
+    assert "pid" in metrics
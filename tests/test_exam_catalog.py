@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from online_exam import db
+from online_exam.models.exam import Exam
+from online_exam.services.exam_catalog import (
+    decode_cursor,
+    encode_cursor,
+    get_exam_counts,
+    keyset_page,
+)
+
+
+def _exam_queries(statements):
+    return [
+        statement
+        for statement in statements
+        if "exams" in statement and statement.lstrip().upper().startswith("SELECT")
+    ]
+
+
+@pytest.fixture
+def many_exams(app):
+    start = datetime(2025, 1, 1)
+    exams = [
+        Exam(
+            title=f"Exam {number:02d}",
+            status="published" if number % 3 == 0 else "draft",
+            # Pairs share a timestamp, so the id tie-breaker matters
+            created_at=start + timedelta(minutes=number // 2),
+            updated_at=start,
+        )
+        for number in range(25)
+    ]
+    db.session.add_all(exams)
+    db.session.commit()
+    return exams
+
+
+def test_counts_come_from_one_grouped_query(many_exams, sql_statements):
+    sql_statements.clear()
+    counts = get_exam_counts()
+
+    exam_queries = _exam_queries(sql_statements)
+    assert (counts.total, counts.drafts, counts.published) == (25, 16, 9)
+    assert len(exam_queries) == 1
+    assert "GROUP BY" in exam_queries[0]
+
+
+def test_counts_are_cached(many_exams, sql_statements):
+    sql_statements.clear()
+    get_exam_counts()
+    get_exam_counts()
+
+    assert len(_exam_queries(sql_statements)) == 1
+
+
+def test_counts_invalidated_on_create_publish_and_delete(client, app):
+    assert get_exam_counts().total == 0
+
+    client.post("/exams/create", data={"title": "New", "description": "d"})
+    counts = get_exam_counts()
+    assert (counts.total, counts.drafts) == (1, 1)
+
+    exam_id = db.session.execute(db.select(Exam.id)).scalar_one()
+    client.post(f"/exams/{exam_id}/publish")
+    counts = get_exam_counts()
+    assert (counts.drafts, counts.published) == (0, 1)
+
+    draft = Exam(title="Draft", status="draft")
+    db.session.add(draft)
+    db.session.commit()
+    assert get_exam_counts().total == 2
+
+    client.post(f"/exams/{draft.id}/delete")
+    assert get_exam_counts().total == 1
+
+
+def test_list_page_uses_cached_totals(client, many_exams, sql_statements):
+    client.get("/exams")
+    sql_statements.clear()
+
+    response = client.get("/exams?page=2")
+
+    assert response.status_code == 200
+    # Only the page itself; the totals and the pagination count are cached
+    assert len(_exam_queries(sql_statements)) == 1
+    assert b"Exam 14" in response.data
+
+
+def test_cursor_round_trip(many_exams):
+    exam = many_exams[3]
+    assert decode_cursor(encode_cursor(exam)) == (exam.created_at, exam.id)
+    assert decode_cursor("not-a-cursor") is None
+
+
+@pytest.mark.parametrize("newest_first", [True, False])
+def test_keyset_walk_matches_offset_order(many_exams, newest_first):
+    expected = sorted(many_exams, key=lambda e: (e.created_at, e.id), reverse=newest_first)
+
+    seen = []
+    pages = []
+    after = None
+    while True:
+        page = keyset_page(Exam.query, 10, newest_first=newest_first, after=after)
+        pages.append(page)
+        seen.extend(page.items)
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
+
+    assert [e.id for e in seen] == [e.id for e in expected]
+    assert [len(p.items) for p in pages] == [10, 10, 5]
+    assert pages[0].prev_cursor is None
+
+    back = keyset_page(Exam.query, 10, newest_first=newest_first, before=pages[2].prev_cursor)
+    assert [e.id for e in back.items] == [e.id for e in pages[1].items]
+    assert back.prev_cursor is not None
+
+
+def test_keyset_listing_route(client, many_exams):
+    first = client.get("/exams?paging=keyset&status=draft")
+    assert first.status_code == 200
+    assert b"Exam 23" in first.data
+    assert b"after=" in first.data
+
+    cursor = keyset_page(Exam.query.filter_by(status="draft"), 10).next_cursor
+    second = client.get(f"/exams?after={cursor}&status=draft")
+    table = second.data.split(b"<tbody>")[1].split(b"</tbody>")[0]
+    assert b"Exam 23" not in table
+    assert table.count(b"<tr>") == 6
@@ -0,0 +1,143 @@
+import pytest
+
+from online_exam import db
+from online_exam.models.exam_draft import DraftAnswer, ExamDraft
+from online_exam.models.question import Question
+from online_exam.models.submission import Submission
+
+pytestmark = pytest.mark.rbac_role("student")
+
+
+@pytest.fixture
+def exam(published, sample_mcq_question):
+    written = Question(
+        exam_id=published.id,
+        question_text="Explain.",
+        question_type="written",
+        points=10,
+        order_num=2,
+    )
+    db.session.add(written)
+    db.session.commit()
+    return published, sample_mcq_question.id, written.id
+
+
+def _save(client, exam_id, **payload):
+    return client.post(f"/student/exams/{exam_id}/draft", json=payload)
+
+
+def test_delta_is_saved_and_restored(client, exam):
+    exam, mcq_id, written_id = exam
+
+    response = _save(
+        client,
+        exam.id,
+        student_name="Draft Student",
+        answers={str(mcq_id): "B", str(written_id): "Because."},
+        flags={str(written_id): True},
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == {"saved": 2}
+
+    draft = client.get(f"/student/exams/{exam.id}/draft").get_json()
+    assert draft["student_name"] == "Draft Student"
+    assert draft["answers"] == {str(mcq_id): "B", str(written_id): "Because."}
+    assert draft["flagged"] == [written_id]
+
+
+def test_each_batch_is_one_upsert_of_the_changed_questions(client, exam, sql_statements):
+    exam, mcq_id, written_id = exam
+    _save(client, exam.id, answers={str(mcq_id): "B", str(written_id): "First"})
+    sql_statements.clear()
+
+    _save(client, exam.id, answers={str(written_id): "Second"})
+
+    draft_writes = [
+        statement
+        for statement in sql_statements
+        if "draft_answers" in statement and not statement.lstrip().upper().startswith("SELECT")
+    ]
+    assert len(draft_writes) == 1
+    assert draft_writes[0].lstrip().upper().startswith("INSERT")
+    assert DraftAnswer.query.count() == 2
+
+
+def test_answers_and_flags_are_updated_independently(client, exam):
+    exam, mcq_id, written_id = exam
+    _save(client, exam.id, answers={str(written_id): "Draft"}, flags={str(mcq_id): True})
+
+    _save(client, exam.id, flags={str(written_id): True, str(mcq_id): False})
+    _save(client, exam.id, answers={str(written_id): "Final"})
+
+    draft = client.get(f"/student/exams/{exam.id}/draft").get_json()
+    assert draft["answers"] == {str(written_id): "Final"}
+    assert draft["flagged"] == [written_id]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"answers": {"9999": "A"}},
+        {"answers": ["A"]},
+        {"flags": {"x": True}},
+        {"student_name": 5},
+    ],
+)
+def test_invalid_deltas_are_rejected(client, exam, payload):
+    exam, _, _ = exam
+    assert _save(client, exam.id, **payload).status_code == 400
+    assert ExamDraft.query.count() == 0
+
+
+def test_invalid_choice_is_rejected(client, exam):
+    exam, mcq_id, _ = exam
+    assert _save(client, exam.id, answers={str(mcq_id): "E"}).status_code == 400
+
+
+def test_unpublished_exam_has_no_draft(client, sample_exam, sample_mcq_question):
+    response = _save(client, sample_exam.id, answers={str(sample_mcq_question.id): "B"})
+    assert response.status_code == 404
+    assert client.get(f"/student/exams/{sample_exam.id}/draft").status_code == 404
+
+
+def test_submit_grades_the_draft_and_removes_it(client, exam):
+    exam, mcq_id, written_id = exam
+    _save(client, exam.id, student_name="Draft Student", answers={str(mcq_id): "B"})
+
+    response = client.post(
+        f"/student/exams/{exam.id}/draft/submit", json={"answers": {str(written_id): "Late"}}
+    )
+
+    assert response.status_code == 200
+    submission = Submission.query.one()
+    assert response.get_json()["results_url"] == f"/student/submissions/{submission.id}/results"
+    assert (submission.student_name, submission.total_score) == ("Draft Student", 10)
+    assert submission.status == "pending"
+    assert ExamDraft.query.count() == 0
+    assert DraftAnswer.query.count() == 0
+
+
+def test_submit_requires_a_name(client, exam):
+    exam, mcq_id, _ = exam
+    _save(client, exam.id, answers={str(mcq_id): "B"})
+
+    response = client.post(f"/student/exams/{exam.id}/draft/submit", json={})
+
+    assert response.status_code == 400
+    assert Submission.query.count() == 0
+    assert DraftAnswer.query.count() == 1
+
+
+def test_regular_submit_discards_the_draft(client, exam):
+    exam, mcq_id, _ = exam
+    _save(client, exam.id, answers={str(mcq_id): "A"})
+
+    response = client.post(
+        f"/student/exams/{exam.id}/submit",
+        data={"student_name": "Form Student", f"question_{mcq_id}": "B"},
+    )
+
+    assert response.status_code == 302
+    assert ExamDraft.query.count() == 0
+    assert DraftAnswer.query.count() == 0
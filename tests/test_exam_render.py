@@ -0,0 +1,117 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from markupsafe import Markup
+
+from online_exam import db
+from online_exam.models.exam import Exam
+from online_exam.services import exam_render
+from online_exam.services.exam_render import RenderedExam, get_rendered_exam
+
+pytestmark = pytest.mark.rbac_role("student")
+
+
+def _question_queries(statements):
+    return [statement for statement in statements if "FROM questions" in statement]
+
+
+def test_question_cards_are_rendered_once(client, published, sql_statements):
+    first = client.get(f"/student/exams/{published.id}/take")
+    second = client.get(f"/student/exams/{published.id}/take")
+
+    assert first.status_code == second.status_code == 200
+    assert b"What is 2 + 2?" in second.data
+    assert b'name="question_' in second.data
+    assert len(_question_queries(sql_statements)) == 1
+
+
+def test_page_is_revalidated_with_its_etag(client, published):
+    response = client.get(f"/student/exams/{published.id}/take")
+    assert response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+    assert "private" in response.headers["Cache-Control"]
+
+    again = client.get(
+        f"/student/exams/{published.id}/take",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+
+    assert again.status_code == 304
+    assert again.data == b""
+
+
+def test_etag_differs_per_student(client, published, sample_student, login_user):
+    etag = client.get(f"/student/exams/{published.id}/take").headers["ETag"]
+
+    with client.session_transaction() as session:
+        session["user_id"] = sample_student.id + 1000
+
+    response = client.get(f"/student/exams/{published.id}/take", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_pending_flash_is_not_answered_with_304(client, published):
+    etag = client.get(f"/student/exams/{published.id}/take").headers["ETag"]
+    with client.session_transaction() as session:
+        session["_flashes"] = [("info", "Welcome back")]
+
+    response = client.get(f"/student/exams/{published.id}/take", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert b"Welcome back" in response.data
+
+
+def test_new_exam_version_is_rendered_again(client, published, sql_statements):
+    client.get(f"/student/exams/{published.id}/take")
+
+    exam = db.session.get(Exam, published.id)
+    exam.updated_at = datetime.utcnow() + timedelta(seconds=5)
+    db.session.commit()
+    client.get(f"/student/exams/{published.id}/take")
+
+    assert len(_question_queries(sql_statements)) == 2
+    assert len(exam_render._cache) == 1
+
+
+def _fake_rendered(exam):
+    return RenderedExam(exam.id, exam.updated_at, Markup(""), 0, 0)
+
+
+def test_least_recently_used_exam_is_evicted(app, monkeypatch):
+    app.config["EXAM_RENDER_CACHE_SIZE"] = 2
+    monkeypatch.setattr(exam_render, "render_exam", _fake_rendered)
+    exams = [Exam(id=number, updated_at=datetime(2025, 1, 1)) for number in (1, 2, 3)]
+
+    get_rendered_exam(exams[0])
+    get_rendered_exam(exams[1])
+    get_rendered_exam(exams[0])
+    get_rendered_exam(exams[2])
+
+    assert [exam_id for exam_id, _ in exam_render._cache] == [1, 3]
+
+
+def test_concurrent_misses_render_once(app, monkeypatch):
+    renders = []
+
+    def slow_render(exam):
+        renders.append(exam.id)
+        time.sleep(0.05)
+        return _fake_rendered(exam)
+
+    monkeypatch.setattr(exam_render, "render_exam", slow_render)
+    exam = Exam(id=7, updated_at=datetime(2025, 1, 1))
+
+    def open_exam():
+        with app.app_context():
+            get_rendered_exam(exam)
+
+    threads = [threading.Thread(target=open_exam) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert renders == [7]
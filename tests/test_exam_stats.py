@@ -0,0 +1,180 @@
+import math
+
+import pytest
+
+from online_exam import db
+from online_exam.commands import rebuild_exam_stats_command
+from online_exam.models.exam_stats import ExamStats
+from online_exam.models.question import Question
+from online_exam.models.submission import Answer, Submission
+from online_exam.services import exam_stats
+from online_exam.services.exam_stats import get_exam_stats
+
+
+def _mcq(exam_id, order_num=1):
+    question = Question(
+        exam_id=exam_id,
+        question_text="Pick B",
+        question_type="mcq",
+        points=10,
+        option_a="A",
+        option_b="B",
+        option_c="C",
+        option_d="D",
+        correct_answer="B",
+        order_num=order_num,
+    )
+    db.session.add(question)
+    db.session.commit()
+    return question
+
+
+def _stats(exam_id):
+    return db.session.get(ExamStats, exam_id, populate_existing=True)
+
+
+def test_submissions_update_stats_incrementally(client, sample_exam):
+    question = _mcq(sample_exam.id)
+    get_exam_stats(sample_exam.id)
+
+    for name, option in [("A", "B"), ("B", "C"), ("C", "B")]:
+        client.post(
+            f"/exams/{sample_exam.id}/submit",
+            data={"student_name": name, f"question_{question.id}": option},
+        )
+
+    stats = _stats(sample_exam.id)
+    assert stats.submission_count == 3
+    assert stats.score_sum == 20
+    assert stats.score_sq_sum == 200
+    assert stats.min_score == 0
+    assert stats.max_score == 10
+    assert stats.pass_count == 2
+    assert stats.range_90_100 == 2
+    assert stats.range_below_50 == 1
+    assert math.isclose(stats.std_dev, math.sqrt(200 / 3 - (20 / 3) ** 2))
+
+
+def test_first_submission_builds_stats_row(client, sample_exam):
+    question = _mcq(sample_exam.id)
+
+    client.post(
+        f"/exams/{sample_exam.id}/submit",
+        data={"student_name": "Solo", f"question_{question.id}": "B"},
+    )
+
+    stats = _stats(sample_exam.id)
+    assert stats.submission_count == 1
+    assert stats.min_score == stats.max_score == 10
+
+
+def test_first_submission_losing_the_insert_race_folds_in(client, sample_exam, monkeypatch):
+    question = _mcq(sample_exam.id)
+    summary_values = exam_stats._summary_values
+
+    def concurrent_first_submission(exam_id):
+        # Another first submission (score 0) creates the row right before ours
+        values = summary_values(exam_id)
+        db.session.add(
+            ExamStats(
+                exam_id=exam_id,
+                submission_count=1,
+                score_sum=0,
+                score_sq_sum=0,
+                min_score=0,
+                max_score=0,
+                pass_count=0,
+                range_below_50=1,
+            )
+        )
+        db.session.flush()
+        return values
+
+    monkeypatch.setattr(exam_stats, "_summary_values", concurrent_first_submission)
+    response = client.post(
+        f"/exams/{sample_exam.id}/submit",
+        data={"student_name": "A", f"question_{question.id}": "B"},
+    )
+
+    assert response.status_code == 302
+    stats = _stats(sample_exam.id)
+    assert (stats.submission_count, stats.score_sum, stats.min_score, stats.max_score) == (
+        2,
+        10,
+        0,
+        10,
+    )
+    assert (stats.range_90_100, stats.range_below_50) == (1, 1)
+
+
+def test_manual_grade_moves_score(client, sample_exam):
+    written = Question(
+        exam_id=sample_exam.id,
+        question_text="Explain",
+        question_type="written",
+        points=10,
+        order_num=1,
+    )
+    db.session.add(written)
+    db.session.commit()
+
+    for name in ("Low", "High"):
+        client.post(
+            f"/exams/{sample_exam.id}/submit",
+            data={"student_name": name, f"question_{written.id}": "text"},
+        )
+    submission = Submission.query.filter_by(student_name="High").one()
+    answer = Answer.query.filter_by(submission_id=submission.id).one()
+
+    client.post(
+        f"/exams/submissions/{submission.id}/grade",
+        data={f"points_{answer.id}": "9", f"comment_{answer.id}": ""},
+    )
+
+    stats = _stats(sample_exam.id)
+    assert stats.submission_count == 2
+    assert stats.score_sum == 9
+    assert stats.max_score == 9
+    assert stats.min_score == 0
+    assert stats.pass_count == 1
+    assert stats.range_90_100 == 1
+    assert stats.range_below_50 == 1
+
+
+def test_report_reads_single_stats_row(client, sample_exam, sql_statements):
+    db.session.add(
+        Submission(
+            exam_id=sample_exam.id, student_name="S", total_score=7, max_score=10, percentage=70.0
+        )
+    )
+    db.session.commit()
+    client.get(f"/analytics/exams/{sample_exam.id}/report")
+    sql_statements.clear()
+
+    response = client.get(f"/analytics/exams/{sample_exam.id}/report")
+
+    aggregates = [
+        statement
+        for statement in sql_statements
+        if "FROM submissions" in statement and "count(" in statement.lower()
+    ]
+    assert response.status_code == 200
+    assert b"Std. deviation" in response.data
+    assert aggregates == []
+
+
+@pytest.mark.parametrize("args", [[], ["1"]])
+def test_rebuild_command(app, sample_exam, args):
+    db.session.add(
+        Submission(
+            exam_id=sample_exam.id, student_name="S", total_score=5, max_score=10, percentage=50.0
+        )
+    )
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(rebuild_exam_stats_command, args)
+
+    assert result.exit_code == 0
+    stats = _stats(sample_exam.id)
+    assert stats.submission_count == 1
+    assert stats.range_50_59 == 1
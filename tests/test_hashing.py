@@ -0,0 +1,58 @@
+import threading
+import time
+
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from online_exam.services.hashing import HashingBusy, HashingExecutor, get_hashing_executor
+
+pytestmark = pytest.mark.rbac_role("none")
+
+
+@pytest.fixture(scope="module")
+def executor():
+    pool = HashingExecutor(workers=1, max_pending=1, timeout=0.05)
+    yield pool
+    pool.shutdown()
+
+
+def test_hashes_are_computed_in_the_pool(executor):
+    stored = executor.run(generate_password_hash, "Password123!", method="pbkdf2:sha256:1000")
+
+    assert executor.run(check_password_hash, stored, "Password123!")
+    assert not executor.run(check_password_hash, stored, "wrong")
+
+
+def test_full_pool_pushes_back(executor):
+    # Warm the worker process up so the sleep below starts promptly
+    executor.run(time.sleep, 0)
+    busy = threading.Thread(target=executor.run, args=(time.sleep, 0.5))
+    busy.start()
+    time.sleep(0.1)
+
+    with pytest.raises(HashingBusy):
+        executor.run(time.sleep, 0)
+
+    busy.join()
+    executor.run(time.sleep, 0)
+
+
+def test_hashing_runs_inline_without_workers(app):
+    assert get_hashing_executor(app) is None
+
+
+def test_busy_login_is_answered_503(client, sample_student, monkeypatch):
+    def saturated(func, *args, **kwargs):
+        raise HashingBusy("Password hashing is saturated.")
+
+    monkeypatch.setattr("online_exam.utils.password_utils.offload", saturated)
+
+    response = client.post(
+        "/login", data={"email": "student@example.com", "password": "Password123!"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+    assert b"The server is busy" in response.data
+    with client.session_transaction() as session:
+        assert "user_id" not in session
@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from flask import template_rendered, url_for
+
+from online_exam import db
+from online_exam.models.exam import Exam
+from online_exam.models.question import Question
+from online_exam.models.submission import Answer, Submission
+
+
+@contextmanager
+def rendered_templates(app):
+    names = []
+
+    def _record(sender, template, context, **extra):
+        names.append(template.name)
+
+    template_rendered.connect(_record, app)
+    try:
+        yield names
+    finally:
+        template_rendered.disconnect(_record, app)
+
+
+@pytest.fixture
+def graded_submission(sample_exam, sample_mcq_question):
+    submission = Submission(
+        exam_id=sample_exam.id,
+        student_name="Cached Student",
+        total_score=10,
+        max_score=10,
+        percentage=100.0,
+        status="graded",
+    )
+    db.session.add(submission)
+    db.session.flush()
+    answer = Answer(
+        submission_id=submission.id,
+        question_id=sample_mcq_question.id,
+        selected_option="B",
+        is_correct=True,
+        points_earned=10,
+    )
+    db.session.add(answer)
+    db.session.commit()
+    return submission, answer
+
+
+def _revalidate(client, url, etag):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+def test_unchanged_exam_page_is_not_rendered_again(app, client, sample_exam):
+    url = f"/exams/{sample_exam.id}"
+    first = client.get(url)
+    assert first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    with rendered_templates(app) as templates:
+        response = _revalidate(client, url, first.headers["ETag"])
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert templates == []
+
+
+def test_edited_exam_gets_a_new_etag(client, sample_exam):
+    url = f"/exams/{sample_exam.id}"
+    etag = client.get(url).headers["ETag"]
+
+    exam = db.session.get(Exam, sample_exam.id)
+    exam.title = "Renamed"
+    exam.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db.session.commit()
+
+    response = _revalidate(client, url, etag)
+    assert response.status_code == 200
+    assert b"Renamed" in response.data
+
+
+def test_question_list_changes_with_its_questions(client, sample_exam, sample_question):
+    url = f"/exams/{sample_exam.id}/questions"
+    etag = client.get(url).headers["ETag"]
+    assert _revalidate(client, url, etag).status_code == 304
+
+    db.session.delete(db.session.get(Question, sample_question.id))
+    db.session.commit()
+
+    assert _revalidate(client, url, etag).status_code == 200
+
+
+def test_grading_results_change_when_an_answer_is_graded(client, graded_submission):
+    submission, answer = graded_submission
+    url = f"/exams/submissions/{submission.id}"
+    etag = client.get(url).headers["ETag"]
+    assert _revalidate(client, url, etag).status_code == 304
+
+    graded = db.session.get(Answer, answer.id)
+    graded.instructor_comment = "Well done"
+    graded.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db.session.commit()
+
+    assert _revalidate(client, url, etag).status_code == 200
+
+
+@pytest.mark.rbac_role("student")
+def test_student_results_are_revalidated(client, graded_submission):
+    submission, _ = graded_submission
+    url = f"/student/submissions/{submission.id}/results"
+    etag = client.get(url).headers["ETag"]
+
+    assert _revalidate(client, url, etag).status_code == 304
+
+
+def test_etag_depends_on_the_signed_in_user(client, sample_exam, sample_admin, login_user):
+    url = f"/exams/{sample_exam.id}"
+    etag = client.get(url).headers["ETag"]
+
+    login_user(sample_admin)
+
+    assert _revalidate(client, url, etag).status_code == 200
+
+
+def test_missing_rows_are_not_cached(client):
+    response = client.get("/exams/submissions/9999")
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+
+def test_static_files_are_cacheable(app, client):
+    response = client.get("/static/css/styles.css")
+    assert response.cache_control.public
+    assert response.cache_control.max_age == 3600
+
+    with app.test_request_context():
+        versioned = url_for("static", filename="css/styles.css")
+    assert "?v=" in versioned
+
+    response = client.get(versioned)
+    assert response.cache_control.max_age == 365 * 24 * 3600
+    assert response.cache_control.immutable
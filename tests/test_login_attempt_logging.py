@@ -1,9 +1,13 @@
+import time
 from datetime import datetime, timedelta
 
 import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import OperationalError
 
+from online_exam import create_app, db
 from online_exam.models.login_attempt import LoginAttempt
-
+from online_exam.services.login_audit import get_login_audit_writer
 
 pytestmark = pytest.mark.rbac_role("none")
 
@@ -44,10 +48,34 @@ def test_successful_login_is_logged(client, sample_instructor, app):
         attempt = attempts[0]
         assert attempt.success is True
         assert attempt.user_identifier == "instructor@example.com"
-        assert attempt.ip_address == "203.0.113.5"
+        # No trusted proxy is configured, so the forwarded header is ignored
+        assert attempt.ip_address == "127.0.0.1"
         assert attempt.timestamp >= datetime.utcnow() - timedelta(minutes=5)
 
 
+def test_trusted_proxy_supplies_the_client_address():
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "LOGIN_AUDIT_BUFFERED": False,
+            "HASHING_WORKERS": 0,
+            "TRUSTED_PROXY_COUNT": 1,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        # The client sent its own header; the proxy appended the address it saw
+        app.test_client().post(
+            "/login",
+            data={"email": "nobody@example.com", "password": "wrong"},
+            headers={"X-Forwarded-For": "203.0.113.5, 70.0.0.1"},
+        )
+
+        assert LoginAttempt.query.one().ip_address == "70.0.0.1"
+        db.session.remove()
+
+
 def test_logging_does_not_block_login_flow(client, sample_student, app):
     response = client.post(
         "/login",
@@ -62,3 +90,72 @@ def test_logging_does_not_block_login_flow(client, sample_student, app):
         attempt = LoginAttempt.query.order_by(LoginAttempt.id.desc()).first()
         assert attempt is not None
         assert attempt.success is True
+
+
+def test_unwritable_attempt_does_not_fail_the_login(client, sample_student, app):
+    def reject_attempts(session, flush_context, instances):
+        if any(isinstance(obj, LoginAttempt) for obj in session.new):
+            raise OperationalError("INSERT", {}, Exception("disk full"))
+
+    event.listen(db.session, "before_flush", reject_attempts)
+    try:
+        response = client.post(
+            "/login", data={"email": "student@example.com", "password": "Password123!"}
+        )
+    finally:
+        event.remove(db.session, "before_flush", reject_attempts)
+
+    assert response.status_code == 302
+    assert _logged_count(app) == 0
+
+
+@pytest.fixture
+def buffered_audit(app):
+    app.config.update(
+        LOGIN_AUDIT_BUFFERED=True, LOGIN_AUDIT_BATCH_SIZE=3, LOGIN_AUDIT_FLUSH_SECONDS=60
+    )
+    writer = get_login_audit_writer(app)
+    yield writer
+    writer.stop(timeout=5)
+
+
+def _failed_login(client):
+    client.post("/login", data={"email": "student@example.com", "password": "wrong"})
+
+
+def _logged_count(app):
+    with app.app_context():
+        return db.session.scalar(select(func.count(LoginAttempt.id)))
+
+
+def test_buffered_attempts_are_written_in_batches(client, sample_student, app, buffered_audit):
+    _failed_login(client)
+    _failed_login(client)
+    assert _logged_count(app) == 0
+
+    _failed_login(client)
+    deadline = time.monotonic() + 5
+    while _logged_count(app) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _logged_count(app) == 3
+
+
+def test_buffered_attempts_are_flushed_on_stop(client, sample_student, app, buffered_audit):
+    _failed_login(client)
+
+    buffered_audit.stop(timeout=5)
+
+    with app.app_context():
+        attempt = LoginAttempt.query.one()
+    assert attempt.success is False
+    assert attempt.user_identifier == "student@example.com"
+
+
+def test_buffered_login_does_not_write_on_the_request_path(
+    client, sample_student, app, buffered_audit, sql_statements
+):
+    sql_statements.clear()
+
+    client.post("/login", data={"email": "student@example.com", "password": "Password123!"})
+
+    assert [statement.split()[0] for statement in sql_statements] == ["SELECT"]
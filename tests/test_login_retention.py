@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from online_exam import db
+from online_exam.models.login_attempt import (
+    LoginAttempt,
+    LoginAttemptHourlyByIdentifier,
+    LoginAttemptHourlyByIp,
+)
+from online_exam.services.login_retention import prune_login_attempts, roll_up_login_attempts
+
+NOW = datetime(2025, 3, 10, 12, 30)
+
+
+def _attempt(at, ip="10.0.0.1", user="student@example.com", success=False):
+    return LoginAttempt(user_identifier=user, ip_address=ip, success=success, timestamp=at)
+
+
+@pytest.fixture
+def attempts(app):
+    db.session.add_all(
+        [
+            _attempt(datetime(2025, 3, 10, 9, 5)),
+            _attempt(datetime(2025, 3, 10, 9, 55)),
+            _attempt(datetime(2025, 3, 10, 9, 56), success=True),
+            _attempt(datetime(2025, 3, 10, 9, 57), ip="10.0.0.2", user="other@example.com"),
+            _attempt(datetime(2025, 3, 10, 11, 0)),
+            # The current hour is not complete yet
+            _attempt(datetime(2025, 3, 10, 12, 10), ip="10.0.0.2"),
+        ]
+    )
+    db.session.commit()
+
+
+def _rows(model):
+    key = getattr(model, model.key_name)
+    return db.session.execute(
+        select(model.hour, key, model.failed, model.succeeded).order_by(model.hour, key)
+    ).all()
+
+
+def _count(model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+
+def test_completed_hours_are_rolled_up(attempts):
+    assert roll_up_login_attempts(NOW) == 6
+    db.session.commit()
+
+    assert _rows(LoginAttemptHourlyByIp) == [
+        (datetime(2025, 3, 10, 9), "10.0.0.1", 2, 1),
+        (datetime(2025, 3, 10, 9), "10.0.0.2", 1, 0),
+        (datetime(2025, 3, 10, 11), "10.0.0.1", 1, 0),
+    ]
+    assert _rows(LoginAttemptHourlyByIdentifier) == [
+        (datetime(2025, 3, 10, 9), "other@example.com", 1, 0),
+        (datetime(2025, 3, 10, 9), "student@example.com", 2, 1),
+        (datetime(2025, 3, 10, 11), "student@example.com", 1, 0),
+    ]
+    assert LoginAttemptHourlyByIp.rolled_up_until() == datetime(2025, 3, 10, 12)
+
+
+def test_roll_up_is_incremental(attempts):
+    roll_up_login_attempts(NOW)
+    db.session.commit()
+    assert roll_up_login_attempts(NOW) == 0
+
+    assert roll_up_login_attempts(NOW + timedelta(hours=1)) == 2
+    assert _count(LoginAttemptHourlyByIp) == 4
+
+
+def test_failed_counts_combine_rollups_and_recent_attempts(attempts):
+    before = LoginAttempt.failed_counts_by_ip()
+
+    roll_up_login_attempts(NOW)
+    db.session.commit()
+
+    assert before == LoginAttempt.failed_counts_by_ip() == [("10.0.0.1", 3), ("10.0.0.2", 2)]
+    assert LoginAttempt.failed_counts_by_identifier()[0] == ("student@example.com", 4)
+
+
+def test_prune_keeps_attempts_that_are_not_rolled_up(attempts):
+    later = NOW + timedelta(days=40)
+
+    assert prune_login_attempts(30, 365, later).attempts_deleted == 0
+
+    roll_up_login_attempts(NOW)
+    db.session.commit()
+    result = prune_login_attempts(30, 365, later)
+
+    assert result.attempts_deleted == 5
+    assert db.session.scalar(select(LoginAttempt.timestamp)) == datetime(2025, 3, 10, 12, 10)
+    assert LoginAttempt.failed_counts_by_ip() == [("10.0.0.1", 3), ("10.0.0.2", 2)]
+
+
+def test_old_rollups_are_pruned(attempts):
+    roll_up_login_attempts(NOW)
+    db.session.commit()
+
+    result = prune_login_attempts(30, 365, NOW + timedelta(days=366))
+
+    assert result.rollups_deleted == 6
+    assert _count(LoginAttemptHourlyByIp) == _count(LoginAttemptHourlyByIdentifier) == 0
+
+
+def test_prune_command(app, attempts):
+    result = app.test_cli_runner().invoke(args=["prune-login-attempts", "--days", "0"])
+
+    assert result.exit_code == 0
+    assert "Added 8 roll-up rows; deleted 6 login attempts" in result.output
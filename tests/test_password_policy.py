@@ -0,0 +1,74 @@
+import pytest
+
+from online_exam import db
+from online_exam.models.user import User
+from online_exam.utils.password_utils import hash_method, hash_password, needs_rehash
+
+pytestmark = pytest.mark.rbac_role("none")
+
+
+def _login(client, password="Password123!"):
+    return client.post("/login", data={"email": "student@example.com", "password": password})
+
+
+def _stored_hash(user_id):
+    db.session.expire_all()
+    return db.session.get(User, user_id).password_hash
+
+
+def _set_hash(user_id, method):
+    user = db.session.get(User, user_id)
+    user.password_hash = hash_password("Password123!", method)
+    db.session.commit()
+
+
+def test_new_hashes_follow_the_configured_policy(sample_student):
+    assert hash_method(sample_student.password_hash) == "pbkdf2:sha256:1000"
+
+
+@pytest.mark.parametrize(
+    "stored, expected",
+    [
+        ("pbkdf2:sha256:1000", False),
+        ("pbkdf2:sha256:600000", False),
+        ("pbkdf2:sha256:500", True),
+        ("pbkdf2:sha1:1000", True),
+        ("scrypt:32768:8:1", True),
+    ],
+)
+def test_needs_rehash(stored, expected):
+    assert needs_rehash(f"{stored}$salt$hash", "pbkdf2:sha256:1000") is expected
+
+
+def test_scrypt_cost_is_compared_per_parameter():
+    policy = "scrypt:32768:8:1"
+    assert needs_rehash("scrypt:16384:8:1$salt$hash", policy)
+    assert not needs_rehash("scrypt:65536:8:1$salt$hash", policy)
+
+
+def test_weak_hash_is_upgraded_on_login(client, sample_student):
+    _set_hash(sample_student.id, "pbkdf2:sha256:500")
+
+    assert _login(client).status_code == 302
+
+    upgraded = _stored_hash(sample_student.id)
+    assert hash_method(upgraded) == "pbkdf2:sha256:1000"
+    client.get("/logout")
+    assert _login(client).status_code == 302
+
+
+def test_stronger_hash_is_kept(client, sample_student):
+    _set_hash(sample_student.id, "pbkdf2:sha256:2000")
+    before = _stored_hash(sample_student.id)
+
+    _login(client)
+
+    assert _stored_hash(sample_student.id) == before
+
+
+def test_failed_login_does_not_rehash(client, sample_student):
+    _set_hash(sample_student.id, "pbkdf2:sha256:500")
+
+    _login(client, "wrong")
+
+    assert hash_method(_stored_hash(sample_student.id)) == "pbkdf2:sha256:500"
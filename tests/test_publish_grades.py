@@ -1,8 +1,15 @@
+import time
 from datetime import datetime
 
-from online_exam import db
+import pytest
+
+from online_exam import create_app, db
 from online_exam.models.exam import Exam
+from online_exam.models.grade_notification import GradeNotification
 from online_exam.models.submission import Submission
+from online_exam.models.user import User
+from online_exam.services.grade_publishing import send_all_notifications, send_pending_notifications
+from online_exam.utils import email_utils
 
 
 def test_publish_grades(client, app):
@@ -35,3 +42,196 @@ def test_publish_grades(client, app):
     # Only graded submission is published
     assert sub1.status == "published"
     assert sub2.status == "pending"
+
+
+def _graded_cohort(exam, names):
+    submissions = [
+        Submission(
+            exam_id=exam.id,
+            student_name=name,
+            status="graded",
+            total_score=8,
+            max_score=10,
+            percentage=80.0,
+            graded_at=datetime.utcnow(),
+        )
+        for name in names
+    ]
+    db.session.add_all(submissions)
+    db.session.commit()
+    return submissions
+
+
+def test_publish_is_set_based(client, app, sql_statements):
+    exam = Exam(title="Bulk Exam", status="published")
+    db.session.add(exam)
+    db.session.commit()
+    _graded_cohort(exam, [f"Student {n}" for n in range(50)])
+    sql_statements.clear()
+
+    response = client.post(f"/exams/{exam.id}/publish_grades", follow_redirects=False)
+
+    statements = [
+        statement.lstrip().split()[0].upper()
+        for statement in sql_statements
+        if "submissions" in statement
+    ]
+    assert response.status_code == 302
+    assert statements == ["INSERT", "UPDATE"]
+    assert Submission.query.filter_by(status="published").count() == 50
+    assert GradeNotification.query.count() == 50
+
+
+def test_nothing_to_publish(client, app):
+    exam = Exam(title="Empty Exam", status="published")
+    db.session.add(exam)
+    db.session.commit()
+
+    response = client.post(f"/exams/{exam.id}/publish_grades", follow_redirects=True)
+
+    assert b"No graded submissions to publish." in response.data
+    assert GradeNotification.query.count() == 0
+
+
+def test_notifications_are_sent_in_batches(client, app, sample_student, monkeypatch):
+    exam = Exam(title="Notified Exam", status="published")
+    db.session.add(exam)
+    db.session.commit()
+    _graded_cohort(exam, [sample_student.name, "Not A User", sample_student.name])
+    client.post(f"/exams/{exam.id}/publish_grades")
+
+    batches = []
+    monkeypatch.setattr(email_utils, "send_grades_published_emails", lambda m: batches.append(m))
+
+    assert send_pending_notifications(limit=2) == 2
+    assert send_pending_notifications(limit=2) == 1
+    assert send_pending_notifications(limit=2) == 0
+
+    sent = [message for batch in batches for message in batch]
+    assert [(user.email, title) for user, title, *_ in sent] == [
+        (sample_student.email, "Notified Exam"),
+        (sample_student.email, "Notified Exam"),
+    ]
+    assert GradeNotification.query.count() == 0
+
+
+def _same_name_students():
+    students = [
+        User(username=f"sam{n}", name="Sam Lee", email=f"s{n}@x", role="student", password_hash="")
+        for n in (1, 2)
+    ]
+    db.session.add_all(students)
+    db.session.commit()
+    return students
+
+
+def test_students_sharing_a_name_get_their_own_scores(client, app, monkeypatch):
+    exam = Exam(title="Twins Exam", status="published")
+    db.session.add(exam)
+    db.session.commit()
+    first, second = _same_name_students()
+    db.session.add_all(
+        Submission(
+            exam_id=exam.id,
+            student_id=student.id,
+            student_name=student.name,
+            status="graded",
+            total_score=score,
+            max_score=10,
+            graded_at=datetime.utcnow(),
+        )
+        for student, score in ((first, 3), (second, 9))
+    )
+    db.session.commit()
+    client.post(f"/exams/{exam.id}/publish_grades")
+
+    sent = []
+    monkeypatch.setattr(email_utils, "send_grades_published_emails", sent.extend)
+    send_all_notifications()
+
+    assert sorted((user.email, score) for user, _, score, *_ in sent) == [("s1@x", 3), ("s2@x", 9)]
+
+
+def test_shared_name_without_an_account_is_not_notified(client, app, monkeypatch):
+    exam = Exam(title="Legacy Exam", status="published")
+    db.session.add(exam)
+    db.session.commit()
+    _same_name_students()
+    _graded_cohort(exam, ["Sam Lee"])
+    client.post(f"/exams/{exam.id}/publish_grades")
+
+    sent = []
+    monkeypatch.setattr(email_utils, "send_grades_published_emails", sent.extend)
+
+    assert send_all_notifications() == 1
+    assert sent == []
+    assert GradeNotification.query.count() == 0
+
+
+def test_student_submission_records_the_account(client, app, sample_student, login_user):
+    exam = Exam(title="Signed Exam", status="published")
+    db.session.add(exam)
+    db.session.commit()
+    login_user(sample_student)
+
+    client.post(f"/student/exams/{exam.id}/submit", data={"student_name": "Someone Else"})
+
+    assert Submission.query.one().student_id == sample_student.id
+
+
+def test_failed_batch_stays_queued(client, app, sample_student, monkeypatch):
+    exam = Exam(title="Retry Exam", status="published")
+    db.session.add(exam)
+    db.session.commit()
+    _graded_cohort(exam, [sample_student.name])
+    client.post(f"/exams/{exam.id}/publish_grades")
+
+    def broken(messages):
+        raise ConnectionError("SMTP down")
+
+    monkeypatch.setattr(email_utils, "send_grades_published_emails", broken)
+    with pytest.raises(ConnectionError):
+        send_all_notifications()
+
+    assert GradeNotification.query.one().attempts == 1
+
+
+def test_background_notifier_sends_after_publish(tmp_path, monkeypatch):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}",
+        }
+    )
+    sent = []
+    monkeypatch.setattr(email_utils, "send_grades_published_emails", sent.extend)
+
+    with app.app_context():
+        db.create_all()
+        instructor = User(
+            username="i", name="I", email="i@example.com", role="instructor", password_hash=""
+        )
+        student = User(
+            username="s", name="Sam", email="s@example.com", role="student", password_hash=""
+        )
+        exam = Exam(title="Live", status="published")
+        db.session.add_all([instructor, student, exam])
+        db.session.commit()
+        _graded_cohort(exam, ["Sam"])
+        instructor_id, exam_id = instructor.id, exam.id
+        db.session.remove()
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = instructor_id
+        session["user_role"] = "instructor"
+    client.post(f"/exams/{exam_id}/publish_grades")
+
+    deadline = time.monotonic() + 10
+    while not sent and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    app.extensions["grade_notifier"]["notifier"].stop(timeout=5)
+    assert [user.email for user, *_ in sent] == ["s@example.com"]
+    with app.app_context():
+        db.engine.dispose()
@@ -0,0 +1,151 @@
+"""Every query issued by the hot routes must be answered from an index.
+
+The routes are exercised against SQLite, each SELECT they issue is captured and
+re-run under ``EXPLAIN QUERY PLAN``; a plain ``SCAN <table>`` step means a full
+table scan.
+"""
+
+import re
+from datetime import datetime
+
+import pytest
+
+from online_exam import db
+from online_exam.models.exam import Exam
+from online_exam.models.login_attempt import LoginAttempt
+from online_exam.models.question import Question
+from online_exam.models.submission import Answer, Submission
+
+TABLES = {
+    "exams",
+    "questions",
+    "submissions",
+    "answers",
+    "users",
+    "login_attempts",
+    "password_reset_tokens",
+}
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@pytest.fixture
+def seeded(app, sample_exam):
+    sample_exam.status = "published"
+    question = Question(
+        exam_id=sample_exam.id,
+        question_text="Pick B",
+        question_type="mcq",
+        points=10,
+        option_a="A",
+        option_b="B",
+        option_c="C",
+        option_d="D",
+        correct_answer="B",
+        order_num=1,
+    )
+    db.session.add_all([question, Exam(title="Draft", status="draft")])
+    db.session.flush()
+
+    submission = Submission(
+        exam_id=sample_exam.id,
+        student_name="Student One",
+        total_score=10,
+        max_score=10,
+        percentage=100.0,
+        status="graded",
+        submitted_at=datetime.utcnow(),
+    )
+    db.session.add(submission)
+    db.session.flush()
+    db.session.add(
+        Answer(
+            submission_id=submission.id,
+            question_id=question.id,
+            selected_option="B",
+            is_correct=True,
+            points_earned=10,
+        )
+    )
+    db.session.add(
+        LoginAttempt(user_identifier="x@example.com", ip_address="10.0.0.1", success=False)
+    )
+    db.session.commit()
+    return sample_exam, submission
+
+
+def _full_scans(statements):
+    scans = []
+    with db.engine.connect() as conn:
+        for statement in statements:
+            if not statement.lstrip().upper().startswith("SELECT") or statement.executemany:
+                continue
+            plan = conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", statement.parameters
+            ).all()
+            for row in plan:
+                match = FULL_SCAN.match(row[-1])
+                if match and match.group(1) in TABLES:
+                    scans.append((statement, row[-1]))
+    return scans
+
+
+def _assert_indexed(client, statements, *urls):
+    statements.clear()
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code in (200, 302), url
+
+    assert statements, "no queries captured"
+    assert _full_scans(statements) == []
+
+
+def test_exam_routes_use_indexes(client, seeded, sql_statements):
+    exam, _ = seeded
+    _assert_indexed(
+        client,
+        sql_statements,
+        "/exams",
+        "/exams?status=draft",
+        "/exams?status=published&sort=oldest",
+        "/exams?paging=keyset",
+        "/exams?paging=keyset&status=draft&sort=oldest",
+        f"/exams/{exam.id}",
+        f"/exams/{exam.id}/preview",
+    )
+
+
+def test_grading_routes_use_indexes(client, seeded, sql_statements):
+    exam, submission = seeded
+    _assert_indexed(
+        client,
+        sql_statements,
+        f"/exams/{exam.id}/submissions",
+        f"/exams/submissions/{submission.id}",
+        f"/exams/submissions/{submission.id}/grade",
+    )
+
+
+@pytest.mark.rbac_role("admin")
+def test_analytics_routes_use_indexes(client, seeded, sql_statements):
+    exam, _ = seeded
+    _assert_indexed(
+        client,
+        sql_statements,
+        "/analytics/login-attempts",
+        f"/analytics/exams/{exam.id}/report",
+        f"/analytics/exams/{exam.id}/export",
+        f"/analytics/exams/{exam.id}/export/csv",
+    )
+
+
+@pytest.mark.rbac_role("student")
+def test_student_routes_use_indexes(client, seeded, sql_statements):
+    exam, submission = seeded
+    _assert_indexed(
+        client,
+        sql_statements,
+        "/student/dashboard",
+        f"/student/exams/{exam.id}/take",
+        f"/student/submissions/{submission.id}/results",
+        f"/student/submissions/{submission.id}/download",
+    )
@@ -0,0 +1,197 @@
+import pytest
+
+from online_exam import db
+from online_exam.models.user import User
+from online_exam.services.rate_limit import MemoryBackend, RateLimitBackend
+from online_exam.utils.otp_utils import hash_otp, otp_expiry_time
+
+pytestmark = pytest.mark.rbac_role("none")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingBackend(RateLimitBackend):
+    """Stands in for a backend shared by all workers."""
+
+    def __init__(self):
+        self.counts = {}
+
+    def hit(self, key, limit, period):
+        self.counts[key] = self.counts.get(key, 0) + 1
+        return 0.0 if self.counts[key] <= limit else period
+
+    def peek(self, key, limit, period):
+        return 0.0 if self.counts.get(key, 0) < limit else period
+
+
+@pytest.fixture
+def limits(app):
+    app.config.update(RATE_LIMIT_PER_IP=(5, 60), RATE_LIMIT_PER_ACCOUNT=(3, 300))
+
+
+@pytest.fixture
+def password_checks(monkeypatch):
+    checks = []
+    verify_password = User.verify_password
+
+    def counting(user, password):
+        checks.append(user.email)
+        return verify_password(user, password)
+
+    monkeypatch.setattr(User, "verify_password", counting)
+    return checks
+
+
+def _login(client, email="student@example.com", ip="10.0.0.1", password="wrong"):
+    return client.post(
+        "/login",
+        data={"email": email, "password": password},
+        environ_base={"REMOTE_ADDR": ip},
+    )
+
+
+def test_bucket_refills_over_its_period():
+    clock = FakeClock()
+    backend = MemoryBackend(clock=clock)
+
+    assert [backend.hit("key", 3, 60) for _ in range(3)] == [0, 0, 0]
+    assert backend.hit("key", 3, 60) == pytest.approx(20)
+
+    clock.now += 20
+    assert backend.hit("key", 3, 60) == 0
+    assert backend.hit("key", 3, 60) > 0
+
+
+def test_least_recently_used_buckets_are_dropped():
+    backend = MemoryBackend(max_keys=2)
+    for key in ("a", "b", "a", "c"):
+        backend.hit(key, 1, 60)
+
+    assert len(backend) == 2
+    assert backend.hit("a", 1, 60) > 0
+    # "b" was forgotten, so its bucket is full again
+    assert backend.hit("b", 1, 60) == 0
+
+
+def test_account_burst_is_rejected_before_hashing(client, sample_student, limits, password_checks):
+    statuses = [_login(client).status_code for _ in range(4)]
+
+    assert statuses == [200, 200, 200, 429]
+    assert len(password_checks) == 3
+
+
+def test_successful_logins_do_not_use_the_account_limit(client, sample_student, limits):
+    for number in range(4):
+        assert _login(client, ip=f"10.0.0.{number}", password="Password123!").status_code == 302
+
+    assert _login(client, ip="10.0.1.1").status_code == 200
+
+
+def test_failed_logins_from_anywhere_lock_the_account(client, sample_student, limits):
+    for number in range(3):
+        _login(client, ip=f"10.0.0.{number}")
+
+    assert _login(client, ip="10.0.1.1", password="Password123!").status_code == 429
+
+
+def test_rejection_says_when_to_retry(client, sample_student, limits):
+    for _ in range(3):
+        _login(client)
+
+    response = _login(client)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "100"
+    assert b"Too many attempts" in response.data
+
+
+def test_ip_limit_spans_accounts(client, limits, password_checks):
+    statuses = [_login(client, f"user{number}@example.com").status_code for number in range(6)]
+
+    assert statuses[-1] == 429
+    assert _login(client, "user0@example.com", ip="10.0.0.2").status_code == 200
+
+
+def test_forwarded_header_does_not_escape_the_ip_limit(client, limits):
+    statuses = [
+        client.post(
+            "/login",
+            data={"email": f"user{number}@example.com", "password": "wrong"},
+            headers={"X-Forwarded-For": f"198.51.100.{number}"},
+        ).status_code
+        for number in range(6)
+    ]
+
+    assert statuses[-1] == 429
+
+
+def test_forwarding_proxy_without_trusted_proxy_count_is_logged(client, caplog):
+    for number in range(2):
+        client.get("/login", headers={"X-Forwarded-For": f"198.51.100.{number}"})
+
+    warnings = [record for record in caplog.records if "TRUSTED_PROXY_COUNT" in record.message]
+    assert len(warnings) == 1
+
+
+def test_reset_emails_are_limited_without_refusing_requests(
+    client, sample_student, limits, monkeypatch
+):
+    sent = []
+    monkeypatch.setattr(
+        "online_exam.routes.auth_routes.send_password_reset_email",
+        lambda user, url: sent.append(url),
+    )
+
+    statuses = [
+        client.post("/reset-password", data={"email": "student@example.com"}).status_code
+        for _ in range(4)
+    ]
+
+    assert statuses == [302, 302, 302, 302]
+    assert len(sent) == 3
+
+
+def test_reset_requests_are_limited_per_ip(client, limits):
+    statuses = [
+        client.post("/reset-password", data={"email": f"user{number}@example.com"}).status_code
+        for number in range(6)
+    ]
+
+    assert statuses[-1] == 429
+
+
+def test_otp_guesses_are_limited(client, sample_student, limits):
+    user = db.session.get(User, sample_student.id)
+    user.two_factor_enabled = True
+    user.otp_code = hash_otp("123456")
+    user.otp_expires_at = otp_expiry_time()
+    db.session.commit()
+    with client.session_transaction() as session:
+        session["pending_2fa_user_id"] = user.id
+
+    statuses = [
+        client.post("/auth/verify-otp", data={"otp": "000000"}).status_code for _ in range(4)
+    ]
+
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_shared_backend_is_used(app, client, sample_student):
+    backend = RecordingBackend()
+    app.config["RATE_LIMIT_BACKEND"] = backend
+
+    _login(client)
+
+    assert backend.counts == {"login:ip:10.0.0.1": 1, "login:account:student@example.com": 1}
+
+
+def test_rate_limiting_can_be_disabled(app, client, sample_student, limits):
+    app.config["RATE_LIMIT_ENABLED"] = False
+
+    assert {_login(client).status_code for _ in range(5)} == {200}
@@ -0,0 +1,119 @@
+import shutil
+
+import pytest
+
+from online_exam import create_app, db
+from online_exam.models.exam import Exam
+from online_exam.models.user import User
+from online_exam.services.db_routing import replica_engines
+
+
+@pytest.fixture
+def replicated(tmp_path):
+    """A primary and a replica SQLite file; ``sync()`` replays the primary onto the replica."""
+    primary = tmp_path / "primary.db"
+    replica = tmp_path / "replica.db"
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{primary}",
+            "SQLALCHEMY_REPLICA_URIS": [f"sqlite:///{replica}"],
+            "REPLICA_READ_YOUR_WRITES_SECONDS": 30,
+        }
+    )
+
+    with app.app_context():
+        db.create_all()
+        instructor = User(
+            username="primary-instructor",
+            name="Primary Instructor",
+            email="primary@example.com",
+            role="instructor",
+            password_hash="",
+        )
+        db.session.add(instructor)
+        db.session.commit()
+        instructor_id = instructor.id
+
+        def sync():
+            db.session.remove()
+            for engine in [db.engine, *replica_engines()]:
+                engine.dispose()
+            shutil.copyfile(primary, replica)
+
+        sync()
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["user_id"] = instructor_id
+            session["user_role"] = "instructor"
+
+        yield app, client, sync
+
+        db.session.remove()
+        for engine in [db.engine, *replica_engines()]:
+            engine.dispose()
+
+
+def _add_exam(title):
+    db.session.add(Exam(title=title, status="draft"))
+    db.session.commit()
+    db.session.remove()
+
+
+def test_replica_engines_configured(replicated):
+    app, _, _ = replicated
+    [replica] = replica_engines(app)
+    assert replica.url.database.endswith("replica.db")
+    assert replica.pool.size() == app.config["DB_POOL_SIZE"]
+
+
+def test_read_only_views_are_served_by_the_replica(replicated):
+    _, client, sync = replicated
+    _add_exam("Written Only To Primary")
+
+    assert b"Written Only To Primary" not in client.get("/exams").data
+
+    sync()
+    assert b"Written Only To Primary" in client.get("/exams").data
+
+
+def test_own_writes_are_read_from_the_primary(replicated):
+    _, client, _ = replicated
+
+    response = client.post("/exams/create", data={"title": "My New Exam", "description": "d"})
+    assert response.status_code == 302
+
+    assert b"My New Exam" in client.get("/exams").data
+
+
+def test_read_your_writes_window_expires(replicated):
+    app, client, _ = replicated
+    app.config["REPLICA_READ_YOUR_WRITES_SECONDS"] = 0
+
+    client.post("/exams/create", data={"title": "Not Replicated Yet", "description": "d"})
+
+    assert b"Not Replicated Yet" not in client.get("/exams").data
+
+
+def test_writes_always_go_to_the_primary(replicated):
+    _, client, _ = replicated
+
+    client.post("/exams/create", data={"title": "Primary Row", "description": "d"})
+
+    assert db.session.execute(db.select(Exam.title)).scalars().all() == ["Primary Row"]
+    replica_titles = db.session.execute(
+        db.select(Exam.title), bind_arguments={"bind": replica_engines()[0]}
+    )
+    assert replica_titles.scalars().all() == []
+
+
+def test_report_builds_missing_stats_on_the_primary(replicated):
+    _, client, sync = replicated
+    _add_exam("Reported Exam")
+    sync()
+    exam_id = db.session.execute(db.select(Exam.id)).scalar_one()
+
+    assert client.get(f"/analytics/exams/{exam_id}/report").status_code == 200
+    # Rebuilt again on the next request, since the replica still lacks the row
+    assert client.get(f"/analytics/exams/{exam_id}/report").status_code == 200
@@ -0,0 +1,138 @@
+from online_exam import db
+from online_exam.commands import regrade_exam_command
+from online_exam.models.question import Question
+from online_exam.models.submission import Answer, Submission
+
+
+def _setup_exam(exam_id):
+    mcq = Question(
+        exam_id=exam_id,
+        question_text="Pick one",
+        question_type="mcq",
+        points=10,
+        option_a="A",
+        option_b="B",
+        option_c="C",
+        option_d="D",
+        correct_answer="A",
+        order_num=1,
+    )
+    written = Question(
+        exam_id=exam_id,
+        question_text="Explain",
+        question_type="written",
+        points=10,
+        order_num=2,
+    )
+    db.session.add_all([mcq, written])
+    db.session.commit()
+
+    submissions = []
+    for name, option, written_points in [("Alice", "A", 7), ("Bob", "B", 4), ("Cara", None, 0)]:
+        submission = Submission(exam_id=exam_id, student_name=name, status="graded")
+        db.session.add(submission)
+        db.session.flush()
+        if option:
+            db.session.add(
+                Answer(
+                    submission_id=submission.id,
+                    question_id=mcq.id,
+                    selected_option=option,
+                    is_correct=option == "A",
+                    points_earned=10 if option == "A" else 0,
+                )
+            )
+        db.session.add(
+            Answer(
+                submission_id=submission.id,
+                question_id=written.id,
+                answer_text="text",
+                points_earned=written_points,
+            )
+        )
+        submission.total_score = (10 if option == "A" else 0) + written_points
+        submission.max_score = 20
+        submission.calculate_percentage()
+        submissions.append(submission)
+
+    db.session.commit()
+    return mcq, written, submissions
+
+
+def test_regrade_after_key_correction(client, sample_exam):
+    mcq, written, (alice, bob, cara) = _setup_exam(sample_exam.id)
+
+    # The key was wrong: the right answer is B
+    mcq.correct_answer = "B"
+    db.session.commit()
+
+    response = client.post(f"/exams/{sample_exam.id}/regrade", follow_redirects=True)
+    assert response.status_code == 200
+    assert b"Re-graded 3 submissions" in response.data
+
+    db.session.expire_all()
+    assert db.session.get(Submission, alice.id).total_score == 7
+    assert db.session.get(Submission, bob.id).total_score == 14
+    assert db.session.get(Submission, bob.id).percentage == 70.0
+    assert db.session.get(Submission, cara.id).total_score == 0
+
+    bob_mcq = Answer.query.filter_by(submission_id=bob.id, question_id=mcq.id).one()
+    assert bob_mcq.is_correct is True
+    assert bob_mcq.points_earned == 10
+    # Manually graded written answers are untouched
+    bob_written = Answer.query.filter_by(submission_id=bob.id, question_id=written.id).one()
+    assert bob_written.points_earned == 4
+
+
+def test_regrade_compares_answers_longer_than_one_character(client, sample_exam):
+    mcq, _, (alice, bob, _) = _setup_exam(sample_exam.id)
+    mcq.correct_answer = "Option B"
+    answers = {
+        answer.submission_id: answer for answer in Answer.query.filter_by(question_id=mcq.id)
+    }
+    answers[alice.id].selected_option = "Option A"
+    answers[bob.id].selected_option = "Option B"
+    db.session.commit()
+
+    client.post(f"/exams/{sample_exam.id}/regrade")
+
+    db.session.expire_all()
+    assert db.session.get(Submission, alice.id).total_score == 7
+    assert db.session.get(Submission, bob.id).total_score == 14
+
+
+def test_regrade_cli_command(app, sample_exam):
+    mcq, _, (alice, bob, _) = _setup_exam(sample_exam.id)
+    mcq.correct_answer = "B"
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(regrade_exam_command, [str(sample_exam.id)])
+
+    assert result.exit_code == 0
+    assert "Re-graded 3 submissions" in result.output
+    db.session.expire_all()
+    assert db.session.get(Submission, alice.id).total_score == 7
+    assert db.session.get(Submission, bob.id).total_score == 14
+
+
+def test_regrade_cli_unknown_exam(app):
+    result = app.test_cli_runner().invoke(regrade_exam_command, ["9999"])
+
+    assert result.exit_code != 0
+    assert "not found" in result.output
+
+
+def test_regrade_compares_whole_answers(client, sample_exam):
+    mcq, _, (alice, _, _) = _setup_exam(sample_exam.id)
+    answer = Answer.query.filter_by(submission_id=alice.id, question_id=mcq.id).one()
+    answer.selected_option = "AZZ"
+    answer.is_correct = False
+    answer.points_earned = 0
+    db.session.commit()
+
+    client.post(f"/exams/{sample_exam.id}/regrade")
+
+    db.session.expire_all()
+    answer = db.session.get(Answer, answer.id)
+    assert (answer.is_correct, answer.points_earned) == (False, 0)
+    assert db.session.get(Submission, alice.id).total_score == 7
@@ -0,0 +1,75 @@
+from online_exam import db
+from online_exam.models.submission import Submission
+from online_exam.services.reporting import summarize_exam_scores
+
+
+def _add_submissions(exam_id, percentages):
+    db.session.add_all(
+        [
+            Submission(
+                exam_id=exam_id,
+                student_name=f"Student {n}",
+                total_score=int(p),
+                max_score=100,
+                percentage=p,
+                status="graded",
+            )
+            for n, p in enumerate(percentages)
+        ]
+    )
+    db.session.commit()
+
+
+def test_summary_matches_python_statistics(sample_exam):
+    percentages = [95.0, 90.0, 89.5, 72.0, 65.0, 50.0, 49.99, 10.0]
+    _add_submissions(sample_exam.id, percentages)
+
+    summary = summarize_exam_scores(sample_exam.id)
+
+    assert summary.total_submissions == 8
+    assert summary.total_score == sum(int(p) for p in percentages)
+    assert summary.highest_score == 95
+    assert summary.lowest_score == 10
+    assert summary.passed == 6
+    assert summary.failed == 2
+    assert summary.pass_rate == 75.0
+    assert summary.score_ranges == {
+        "90-100": 2,
+        "80-89": 1,
+        "70-79": 1,
+        "60-69": 1,
+        "50-59": 1,
+        "Below 50": 2,
+    }
+
+
+def test_summary_for_exam_without_submissions(sample_exam):
+    summary = summarize_exam_scores(sample_exam.id)
+
+    assert summary.total_submissions == 0
+    assert summary.avg_score == 0
+    assert summary.pass_rate == 0
+    assert summary.fail_rate == 0
+
+
+def test_report_statistics_come_from_one_query(client, sample_exam, sql_statements):
+    _add_submissions(sample_exam.id, [80.0, 40.0, 60.0])
+    sql_statements.clear()
+
+    response = client.get(f"/analytics/exams/{sample_exam.id}/report")
+
+    statements = [statement for statement in sql_statements if "FROM submissions" in statement]
+    assert response.status_code == 200
+    # One aggregate row to build the stats plus one page of the detailed table
+    assert len(statements) == 2
+
+
+def test_report_detailed_table_is_paginated(client, sample_exam):
+    _add_submissions(sample_exam.id, [70.0] * 55)
+
+    first = client.get(f"/analytics/exams/{sample_exam.id}/report")
+    second = client.get(f"/analytics/exams/{sample_exam.id}/report?page=2")
+
+    assert first.data.count(b"<td>Student ") == 50
+    assert second.data.count(b"<td>Student ") == 5
+    assert b'<h2 class="mb-0">55</h2>' in second.data
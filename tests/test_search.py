@@ -0,0 +1,181 @@
+import pytest
+
+from online_exam import db
+from online_exam.models.exam import Exam
+from online_exam.models.question import Question
+from online_exam.services.search import (
+    DEFAULT_LIMIT,
+    LikeBackend,
+    backend_for,
+    include_in_migrations,
+    reindex_all,
+    search_exams,
+    search_words,
+)
+
+
+@pytest.fixture
+def catalog(app):
+    algebra = Exam(
+        title="Linear Algebra Midterm",
+        description="Vectors and matrices",
+        instructions="<p>Show <strong>all</strong> working</p>",
+        status="published",
+    )
+    biology = Exam(title="Biology Basics", description="Cells", status="draft")
+    chemistry = Exam(title="Chemistry Quiz", description="Reactions", status="draft")
+    db.session.add_all([algebra, biology, chemistry])
+    db.session.flush()
+    db.session.add_all(
+        [
+            Question(
+                exam_id=biology.id,
+                question_text="Which organelle produces energy?",
+                question_type="mcq",
+                points=5,
+                option_a="Mitochondria",
+                option_b="Ribosome",
+                option_c="Nucleus",
+                option_d="Golgi",
+                correct_answer="A",
+                order_num=1,
+            ),
+            Question(
+                exam_id=chemistry.id,
+                question_text="Explain how algebraic balancing of equations works.",
+                question_type="written",
+                points=10,
+                order_num=1,
+            ),
+        ]
+    )
+    db.session.commit()
+    return algebra, biology, chemistry
+
+
+def _ids(term):
+    return [hit.exam_id for hit in search_exams(term)]
+
+
+def test_search_words_strip_query_syntax():
+    assert search_words('Alg* "OR" NEAR(x)') == ["alg", "or", "near", "x"]
+    assert search_exams("  ?! ") == []
+
+
+def test_matches_title_description_instructions_and_questions(catalog):
+    algebra, biology, _ = catalog
+
+    assert _ids("matrices") == [algebra.id]
+    assert _ids("working") == [algebra.id]
+    assert _ids("organelle") == [biology.id]
+    assert _ids("mitochondria") == [biology.id]
+    assert _ids("strong") == []
+
+
+def test_prefix_matching_and_every_word_required(catalog):
+    algebra, biology, _ = catalog
+
+    assert _ids("mitoch") == [biology.id]
+    assert _ids("linear alg") == [algebra.id]
+    assert _ids("linear cells") == []
+
+
+def test_title_matches_rank_first(catalog):
+    algebra, _, chemistry = catalog
+
+    assert _ids("algebra") == [algebra.id, chemistry.id]
+
+
+def test_index_follows_updates_and_deletes(catalog):
+    algebra, biology, _ = catalog
+
+    algebra.title = "Geometry Final"
+    db.session.commit()
+    assert algebra.id not in _ids("linear")
+    assert _ids("geometry") == [algebra.id]
+
+    db.session.delete(biology)
+    db.session.commit()
+    assert _ids("mitochondria") == []
+    assert _ids("biology") == []
+
+
+def test_reindex_rebuilds_from_tables(catalog):
+    algebra, biology, chemistry = catalog
+
+    assert reindex_all(db.session.connection()) == 5
+    db.session.commit()
+
+    assert _ids("algebra") == [algebra.id, chemistry.id]
+    assert _ids("ribosome") == [biology.id]
+
+
+def test_like_fallback_finds_the_same_exams(catalog):
+    algebra, _, chemistry = catalog
+    hits = LikeBackend().search(db.session.connection(), ["algebra"], 10)
+
+    assert [hit.exam_id for hit in hits] == [algebra.id, chemistry.id]
+
+
+def test_exam_list_search_covers_questions(client, catalog):
+    response = client.get("/exams?search=organelle")
+
+    table = response.data.split(b"<tbody>")[1].split(b"</tbody>")[0]
+    assert b"Biology Basics" in table
+    assert b"Linear Algebra" not in table
+
+
+def _list_table(client, query):
+    return client.get(f"/exams?{query}").data.split(b"<tbody>")[1].split(b"</tbody>")[0]
+
+
+def test_exam_list_search_keeps_infix_and_short_terms(client, catalog):
+    assert b"Linear Algebra" in _list_table(client, "search=gebra")
+    assert b"Chemistry Quiz" in _list_table(client, "search=Qu")
+    assert b"Biology Basics" not in _list_table(client, "search=Qu")
+
+
+def test_exam_list_search_is_not_capped_before_filtering(client, app):
+    db.session.add_all(Exam(title=f"Quiz {n}", status="draft") for n in range(520))
+    db.session.add_all(
+        Exam(title=f"Quiz with a much longer and lower ranked title {n}", status="published")
+        for n in range(3)
+    )
+    db.session.commit()
+
+    table = _list_table(client, "search=quiz&status=published")
+
+    assert table.count(b"much longer") == 3
+
+
+def test_search_endpoint_returns_ranked_results(client, catalog):
+    algebra, _, chemistry = catalog
+
+    results = client.get("/exams/search?q=algeb").get_json()["results"]
+
+    assert [result["id"] for result in results] == [algebra.id, chemistry.id]
+    assert results[0]["title"] == "Linear Algebra Midterm"
+    assert results[0]["score"] > results[1]["score"]
+
+
+@pytest.mark.parametrize(("limit", "expected"), [(-1, 1), (0, 1), (1, 1), (10**9, DEFAULT_LIMIT)])
+def test_search_endpoint_clamps_the_limit(client, catalog, monkeypatch, limit, expected):
+    backend = type(backend_for(db.session.connection()))
+    search = backend.search
+    limits = []
+
+    def recording_search(self, connection, words, limit):
+        limits.append(limit)
+        return search(self, connection, words, limit)
+
+    monkeypatch.setattr(backend, "search", recording_search)
+    results = client.get(f"/exams/search?q=algeb&limit={limit}").get_json()["results"]
+
+    assert limits == [expected]
+    assert len(results) == min(expected, 2)
+
+
+def test_search_index_excluded_from_autogenerate():
+    assert include_in_migrations("exams", "table", {}) is True
+    assert include_in_migrations("search_index", "table", {}) is False
+    assert include_in_migrations("search_index_data", "table", {}) is False
@@ -0,0 +1,89 @@
+import pytest
+
+from online_exam import db
+from online_exam.models.question import Question
+from online_exam.models.submission import Answer, Submission
+from online_exam.services.answer_key import AnswerKey
+from online_exam.services.submission_ingest import grade_form, ingest_submission
+
+pytestmark = pytest.mark.rbac_role("student")
+
+
+def _make_questions(exam_id):
+    mcq = Question(
+        exam_id=exam_id,
+        question_text="Pick B",
+        question_type="mcq",
+        points=5,
+        option_a="A",
+        option_b="B",
+        option_c="C",
+        option_d="D",
+        correct_answer="B",
+        order_num=1,
+    )
+    skipped = Question(
+        exam_id=exam_id,
+        question_text="Pick C",
+        question_type="mcq",
+        points=5,
+        option_a="A",
+        option_b="B",
+        option_c="C",
+        option_d="D",
+        correct_answer="C",
+        order_num=2,
+    )
+    written = Question(
+        exam_id=exam_id,
+        question_text="Explain",
+        question_type="written",
+        points=10,
+        order_num=3,
+    )
+    db.session.add_all([mcq, skipped, written])
+    db.session.commit()
+    return mcq, skipped, written
+
+
+def test_grade_form_scores_in_memory(sample_exam):
+    mcq, skipped, written = _make_questions(sample_exam.id)
+
+    key = AnswerKey.from_questions(sample_exam.id, None, [mcq, skipped, written])
+    graded = grade_form(
+        key,
+        {f"question_{mcq.id}": " b ", f"question_{written.id}": "  my answer  "},
+    )
+
+    assert graded.total_score == 5
+    assert graded.max_score == 20
+    assert graded.percentage == 25.0
+    assert graded.has_written_questions is True
+    # Unanswered MCQ produces no row
+    assert [row["question_id"] for row in graded.answer_rows] == [mcq.id, written.id]
+    assert graded.answer_rows[0]["selected_option"] == "B"
+    assert graded.answer_rows[1]["answer_text"] == "my answer"
+
+
+def test_ingest_writes_answers_in_one_statement(app, sample_exam, sql_statements):
+    mcq, skipped, written = _make_questions(sample_exam.id)
+    key = AnswerKey.from_questions(sample_exam.id, None, [mcq, skipped, written])
+    graded = grade_form(
+        key,
+        {f"question_{mcq.id}": "A", f"question_{skipped.id}": "C", f"question_{written.id}": "x"},
+    )
+    sql_statements.clear()
+
+    submission_id = ingest_submission(sample_exam.id, "Bulk Student", graded, "pending")
+    db.session.commit()
+
+    answer_inserts = [s for s in sql_statements if s.startswith("INSERT INTO answers")]
+    assert len(answer_inserts) == 1
+
+    submission = db.session.get(Submission, submission_id)
+    assert submission.total_score == 5
+    assert submission.max_score == 20
+    assert submission.percentage == 25.0
+    assert submission.status == "pending"
+    assert submission.submitted_at is not None
+    assert Answer.query.filter_by(submission_id=submission_id).count() == 3
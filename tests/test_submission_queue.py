@@ -0,0 +1,274 @@
+import sqlite3
+import time
+
+import pytest
+
+from online_exam import create_app, db
+from online_exam.models.exam import Exam
+from online_exam.models.exam_stats import ExamStats
+from online_exam.models.question import Question
+from online_exam.models.submission import Answer, Submission
+from online_exam.models.user import User
+from online_exam.services import submission_queue
+from online_exam.services.submission_queue import (
+    MAX_ATTEMPTS,
+    SubmissionQueue,
+    SubmissionWorkers,
+    drain,
+    get_submission_queue,
+    store_queued,
+)
+
+pytestmark = pytest.mark.rbac_role("student")
+
+
+@pytest.fixture
+def queue(app, tmp_path):
+    app.config["SUBMISSION_QUEUE_PATH"] = str(tmp_path / "queue.db")
+    app.config["SUBMISSION_QUEUE_WORKERS"] = 0
+    return get_submission_queue(app)
+
+
+def _submit(client, exam, question, choice="B", **extra):
+    data = {"student_name": "Queued Student", f"question_{question.id}": choice, **extra}
+    return client.post(f"/student/exams/{exam.id}/submit/queued", data=data)
+
+
+def test_submit_is_accepted_before_it_is_stored(client, queue, published, sample_mcq_question):
+    exam, question = published, sample_mcq_question
+
+    response = _submit(client, exam, question)
+
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body["status"] == "queued"
+    assert response.headers["Location"] == body["status_url"]
+    assert Submission.query.count() == 0
+    assert client.get(body["status_url"]).get_json()["status"] == "queued"
+
+
+def test_drained_submission_matches_the_regular_submit(
+    client, queue, published, sample_mcq_question, sample_student
+):
+    exam, question = published, sample_mcq_question
+    ticket = _submit(client, exam, question).get_json()["ticket"]
+
+    assert drain(queue) == 1
+
+    submission = Submission.query.one()
+    assert submission.queue_ticket == ticket
+    assert submission.student_id == sample_student.id
+    assert submission.status == "graded"
+    assert (submission.total_score, submission.max_score, submission.percentage) == (10, 10, 100.0)
+    assert Answer.query.filter_by(submission_id=submission.id).one().is_correct
+    assert db.session.get(ExamStats, exam.id).submission_count == 1
+
+    status = client.get(f"/student/submissions/queued/{ticket}").get_json()
+    assert status["status"] == "done"
+    assert status["submission_id"] == submission.id
+    assert status["results_url"] == f"/student/submissions/{submission.id}/results"
+
+
+def test_exam_with_written_questions_stays_pending(client, queue, published, sample_mcq_question):
+    exam, question = published, sample_mcq_question
+    written = Question(
+        exam_id=exam.id,
+        question_text="Explain.",
+        question_type="written",
+        points=10,
+        order_num=2,
+    )
+    db.session.add(written)
+    db.session.commit()
+
+    _submit(client, exam, question, **{f"question_{written.id}": "Because."})
+    drain(queue)
+
+    assert Submission.query.one().status == "pending"
+
+
+@pytest.mark.parametrize(
+    "change, expected",
+    [
+        ({"student_name": ""}, 400),
+        ({"question_9999": "A"}, 400),
+        ({"question_x": "A"}, 400),
+    ],
+)
+def test_invalid_forms_are_rejected(
+    client, queue, published, sample_mcq_question, change, expected
+):
+    exam, question = published, sample_mcq_question
+    data = {"student_name": "Queued Student", f"question_{question.id}": "B", **change}
+
+    response = client.post(f"/student/exams/{exam.id}/submit/queued", data=data)
+
+    assert response.status_code == expected
+    assert queue.pending_count() == 0
+
+
+def test_invalid_choice_is_rejected(client, queue, published, sample_mcq_question):
+    exam, question = published, sample_mcq_question
+    assert _submit(client, exam, question, choice="E").status_code == 400
+
+
+def test_unpublished_exam_is_not_found(client, queue, sample_exam, sample_mcq_question):
+    assert _submit(client, sample_exam, sample_mcq_question).status_code == 404
+
+
+def test_queue_file_without_student_ids_is_upgraded(tmp_path):
+    path = tmp_path / "old.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE queued_submissions (id INTEGER PRIMARY KEY, ticket TEXT NOT NULL UNIQUE, "
+            "exam_id INTEGER NOT NULL, student_name TEXT NOT NULL, form TEXT NOT NULL, "
+            "submitted_at TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'queued', "
+            "attempts INTEGER NOT NULL DEFAULT 0, submission_id INTEGER, error TEXT, "
+            "claimed_at REAL)"
+        )
+    connection.close()
+
+    queue = SubmissionQueue(str(path))
+    queue.enqueue(1, "S", {}, student_id=7)
+
+    assert [item.student_id for item in queue.claim()] == [7]
+
+
+def test_unknown_ticket(client, queue):
+    assert client.get("/student/submissions/queued/nope").status_code == 404
+
+
+def test_replayed_entry_is_stored_once(client, queue, published, sample_mcq_question):
+    exam, question = published, sample_mcq_question
+    _submit(client, exam, question)
+
+    # A worker stores the submission, then dies before marking the entry done
+    [item] = queue.claim()
+    store_queued(item)
+    db.session.commit()
+
+    assert queue.requeue_stale(older_than=0) == 1
+    assert drain(queue) == 1
+    assert Submission.query.count() == 1
+
+
+def test_failing_entry_is_retried_then_parked(client, queue, published, sample_mcq_question):
+    exam, question = published, sample_mcq_question
+    ticket = _submit(client, exam, question).get_json()["ticket"]
+    db.session.delete(exam)
+    db.session.commit()
+
+    assert drain(queue) == MAX_ATTEMPTS
+
+    status = queue.status(ticket)
+    assert status.status == "failed"
+    assert "no longer exists" in status.error
+
+
+def test_queued_submit_discards_the_draft(client, queue, published, sample_mcq_question):
+    exam, question = published, sample_mcq_question
+    client.post(f"/student/exams/{exam.id}/draft", json={"answers": {str(question.id): "C"}})
+
+    assert _submit(client, exam, question).status_code == 202
+    assert client.get(f"/student/exams/{exam.id}/draft").status_code == 404
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 10
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_worker_survives_a_failing_drain(app, queue, monkeypatch):
+    calls = []
+
+    def flaky_drain(queue):
+        calls.append(queue)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return 0
+
+    monkeypatch.setattr(submission_queue, "POLL_SECONDS", 0.01)
+    monkeypatch.setattr(submission_queue, "drain_once", flaky_drain)
+    workers = SubmissionWorkers(app, queue, 1)
+    workers.start()
+    try:
+        assert _wait_for(lambda: len(calls) >= 3)
+    finally:
+        workers.stop(timeout=5)
+
+
+def test_workers_requeue_stale_entries_while_running(app, queue, monkeypatch):
+    requeued = []
+    monkeypatch.setattr(submission_queue, "POLL_SECONDS", 0.01)
+    monkeypatch.setattr(submission_queue, "REQUEUE_EVERY_SECONDS", 0.02)
+    monkeypatch.setattr(submission_queue, "drain_once", lambda queue: 0)
+    monkeypatch.setattr(queue, "requeue_stale", lambda: requeued.append(1))
+    workers = SubmissionWorkers(app, queue, 2)
+    workers.start()
+    try:
+        assert _wait_for(lambda: len(requeued) >= 3)
+    finally:
+        workers.stop(timeout=5)
+
+
+def test_background_workers_drain_the_queue(tmp_path):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}",
+            "SUBMISSION_QUEUE_PATH": str(tmp_path / "queue.db"),
+            "SUBMISSION_QUEUE_WORKERS": 2,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        student = User(
+            username="s", name="S", email="s@example.com", role="student", password_hash=""
+        )
+        exam = Exam(title="Live", status="published")
+        db.session.add_all([student, exam])
+        db.session.flush()
+        question = Question(
+            exam_id=exam.id,
+            question_text="Pick B",
+            question_type="mcq",
+            points=5,
+            option_a="A",
+            option_b="B",
+            option_c="C",
+            option_d="D",
+            correct_answer="B",
+            order_num=1,
+        )
+        db.session.add(question)
+        db.session.commit()
+        student_id, exam_id, question_id = student.id, exam.id, question.id
+        db.session.remove()
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = student_id
+        session["user_role"] = "student"
+
+    urls = [
+        client.post(
+            f"/student/exams/{exam_id}/submit/queued",
+            data={"student_name": f"S{n}", f"question_{question_id}": "B"},
+        ).get_json()["status_url"]
+        for n in range(10)
+    ]
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if all(client.get(url).get_json()["status"] == "done" for url in urls):
+            break
+        time.sleep(0.05)
+
+    workers = app.extensions["submission_queue"]["workers"]
+    workers.stop(timeout=5)
+    with app.app_context():
+        assert Submission.query.count() == 10
+        db.session.remove()
+        db.engine.dispose()
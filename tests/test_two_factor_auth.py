@@ -1,8 +1,12 @@
 import pytest
 from datetime import datetime, timedelta
 
+from sqlalchemy import update
+
 from online_exam import db
 from online_exam.models.user import User
+from online_exam.routes import auth_routes
+from online_exam.utils.otp_utils import generate_totp_secret, hash_otp, totp_code, verify_totp
 
 pytestmark = pytest.mark.rbac_role("none")
 
@@ -128,3 +132,164 @@ def test_otp_cannot_be_reused(client, sample_instructor, app, monkeypatch):
         user = db.session.get(User, sample_instructor.id)
         assert user.otp_code is None
         assert user.two_factor_enabled is True
+
+
+RFC_SECRET = "GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ"  # b"12345678901234567890"
+
+
+@pytest.mark.parametrize(
+    "at, code", [(59, "287082"), (1111111109, "081804"), (2000000000, "279037")]
+)
+def test_totp_matches_rfc_6238_vectors(at, code):
+    assert totp_code(RFC_SECRET, at) == code
+    assert verify_totp(RFC_SECRET, code, at + 30)
+    assert not verify_totp(RFC_SECRET, code, at + 90)
+
+
+def test_emailed_code_is_stored_as_hmac(client, sample_instructor, app, monkeypatch):
+    _enable_2fa(sample_instructor)
+    monkeypatch.setattr("online_exam.routes.auth_routes.generate_otp_code", lambda: "123456")
+
+    client.post("/login", data={"email": sample_instructor.email, "password": "Password123!"})
+
+    with app.app_context():
+        stored = db.session.get(User, sample_instructor.id).otp_code
+    assert stored.startswith("hmac-sha256$")
+    assert "123456" not in stored
+    assert stored != hash_otp("123456")
+
+
+def test_too_many_wrong_codes_end_the_login(client, sample_instructor, app, monkeypatch):
+    _enable_2fa(sample_instructor)
+    monkeypatch.setattr("online_exam.routes.auth_routes.generate_otp_code", lambda: "444444")
+    client.post("/login", data={"email": sample_instructor.email, "password": "Password123!"})
+
+    responses = [client.post("/auth/verify-otp", data={"otp": "000000"}) for _ in range(5)]
+
+    assert [response.status_code for response in responses] == [200, 200, 200, 200, 302]
+    assert client.post("/auth/verify-otp", data={"otp": "444444"}).status_code == 302
+    with app.app_context():
+        assert db.session.get(User, sample_instructor.id).otp_code is None
+
+
+def test_parallel_wrong_codes_all_count(client, sample_instructor, app, monkeypatch):
+    _enable_2fa(sample_instructor)
+    monkeypatch.setattr("online_exam.routes.auth_routes.generate_otp_code", lambda: "444444")
+    client.post("/login", data={"email": sample_instructor.email, "password": "Password123!"})
+    otp_is_valid = User.otp_is_valid
+
+    def concurrent_wrong_code(user, submitted_code):
+        # Another request counts its wrong code after this one loaded the user
+        db.session.execute(
+            update(User).values(otp_attempts=User.otp_attempts + 1),
+            execution_options={"synchronize_session": False},
+        )
+        return otp_is_valid(user, submitted_code)
+
+    monkeypatch.setattr(User, "otp_is_valid", concurrent_wrong_code)
+    client.post("/auth/verify-otp", data={"otp": "000000"})
+
+    with app.app_context():
+        assert db.session.get(User, sample_instructor.id).otp_attempts == 2
+
+
+def _enable_totp(user: User) -> str:
+    user = db.session.get(User, user.id)
+    user.two_factor_enabled = True
+    user.totp_secret = generate_totp_secret()
+    db.session.commit()
+    return user.totp_secret
+
+
+def test_totp_login_writes_only_the_used_step(client, sample_instructor, app, sql_statements):
+    secret = _enable_totp(sample_instructor)
+    sql_statements.clear()
+
+    login = client.post(
+        "/login", data={"email": sample_instructor.email, "password": "Password123!"}
+    )
+    assert "/auth/verify-otp" in login.headers["Location"]
+    verify = client.post("/auth/verify-otp", data={"otp": totp_code(secret)})
+
+    writes = [
+        statement
+        for statement in sql_statements
+        if not statement.lstrip().upper().startswith("SELECT")
+    ]
+    assert "/exams" in verify.headers["Location"]
+    assert [statement.split()[:2] for statement in writes if "login_attempts" not in statement] == [
+        ["UPDATE", "users"]
+    ]
+    with client.session_transaction() as session:
+        assert session.get("user_id") == sample_instructor.id
+
+
+def test_totp_code_works_once(client, sample_instructor):
+    secret = _enable_totp(sample_instructor)
+    code = totp_code(secret)
+    client.post("/login", data={"email": sample_instructor.email, "password": "Password123!"})
+    assert client.post("/auth/verify-otp", data={"otp": code}).status_code == 302
+    client.get("/logout")
+
+    client.post("/login", data={"email": sample_instructor.email, "password": "Password123!"})
+    response = client.post("/auth/verify-otp", data={"otp": code})
+
+    assert response.status_code == 200
+    assert b"Invalid verification code" in response.data
+
+
+def test_totp_code_used_by_a_parallel_login_is_refused(client, sample_instructor, monkeypatch):
+    secret = _enable_totp(sample_instructor)
+    client.post("/login", data={"email": sample_instructor.email, "password": "Password123!"})
+    totp_step = auth_routes.totp_step
+
+    def concurrent_login(secret, submitted_code):
+        # Another login accepts the same code after this one loaded the user
+        step = totp_step(secret, submitted_code)
+        db.session.execute(
+            update(User).values(totp_last_step=step),
+            execution_options={"synchronize_session": False},
+        )
+        return step
+
+    monkeypatch.setattr(auth_routes, "totp_step", concurrent_login)
+    response = client.post("/auth/verify-otp", data={"otp": totp_code(secret)})
+
+    assert response.status_code == 200
+    assert b"Invalid verification code" in response.data
+
+
+def test_wrong_totp_is_rejected(client, sample_instructor):
+    _enable_totp(sample_instructor)
+    client.post("/login", data={"email": sample_instructor.email, "password": "Password123!"})
+
+    response = client.post("/auth/verify-otp", data={"otp": "000000"})
+
+    assert response.status_code == 200
+    assert b"Invalid verification code" in response.data
+    assert b"authenticator app" in response.data
+
+
+def _enroll_authenticator_app(client, app, user_id):
+    assert client.get("/profile/2fa/totp").status_code == 200
+    with client.session_transaction() as session:
+        secret = session["totp_setup_secret"]
+
+    assert client.post("/profile/2fa/totp", data={"otp": "000000"}).status_code == 200
+    response = client.post("/profile/2fa/totp", data={"otp": totp_code(secret)})
+
+    assert response.status_code == 302
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        assert user.two_factor_enabled is True
+        assert user.totp_secret == secret
+
+
+@pytest.mark.rbac_role("instructor")
+def test_authenticator_app_enrollment(client, sample_instructor, app):
+    _enroll_authenticator_app(client, app, sample_instructor.id)
+
+
+@pytest.mark.rbac_role("student")
+def test_student_authenticator_app_enrollment(client, sample_student, app):
+    _enroll_authenticator_app(client, app, sample_student.id)
@@ -0,0 +1,64 @@
+import pytest
+
+from online_exam import db
+from online_exam.models.user import User
+from online_exam.services.user_cache import clear_user_cache
+
+
+def _user_queries(statements):
+    return [statement for statement in statements if "FROM users" in statement]
+
+
+@pytest.mark.rbac_role("instructor")
+def test_request_without_user_access_issues_no_query(client, sql_statements):
+    clear_user_cache()
+
+    response = client.get("/")
+
+    assert response.status_code == 302
+    assert _user_queries(sql_statements) == []
+
+
+@pytest.mark.rbac_role("student")
+def test_current_user_is_cached_between_requests(client, sql_statements):
+    clear_user_cache()
+
+    client.get("/student/dashboard")
+    assert len(_user_queries(sql_statements)) == 1
+
+    response = client.get("/student/dashboard")
+    assert response.status_code == 200
+    assert b"Student One" in response.data
+    assert len(_user_queries(sql_statements)) == 1
+
+
+@pytest.mark.rbac_role("instructor")
+def test_user_update_evicts_cached_identity(client, sample_instructor):
+    client.get("/profile")
+
+    user = db.session.get(User, sample_instructor.id)
+    user.name = "Renamed Instructor"
+    db.session.commit()
+
+    response = client.get("/profile")
+    assert b"Renamed Instructor" in response.data
+
+
+@pytest.mark.rbac_role("instructor")
+def test_two_factor_toggle_is_visible_immediately(client):
+    client.get("/profile")
+
+    response = client.post("/profile/2fa/enable", follow_redirects=True)
+
+    assert b"Disable 2FA" in response.data
+
+
+@pytest.mark.rbac_role("instructor")
+def test_cache_disabled_with_zero_ttl(app, client, sql_statements):
+    app.config["USER_CACHE_TTL_SECONDS"] = 0
+    clear_user_cache()
+
+    client.get("/profile")
+    client.get("/profile")
+
+    assert len(_user_queries(sql_statements)) == 2
@@ -0,0 +1,79 @@
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from online_exam import db
+from online_exam.models.submission import Submission
+
+
+def _export(client, exam_id):
+    response = client.get(f"/analytics/exams/{exam_id}/export")
+    assert response.status_code == 200
+    assert response.is_streamed
+    return load_workbook(BytesIO(response.get_data()))
+
+
+def test_export_streams_workbook_with_rows(client, sample_exam):
+    db.session.add_all(
+        [
+            Submission(
+                exam_id=sample_exam.id,
+                student_name=f"Student {n}",
+                total_score=n,
+                max_score=100,
+                percentage=float(n),
+            )
+            for n in (95, 60, 20)
+        ]
+    )
+    db.session.commit()
+
+    ws = _export(client, sample_exam.id)["Exam Results"]
+
+    assert ws["A1"].value == sample_exam.title
+    assert "A1:G1" in ws.merged_cells
+    assert ws["B3"].value == 3
+    assert ws["E3"].value == 95
+    assert [c.value for c in ws[7]] == [
+        "#",
+        "Student Name",
+        "Student Email",
+        "Score",
+        "Percentage",
+        "Status",
+        "Submitted",
+    ]
+    assert ws.max_row == 10
+    statuses = sorted(ws.cell(row=r, column=6).value for r in range(8, 11))
+    assert statuses == ["FAIL", "PASS", "PASS"]
+
+
+def test_export_cells_share_named_styles(client, sample_exam):
+    db.session.add_all(
+        [
+            Submission(
+                exam_id=sample_exam.id,
+                student_name=f"Student {n}",
+                total_score=90,
+                max_score=100,
+                percentage=90.0,
+            )
+            for n in range(20)
+        ]
+    )
+    db.session.commit()
+
+    wb = _export(client, sample_exam.id)
+    ws = wb["Exam Results"]
+
+    assert "export_pass" in wb.named_styles
+    assert {ws.cell(row=r, column=6).style for r in range(8, 28)} == {"export_pass"}
+    assert {ws.cell(row=r, column=5).style for r in range(8, 28)} == {"export_pct_high"}
+
+
+def test_export_without_submissions(client, sample_exam):
+    ws = _export(client, sample_exam.id)["Exam Results"]
+
+    assert ws["B3"].value == 0
+    assert ws["D2"].value is None
+    assert ws.max_row == 7